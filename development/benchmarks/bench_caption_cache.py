@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+import tempfile
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # fontes são caminhos relativos à raiz
+
+from libs.Subtitle import Subtitle
+from libs.CaptionCache import CaptionCache
+import libs.Subtitle
+from bench_subtitles import word_by_word_srt
+
+VIDEOS = 5
+
+
+def run_batch(srt_path, cache):
+    """Gera as legendas de VIDEOS vídeos (mesmo vocabulário), como em um lote do main.py."""
+    libs.Subtitle.get_caption_cache = lambda: cache
+    start = time.perf_counter()
+    for _ in range(VIDEOS):
+        Subtitle({
+            "subtitle_narration_file": srt_path,
+            "font_size": 90,
+            "stroke_width": 3,
+            "caption_cache": cache is not None,
+        }).generate()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    out_dir = tempfile.mkdtemp(prefix="caption_cache_bench_")
+    srt_path = os.path.join(out_dir, "words.srt")
+    word_by_word_srt(srt_path)
+
+    print(f"{VIDEOS} vídeos de legendas palavra por palavra")
+    print(f"{'sem cache':>22}: {run_batch(srt_path, None):6.2f}s")
+
+    cache_dir = os.path.join(out_dir, "captions")
+    cold = CaptionCache({"cache_dir": cache_dir})
+    print(f"{'cache (1ª execução)':>22}: {run_batch(srt_path, cold):6.2f}s | {cold.summary()}")
+    # nova execução do programa: memória vazia, disco aquecido
+    warm = CaptionCache({"cache_dir": cache_dir})
+    print(f"{'cache (disco aquecido)':>22}: {run_batch(srt_path, warm):6.2f}s | {warm.summary()}")
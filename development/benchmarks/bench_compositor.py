@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # fontes são caminhos relativos à raiz
+
+from moviepy.editor import ImageClip, CompositeVideoClip
+from libs.Subtitle import Subtitle
+from libs.LayerCompositor import LayerCompositor
+from libs.TemplateMaster import SUBTITLE_STYLE, HEADLINE_WIDTH
+from bench_subtitles import word_by_word_srt
+from profile_overlay_block import background, headline_clip, GAP, W, H
+
+FPS = 24
+SECONDS = 10
+
+
+def overlays(srt_path, out_dir):
+    """Headline + legendas no tamanho final, posicionadas como no TemplateDefault."""
+    block_width = int(W * 0.8)
+    subs = Subtitle({"subtitle_narration_file": srt_path, **SUBTITLE_STYLE,
+                     "block_width": block_width}).generate().set_duration(SECONDS)
+    head = headline_clip(out_dir, block_width)
+    gap = int(round(GAP * block_width / HEADLINE_WIDTH))
+    top = int(H * 0.3 - (head.h + gap + subs.h) / 2)
+    return [head.set_position(("center", top)), subs.set_position(("center", top + head.h + gap))]
+
+
+def product_image(out_dir):
+    """Foto de produto com transparência (estática), no meio da tela."""
+    yy, xx = np.mgrid[0:600, 0:600]
+    rgba = np.zeros((600, 600, 4), dtype=np.uint8)
+    rgba[..., 0], rgba[..., 1], rgba[..., 2] = xx % 256, yy % 256, 180
+    rgba[..., 3] = np.where((xx - 300) ** 2 + (yy - 300) ** 2 < 280 ** 2, 255, 0)
+    path = os.path.join(out_dir, "produto.png")
+    Image.fromarray(rgba).save(path)
+    return ImageClip(path).set_duration(SECONDS).set_position(("center", int(H * 0.55)))
+
+
+def solid_background(out_dir):
+    """Fundo de cor sólida como TemplateMaster.generate_background_color."""
+    path = os.path.join(out_dir, "background_color.png")
+    Image.new("RGB", (W, H), "#1d3557").save(path)
+    return ImageClip(path).set_duration(SECONDS)
+
+
+def composite_fps(clip):
+    start = time.perf_counter()
+    for i in range(SECONDS * FPS):
+        clip.get_frame(i / FPS)
+    return SECONDS * FPS / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    out_dir = tempfile.mkdtemp(prefix="compositor_")
+    srt_path = os.path.join(out_dir, "words.srt")
+    word_by_word_srt(srt_path)
+
+    scenarios = {
+        "default (vídeo + headline + legendas)": lambda: [background(SECONDS), *overlays(srt_path, out_dir)],
+        "produto (cor sólida + produto + headline + legendas)":
+            lambda: [solid_background(out_dir), product_image(out_dir), *overlays(srt_path, out_dir)],
+    }
+    for label, layers in scenarios.items():
+        old, new = CompositeVideoClip(layers()), LayerCompositor(layers())
+        times = np.arange(0, SECONDS, 0.29)
+        diff = max(np.abs(old.get_frame(t).astype(int) - new.get_frame(t).astype(int)).max() for t in times)
+        new = LayerCompositor(layers())
+        old_fps, new_fps = composite_fps(old), composite_fps(new)
+        stats = new.stats
+        print(f"{'✅' if diff <= 2 else '❌'} {label}: diferença máx. {diff}/255")
+        print(f"   CompositeVideoClip {old_fps:6.1f} fps | LayerCompositor {new_fps:6.1f} fps "
+              f"({new_fps / old_fps:4.1f}x) | frames reaproveitados {stats['reused']}, "
+              f"retângulos sujos {stats['dirty']}, completos {stats['full']}")
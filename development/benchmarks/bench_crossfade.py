@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+import resource
+import multiprocessing as mp
+
+import numpy as np
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+
+from moviepy.editor import VideoClip, CompositeVideoClip
+from libs.TransitionTrack import CrossfadeTrack
+
+RESOLUTION = (1080, 1920)
+CLIP_DURATION = 4
+CROSSFADE = 0.8
+FRAMES = 24
+CLIP_COUNTS = [5, 20, 50]
+
+
+def synthetic_clip(seed):
+    """Clipe sintético com conteúdo variando no tempo (sem I/O de disco)."""
+    w, h = RESOLUTION
+    base = np.full((h, w, 3), (seed * 37) % 256, dtype=np.uint8)
+
+    def make_frame(t):
+        frame = base.copy()
+        frame[:, : int(w * (t / CLIP_DURATION)) % w] = 255
+        return frame
+
+    return VideoClip(make_frame, duration=CLIP_DURATION)
+
+
+def nested_crossfade(clips):
+    """Implementação antiga de BackgroundVideo.apply_crossfade_transition."""
+    base = clips[0]
+    for next_clip in clips[1:]:
+        next_clip = next_clip.crossfadein(CROSSFADE).set_start(base.duration - CROSSFADE)
+        base = CompositeVideoClip([base, next_clip]).set_duration(base.duration + next_clip.duration - CROSSFADE)
+    return base
+
+
+def bench(track):
+    # amostra frames espalhados pela timeline inteira (inclui transições)
+    times = np.linspace(0, track.duration - 1e-3, FRAMES)
+    start = time.perf_counter()
+    for t in times:
+        track.get_frame(t)
+    elapsed = time.perf_counter() - start
+    return FRAMES / elapsed
+
+
+def run(kind, n, queue):
+    clips = [synthetic_clip(i) for i in range(n)]
+    if kind == "nested":
+        track = nested_crossfade(clips)
+    else:
+        track = CrossfadeTrack(clips, crossfade_duration=CROSSFADE, size=RESOLUTION)
+    fps = bench(track)
+    queue.put((fps, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+
+def measure(kind, n):
+    """
+    (fps, pico de memória em MB) medidos em um processo filho: a versão
+    aninhada pode ser morta por falta de memória com muitos clipes (None).
+    """
+    queue = mp.Queue()
+    proc = mp.Process(target=run, args=(kind, n, queue))
+    proc.start()
+    proc.join()
+    return queue.get() if proc.exitcode == 0 else None
+
+
+if __name__ == "__main__":
+    print(f"{'clipes':>7} | {'aninhado (fps)':>15} | {'CrossfadeTrack (fps)':>21} | {'ganho':>6} | memória (MB)")
+    for n in CLIP_COUNTS:
+        old = measure("nested", n)
+        new_fps, new_mb = measure("track", n)
+        if old is None:
+            print(f"{n:>7} | {'sem memória':>15} | {new_fps:>21.2f} | {'-':>6} | - / {new_mb:.0f}")
+            continue
+        old_fps, old_mb = old
+        print(f"{n:>7} | {old_fps:>15.2f} | {new_fps:>21.2f} | {new_fps / old_fps:>5.1f}x | {old_mb:.0f} / {new_mb:.0f}")
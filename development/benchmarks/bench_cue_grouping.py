@@ -0,0 +1,67 @@
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # fontes são caminhos relativos à raiz
+
+from libs.TTS_Edge import EdgeTTS
+from libs.Subtitle import Subtitle
+from bench_subtitles import TEXT
+
+WORDS = 600
+FPS = 24
+
+
+def narration_boundaries(seed=0):
+    """Marcas no formato do EdgeTTS já sem silêncios: palavras de 150-600 ms, pausas de frase."""
+    rng = random.Random(seed)
+    words, t = [], 0.0
+    for i in range(WORDS):
+        duration = rng.uniform(150, 600)
+        words.append({"word": TEXT[i % len(TEXT)], "start": t, "end": t + duration})
+        t += duration + (rng.choice([275, 400]) if i % 9 == 8 else rng.uniform(0, 60))
+    return words
+
+
+def run(grouping, words, out_dir):
+    tts = EdgeTTS({"text": "x", "use_cache": False, "cue_grouping": grouping,
+                   "output_basename": os.path.join(out_dir, "grouped" if grouping else "words")})
+    srt_path, words_path = tts._generate_srt(words)
+    start = time.perf_counter()
+    track = Subtitle({"subtitle_narration_file": srt_path, "font_size": 90, "stroke_width": 3,
+                      "caption_cache": False}).generate()
+    generate_time = time.perf_counter() - start
+
+    # custo da trilha na renderização: todos os frames a 24 fps (frame + máscara)
+    start = time.perf_counter()
+    for i in range(int(track.duration * FPS)):
+        track.get_frame(i / FPS)
+        track.mask.get_frame(i / FPS)
+    return generate_time, time.perf_counter() - start, srt_path, words_path
+
+
+if __name__ == "__main__":
+    out_dir = tempfile.mkdtemp(prefix="cue_grouping_")
+    words = narration_boundaries()
+    print(f"📝 narração sintética de {WORDS} palavras ({words[-1]['end'] / 1000:.0f}s)")
+    for label, grouping in (("palavra a palavra", None), ("agrupado (padrão)", True),
+                            ("agrupado (6 palavras)", {"max_words": 6, "max_chars": 36})):
+        generate_time, frames_time, srt_path, words_path = run(grouping, words, out_dir)
+        with open(srt_path, encoding="utf-8") as f:
+            cues = f.read().count("-->")
+        ok = True
+        if words_path:
+            with open(words_path, encoding="utf-8") as f:
+                timeline = json.load(f)
+            # nenhuma palavra some nem muda de tempo na timeline de destaque
+            flat = [w for cue in timeline for w in cue["words"]]
+            ok = [(w["word"], w["start"], w["end"]) for w in flat] == [
+                (w["word"], w["start"], w["end"]) for w in words]
+        print(f"{'✅' if ok else '❌'} {label:>22}: {cues:>4} legendas | Subtitle.generate {generate_time:5.2f}s | "
+              f"frames da trilha {frames_time:5.2f}s")
@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import resource
+import tracemalloc
+import multiprocessing as mp
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+
+from libs.BackgroundVideo import BackgroundVideo
+
+DEFAULT_VIDEO = os.path.join(ROOT, "videos_default/futbool/2657261-uhd_3840_2160_24fps.mp4")
+FRAMES = 96
+
+
+def decode(video_path, scale_at_decode, queue):
+    """Decodifica FRAMES frames de um clipe em um processo isolado (pico de memória limpo)."""
+    bg = BackgroundVideo({
+        "output_ratio": "9:16",
+        "max_clip_duration": 3600,
+        "scale_at_decode": scale_at_decode,
+    })
+    tracemalloc.start()
+    start = time.perf_counter()
+    clip = bg.load_and_resize_clip(video_path)
+    frames = min(FRAMES, int(clip.duration * clip.fps))
+    for i in range(frames):
+        clip.get_frame(i / clip.fps)
+    elapsed = time.perf_counter() - start
+    _, py_peak = tracemalloc.get_traced_memory()
+    clip.close()
+    # ru_maxrss em KiB no Linux
+    queue.put({
+        "fps": frames / elapsed,
+        "py_peak_mb": py_peak / 1024 ** 2,
+        "rss_peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    })
+
+
+def run(video_path, scale_at_decode):
+    queue = mp.Queue()
+    proc = mp.Process(target=decode, args=(video_path, scale_at_decode, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+if __name__ == "__main__":
+    video_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_VIDEO
+    print(f"🎞️ {video_path} ({FRAMES} frames)")
+    print(f"{'modo':>22} | {'decode fps':>10} | {'pico numpy (MB)':>15} | {'pico RSS (MB)':>13}")
+    for label, flag in (("crop+resize (PIL)", False), ("scale no decode", True)):
+        r = run(video_path, flag)
+        print(f"{label:>22} | {r['fps']:>10.1f} | {r['py_peak_mb']:>15.1f} | {r['rss_peak_mb']:>13.1f}")
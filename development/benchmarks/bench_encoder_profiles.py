@@ -0,0 +1,74 @@
+import os
+import re
+import sys
+import time
+import tempfile
+import subprocess as sp
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # fontes são caminhos relativos à raiz
+
+from moviepy.config import get_setting
+from libs.Timeline import Timeline
+from libs.TimelineFFmpeg import FFmpegTimeline
+from libs.EncoderProfiles import EncoderProfile, ENCODER_PROFILES, size_report
+from compare_timeline_backends import build_timeline, W, H
+from bench_compositor import product_image
+
+DURATION = 12.0
+# variações além dos perfis nomeados
+VARIANTS = {
+    "shorts-upload + stillimage": {"profile": "shorts-upload", "tune": "stillimage"},
+    "size-targeted até 3 MB": {"profile": "size-targeted", "max_file_size_mb": 3},
+}
+
+
+def static_timeline(out_dir):
+    """Como o template de produto: fundo de cor, foto parada, headline e legendas do timeline padrão."""
+    moving = build_timeline(out_dir, DURATION)
+    timeline = Timeline({"size": (W, H), "fps": 24, "duration": DURATION, "bg_color": (0x1d, 0x35, 0x57)})
+    product = product_image(out_dir)  # grava produto.png (RGBA)
+    timeline.add_image(os.path.join(out_dir, "produto.png"), ((W - product.w) // 2, int(H * 0.55)))
+    timeline.layers += [layer for layer in moving.layers if layer["type"] != "sequence"]
+    timeline.audio = moving.audio
+    return timeline
+
+
+def slugify(text):
+    return re.sub(r"\W+", "_", text)
+
+
+def psnr(path, reference):
+    """PSNR médio (dB) do vídeo contra a referência sem perdas (filtro psnr do ffmpeg)."""
+    proc = sp.run([get_setting("FFMPEG_BINARY"), "-i", path, "-i", reference, "-lavfi", "[0:v][1:v]psnr",
+                   "-f", "null", "-"], stderr=sp.PIPE, stdout=sp.DEVNULL)
+    match = re.search(r"average:([\d.]+|inf)", proc.stderr.decode("utf-8", "ignore"))
+    return float(match.group(1)) if match else float("nan")
+
+
+if __name__ == "__main__":
+    out_dir = tempfile.mkdtemp(prefix="encoder_profiles_")
+    timelines = {"vídeo de fundo": build_timeline(out_dir, DURATION), "produto (parado)": static_timeline(out_dir)}
+    profiles = {name: {"profile": name} for name in ENCODER_PROFILES}
+    profiles.update(VARIANTS)
+    frames = int(DURATION * 24)
+
+    for label, timeline in timelines.items():
+        slug = slugify(label)
+        reference = os.path.join(out_dir, f"{slug}_lossless.mp4")
+        FFmpegTimeline({"bitrate": None, "preset": "ultrafast", "ffmpeg_params": ["-qp", "0"]}).render(timeline, reference)
+        print(f"\n🎞️ {label} ({DURATION:.0f}s, {W}x{H}, {EncoderProfile().threads} threads)")
+        for name, config in profiles.items():
+            encoder = EncoderProfile.from_config(config).fit_duration(DURATION)
+            output = os.path.join(out_dir, f"{slug}_{slugify(name)}.mp4")
+            start = time.perf_counter()
+            FFmpegTimeline(encoder.encoding()).render(timeline, output)
+            elapsed = time.perf_counter() - start
+            report = size_report(output, DURATION)
+            size = report["size"]
+            print(f"   {name:28s} {frames / elapsed:6.1f} fps | {size / 1024:8.0f} KB "
+                  f"({-report['saved'] / report['reference'] * 100:+4.0f}% vs 4000k) | "
+                  f"{size * 8 / DURATION / 1000:6.0f} kbps | PSNR {psnr(output, reference):5.2f} dB | {encoder.describe()}")
+    print(f"\n📁 arquivos em {out_dir}")
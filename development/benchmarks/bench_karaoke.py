@@ -0,0 +1,96 @@
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # fontes são caminhos relativos à raiz
+
+from libs.CaptionRenderer import CaptionRenderer
+from libs.CueGrouping import group_words, write_word_timeline, DEFAULT_GROUPING
+from libs.KaraokeTrack import KaraokeTrack
+from libs.SubtitleTrack import SubtitleTrack
+from bench_cue_grouping import narration_boundaries
+
+FPS = 24
+HIGHLIGHT = "#FFD60A"
+
+
+def naive_track(track, renderer):
+    """
+    Montagem ingênua: um bitmap por estado (frase, palavra destacada), cada um
+    rasterizado do zero, como seria com um TextClip por estado.
+    """
+    w, h = track.size
+    cues = []
+    for start, end, (phrase, highlighted) in track.cues:
+        frame = np.zeros((h, w, 4), dtype=np.float32)
+        ox, oy = track._place(phrase.width, phrase.height)
+        for i, tokens in enumerate(phrase.words):
+            for token, x, y in tokens:
+                sprite = renderer._render_word(token, HIGHLIGHT if i == highlighted else renderer.color)
+                alpha = sprite[:, :, 3:].astype(np.float32) / 255.0
+                region = frame[oy + y:oy + y + sprite.shape[0], ox + x:ox + x + sprite.shape[1]]
+                region[:, :, :3] = region[:, :, :3] * (1 - alpha) + sprite[:, :, :3] * alpha
+                region[:, :, 3:] = alpha + region[:, :, 3:] * (1 - alpha)
+        # bitmap RGBA "desmultiplicado", como sai de um rasterizador
+        a = frame[:, :, 3:]
+        rgb = np.where(a > 0, frame[:, :, :3] / np.maximum(a, 1e-6), 0)
+        cues.append((start, end, np.dstack([rgb, a * 255]).round().clip(0, 255).astype(np.uint8)))
+    return SubtitleTrack(cues, size=track.size, position=track.position)
+
+
+def frames_time(track, duration):
+    start = time.perf_counter()
+    for i in range(int(duration * FPS)):
+        track.get_frame(i / FPS)
+        track.mask.get_frame(i / FPS)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    out_dir = tempfile.mkdtemp(prefix="karaoke_")
+    words = narration_boundaries()
+    words_file = write_word_timeline(group_words(words, **DEFAULT_GROUPING), os.path.join(out_dir, "n.words.json"))
+    renderer = CaptionRenderer({"font_size": 90, "stroke_width": 3, "max_width": 918})
+    duration = words[-1]["end"] / 1000
+
+    start = time.perf_counter()
+    track = KaraokeTrack.from_word_timeline(words_file, renderer, HIGHLIGHT)
+    karaoke_frames = frames_time(track, duration)  # sprites são rasterizados sob demanda
+    karaoke_total = time.perf_counter() - start
+
+    start = time.perf_counter()
+    naive = naive_track(track, renderer)
+    naive_build = time.perf_counter() - start
+    naive_frames = frames_time(naive, duration)
+    naive_bytes = sum(c[2].nbytes for c in naive.cues)
+
+    # mesmo resultado que rasterizar cada estado inteiro
+    times = np.arange(0, duration, 0.37)
+    same = max(
+        max(np.abs(track.get_frame(t).astype(int) - naive.get_frame(t).astype(int)).max(),
+            255 * np.abs(track.mask.get_frame(t) - naive.mask.get_frame(t)).max())
+        for t in times
+    )
+
+    # frase sem destaque x a mesma frase rasterizada inteira pelo CaptionRenderer
+    phrase = track.cues[0][2][0]
+    text = " ".join(token for tokens in phrase.words for token, _, _ in tokens)
+    whole = renderer.render(text)
+    atlas_only = KaraokeTrack([(0, 1, (phrase, -1))], track.atlas, size=(phrase.width, phrase.height))
+    frame, mask = atlas_only.frame_and_mask(0)
+    whole_alpha = whole[:, :, 3] / 255.0
+    diff = np.abs(frame.astype(float) - whole[:, :, :3] * whole_alpha[:, :, None]).mean()
+
+    print(f"📝 {len(track.cues)} estados (frase, palavra) em {duration:.0f}s de narração")
+    print(f"{'✅' if same <= 1 else '❌'} karaokê = um bitmap por estado (diferença máx. {same:.0f}/255)")
+    print(f"🔎 frase montada do atlas x frase inteira: diferença média {diff:.2f}/255")
+    print(f"⏱️ ingênuo: rasterização {naive_build:5.2f}s + frames {naive_frames:5.2f}s | "
+          f"{naive_bytes / 1024 ** 2:6.1f} MB de bitmaps")
+    print(f"⏱️ atlas:   total {karaoke_total:5.2f}s (frames {karaoke_frames:5.2f}s) | "
+          f"{len(track.atlas.sprites)} sprites, {track.atlas.nbytes / 1024 ** 2:6.1f} MB")
@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+import tempfile
+import subprocess as sp
+
+import numpy as np
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # fontes são caminhos relativos à raiz
+
+from moviepy.config import get_setting
+from libs.AssSubtitle import AssSubtitle
+from libs.TimelineFFmpeg import FFmpegTimeline
+from libs.TimelineMoviePy import MoviePyTimeline
+from libs.TimelineParallel import ParallelTimeline
+from libs.TemplateMaster import SUBTITLE_STYLE
+from compare_timeline_backends import build_timeline, decode_audio, psnr, W, H
+
+DURATION = 24.0
+WORKERS = int(os.getenv("RENDER_WORKERS", 0)) or max(4, os.cpu_count() or 1)
+# bitrate alto: a comparação mede cortes e concatenação, não a perda do encoder
+ENCODING = {"bitrate": "20000k", "preset": "ultrafast"}
+KEYFRAME_INTERVAL = 2.0
+
+
+def decode_frames(path, size=(W // 4, H // 4)):
+    """Todos os frames em cinza, reduzidos (comparação frame a frame)."""
+    raw = sp.run([get_setting("FFMPEG_BINARY"), "-loglevel", "error", "-i", path, "-f", "rawvideo",
+                  "-pix_fmt", "gray", "-s", f"{size[0]}x{size[1]}", "-"], stdout=sp.PIPE, check=True).stdout
+    return np.frombuffer(raw, dtype=np.uint8).reshape(-1, size[1], size[0])
+
+
+def keyframes(path):
+    out = sp.run(["ffprobe", "-v", "error", "-select_streams", "v", "-show_entries", "packet=pts_time,flags",
+                  "-of", "csv=p=0", path], stdout=sp.PIPE, check=True).stdout.decode()
+    return [round(float(t), 3) for t, flags in (line.split(",")[:2] for line in out.split()) if "K" in flags]
+
+
+if __name__ == "__main__":
+    out_dir = tempfile.mkdtemp(prefix="parallel_render_")
+    timeline = build_timeline(out_dir, DURATION)
+    # legendas ASS por cima: filtros com tempo absoluto precisam ver o PTS original em cada trecho
+    timeline.add_filter(AssSubtitle({"subtitle_narration_file": os.path.join(out_dir, "words.srt"),
+                                     **SUBTITLE_STYLE, "center": (0.5, 0.8)}).generate())
+    gop = ["-g", str(int(KEYFRAME_INTERVAL * timeline.fps))]
+    parallel = ParallelTimeline({"workers": WORKERS, "keyframe_interval": KEYFRAME_INTERVAL,
+                                 "encoding": ENCODING, "min_segment_duration": 4.0})
+    print(f"ℹ️ {os.cpu_count()} núcleos | {WORKERS} processos | cortes em {parallel.segment_bounds(timeline)}")
+
+    for backend, cls in (("ffmpeg", FFmpegTimeline), ("moviepy", MoviePyTimeline)):
+        single_path = os.path.join(out_dir, f"{backend}_single.mp4")
+        parallel_path = os.path.join(out_dir, f"{backend}_parallel.mp4")
+        start = time.perf_counter()
+        cls({**ENCODING, "ffmpeg_params": gop, **({"logger": None} if backend == "moviepy" else {})}).render(
+            timeline, single_path)
+        single_time = time.perf_counter() - start
+        start = time.perf_counter()
+        parallel.backend = backend
+        parallel.render(timeline, parallel_path)
+        parallel_time = time.perf_counter() - start
+
+        a, b = decode_frames(single_path), decode_frames(parallel_path)
+        n = min(len(a), len(b))
+        scores = [psnr(a[i], b[i]) for i in range(n)]
+        worst = int(np.argmin(scores))
+        fa, fb = decode_audio(single_path), decode_audio(parallel_path)
+        m = min(len(fa), len(fb))
+        audio_diff = float(np.abs(fa[:m] - fb[:m]).max())
+        same_keys = keyframes(single_path) == keyframes(parallel_path)
+        ok = len(a) == len(b) and scores[worst] > 35 and same_keys
+        print(f"{'✅' if ok else '❌'} {backend}: frames {len(a)}/{len(b)} | PSNR mínimo {scores[worst]:.1f} dB "
+              f"(frame {worst}) | keyframes {'iguais' if same_keys else 'diferentes'} "
+              f"{keyframes(parallel_path)} | áudio diferença máx. {audio_diff:.4f}")
+        print(f"   único {single_time:6.2f}s | paralelo {parallel_time:6.2f}s ({single_time / parallel_time:.1f}x)")
+    print(f"📁 arquivos em {out_dir}")
@@ -0,0 +1,125 @@
+import os
+import sys
+import time
+import resource
+import tempfile
+import functools
+import subprocess as sp
+
+import numpy as np
+from pydub import AudioSegment
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+
+from libs.TTS_Edge import EdgeTTS
+from libs.TemplateMaster import TemplateMaster, AUDIO_FPS
+from moviepy.editor import AudioFileClip
+from bench_tts_prefetch import FakeCommunicate
+import bench_tts_prefetch
+
+bench_tts_prefetch.NETWORK_SECONDS = 0.0  # só o custo local interessa aqui
+# o mp3 "do serviço" é gerado uma vez só: fora da medição
+bench_tts_prefetch.fake_mp3 = functools.lru_cache()(bench_tts_prefetch.fake_mp3)
+WORDS = 150
+REPEATS = 3
+
+
+class PopenCounter:
+    """Conta os subprocessos (ffmpeg) abertos durante o pipeline."""
+
+    def __init__(self):
+        self.count = 0
+        self.original = sp.Popen
+
+    def __enter__(self):
+        counter = self
+
+        class CountingPopen(self.original):
+            def __init__(self, *args, **kwargs):
+                counter.count += 1
+                super().__init__(*args, **kwargs)
+
+        sp.Popen = CountingPopen
+        return self
+
+    def __exit__(self, *exc):
+        sp.Popen = self.original
+
+
+def cpu_seconds():
+    """CPU do processo + subprocessos já finalizados (ffmpeg)."""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def decode(path):
+    audio = AudioSegment.from_file(path).set_channels(1).set_frame_rate(AUDIO_FPS)
+    return np.frombuffer(audio.raw_data, dtype=np.int16).astype(np.float64)
+
+
+def snr_db(reference, test):
+    """SNR após alinhar pelo pico da correlação cruzada (atraso de encoder)."""
+    n = 1 << int(np.ceil(np.log2(len(reference) + len(test))))
+    corr = np.fft.irfft(np.fft.rfft(test, n) * np.conj(np.fft.rfft(reference, n)), n)
+    lag = int(np.argmax(corr))
+    lag = lag if lag < n // 2 else lag - n
+    test = test[lag:] if lag >= 0 else np.concatenate((np.zeros(-lag), test))
+    size = min(len(reference), len(test))
+    reference, test = reference[:size], test[:size]
+    # ganho de mínimos quadrados: compensa diferenças de nível do encoder
+    gain = np.dot(reference, test) / np.dot(test, test)
+    noise = reference - gain * test
+    return 10 * np.log10(np.sum(reference ** 2) / np.sum(noise ** 2))
+
+
+def run(pcm, text, out_dir):
+    tts = EdgeTTS({
+        "text": text,
+        "output_basename": os.path.join(out_dir, "narration"),
+        "communicate_class": FakeCommunicate,
+        "use_cache": False,
+        "pcm_output": pcm,
+        "write_audio_file": not pcm,
+    })
+    # referência: narração já sem silêncios, antes de qualquer codificação com perdas
+    reference = {}
+    cut_silences = tts._cut_silences
+
+    def keep_reference(*args):
+        audio, words = cut_silences(*args)
+        reference["audio"] = audio
+        return audio, words
+
+    tts._cut_silences = keep_reference
+
+    final_path = os.path.join(out_dir, f"final_{'pcm' if pcm else 'mp3'}.m4a")
+    start = time.perf_counter()
+    cpu_start = cpu_seconds()
+    with PopenCounter() as counter:
+        result = tts.generate_audio_and_subtitles()
+        if pcm:
+            clip = TemplateMaster.narration_clip(result["audio_segment"])
+        else:
+            clip = AudioFileClip(result["audio_file"])
+        clip.write_audiofile(final_path, fps=AUDIO_FPS, codec="aac", bitrate="192k", logger=None)
+    elapsed = time.perf_counter() - start
+    cpu = cpu_seconds() - cpu_start
+
+    ref = reference["audio"].set_frame_rate(AUDIO_FPS)
+    ref = np.frombuffer(ref.raw_data, dtype=np.int16).astype(np.float64)
+    return elapsed, cpu, counter.count, snr_db(ref, decode(final_path))
+
+
+if __name__ == "__main__":
+    text = " ".join(f"palavra{i}" for i in range(WORDS))
+    out_dir = tempfile.mkdtemp(prefix="pcm_bench_")
+    run(False, text, out_dir)  # gera os mp3 falsos de todos os blocos
+    for label, pcm in (("mp3 → AudioFileClip", False), ("PCM na memória", True)):
+        runs = [run(pcm, text, out_dir) for _ in range(REPEATS)]
+        elapsed = min(r[0] for r in runs)
+        cpu = min(r[1] for r in runs)
+        _, _, procs, snr = runs[-1]
+        print(f"{label:>20}: {elapsed:6.2f}s | CPU {cpu:6.2f}s | subprocessos {procs} | SNR final {snr:5.1f} dB")
@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+
+import numpy as np
+from moviepy.editor import ImageClip, CompositeVideoClip
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # fontes são caminhos relativos à raiz
+
+from libs.CaptionRenderer import CaptionRenderer
+from libs.SubtitleTrack import SubtitleTrack
+from bench_subtitles import TEXT, WORD_MS
+
+FPS = 24
+FRAMES = 48
+
+
+def make_cues(n, renderer, bitmaps):
+    cues = []
+    for i in range(n):
+        word = TEXT[i % len(TEXT)].upper()
+        if word not in bitmaps:
+            bitmaps[word] = renderer.render(word)
+        start = i * WORD_MS / 1000
+        cues.append((start, start + (WORD_MS - 20) / 1000, bitmaps[word]))
+    return cues
+
+
+def composite(cues):
+    """Montagem anterior do Subtitle.generate: um ImageClip por legenda num CompositeVideoClip."""
+    clips = [ImageClip(bitmap).set_position(("center", "bottom")).set_start(start).set_end(end)
+             for start, end, bitmap in cues]
+    return CompositeVideoClip(clips)
+
+
+def per_frame_ms(clip, times):
+    start = time.perf_counter()
+    for t in times:
+        clip.get_frame(t)
+        clip.mask.get_frame(t)
+    return 1000 * (time.perf_counter() - start) / len(times)
+
+
+def check_gaps(renderer):
+    """Entre duas legendas o conjunto ativo é vazio e o frame fica transparente."""
+    bitmap = renderer.render("GAP")
+    track = SubtitleTrack([(2.0, 3.0, bitmap), (0.0, 1.0, bitmap)])
+    blank = not track.mask.get_frame(1.5).any() and not track.get_frame(1.5).any()
+    ok = track.active == [[0], [], [1]] and blank
+    print(f"{'✅' if ok else '❌'} intervalo vazio entre legendas: active={track.active}")
+    return ok
+
+
+if __name__ == "__main__":
+    renderer = CaptionRenderer({"font_size": 90, "stroke_width": 3, "max_width": 918})
+    bitmaps = {}
+    assert check_gaps(renderer), "SubtitleTrack mostra legenda no intervalo entre duas legendas"
+    print(f"custo por frame (frame + máscara), {FRAMES} frames a {FPS} fps no meio da narração")
+    for n in (100, 600, 2000):
+        cues = make_cues(n, renderer, bitmaps)
+        middle = cues[n // 2][0]
+        times = [middle + i / FPS for i in range(FRAMES)]
+        # também instantes nos intervalos vazios entre palavras (fim + 10 ms)
+        gaps = [end + 0.01 for _, end, _ in cues[n // 2:n // 2 + 8]]
+
+        old, new = composite(cues), SubtitleTrack(cues)
+        same = all(
+            np.array_equal(old.get_frame(t), new.get_frame(t))
+            and np.abs(old.mask.get_frame(t) - new.mask.get_frame(t)).max() < 1e-6
+            for t in times[::6] + gaps
+        )
+        old_ms, new_ms = per_frame_ms(old, times), per_frame_ms(new, times)
+        print(f"{'✅' if same else '❌'} {n:>5} legendas: CompositeVideoClip {old_ms:8.2f} ms | "
+              f"SubtitleTrack {new_ms:6.2f} ms")
@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+from PIL import Image
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # fontes são caminhos relativos à raiz
+
+from moviepy.config import get_setting
+from libs.Subtitle import Subtitle
+from libs.TTS_Edge import ms_to_srt_time
+
+WORDS = 200
+WORD_MS = 350
+TEXT = ("o governo anunciou hoje novas medidas econômicas para conter a inflação "
+        "e especialistas avaliam impacto nas próximas semanas").split()
+
+
+def word_by_word_srt(path):
+    """SRT no formato de EdgeTTS._generate_srt_word_by_word."""
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(WORDS):
+            start, end = i * WORD_MS, (i + 1) * WORD_MS - 20
+            f.write(f"{i + 1}\n{ms_to_srt_time(start)} --> {ms_to_srt_time(end)}\n{TEXT[i % len(TEXT)]}\n\n")
+
+
+def imagemagick_available():
+    binary = get_setting("IMAGEMAGICK_BINARY")
+    return binary != "unset" and (os.path.exists(binary) or shutil.which(binary))
+
+
+def run(renderer, srt_path):
+    sub = Subtitle({
+        "subtitle_narration_file": srt_path,
+        "font_size": 90,
+        "stroke_width": 3,
+        "renderer": renderer,
+    })
+    start = time.perf_counter()
+    clip = sub.generate()
+    elapsed = time.perf_counter() - start
+    return elapsed, clip
+
+
+if __name__ == "__main__":
+    out_dir = tempfile.mkdtemp(prefix="subtitle_bench_")
+    srt_path = os.path.join(out_dir, "words.srt")
+    word_by_word_srt(srt_path)
+    print(f"📝 {WORDS} legendas palavra por palavra")
+
+    renderers = ["pillow"]
+    if imagemagick_available():
+        renderers.insert(0, "imagemagick")
+    else:
+        print("⚠️  ImageMagick não encontrado: medindo só o renderizador Pillow")
+
+    for renderer in renderers:
+        elapsed, clip = run(renderer, srt_path)
+        preview = os.path.join(out_dir, f"preview_{renderer}.png")
+        Image.fromarray(clip.get_frame(WORD_MS / 2000)).save(preview)
+        print(f"{renderer:>12}: {elapsed:6.2f}s ({1000 * elapsed / WORDS:6.2f} ms/legenda) | prévia: {preview}")
@@ -0,0 +1,112 @@
+import os
+import sys
+import time
+import asyncio
+import tempfile
+import subprocess as sp
+
+from pydub import AudioSegment
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+
+from moviepy.config import get_setting
+from libs.TTS_Edge import EdgeTTS
+from libs.TextChunker import chunk_text
+
+SENTENCES = 60
+WORDS_PER_SENTENCE = 12
+WORD_SECONDS = 0.3
+SYNTHESIS_SPEED = 10.0  # segundos de áudio gerados por segundo de espera (serviço simulado)
+
+
+_MP3_CACHE = {}
+
+
+def fake_mp3(words):
+    """MP3 mono 24 kHz (formato do Edge TTS): um bipe por palavra e pausa no fim das frases."""
+    words = tuple(words)
+    if words in _MP3_CACHE:
+        return _MP3_CACHE[words]
+    parts = []
+    for i, word in enumerate(words):
+        parts.append(f"sine=f={300 + 40 * (i % 10)}:d={WORD_SECONDS}:sample_rate=24000")
+        parts.append(f"anullsrc=r=24000:cl=mono:d={0.6 if word.endswith('.') else 0.05}")
+    graph = ";".join(f"{p}[a{i}]" for i, p in enumerate(parts))
+    graph += ";" + "".join(f"[a{i}]" for i in range(len(parts))) + f"concat=n={len(parts)}:v=0:a=1"
+    out = sp.run([get_setting("FFMPEG_BINARY"), "-loglevel", "error", "-filter_complex", graph,
+                  "-ac", "1", "-b:a", "48k", "-f", "mp3", "-"], stdout=sp.PIPE, check=True)
+    _MP3_CACHE[words] = out.stdout
+    return out.stdout
+
+
+class FakeCommunicate:
+    """Substituto local do edge_tts.Communicate: latência proporcional à fala, sem rede."""
+
+    def __init__(self, text, voice, rate=None, boundary=None):
+        self.words = text.split()
+        self.audio = fake_mp3(self.words)
+
+    async def stream(self):
+        offset = 0.0
+        for word in self.words:
+            yield {"type": "WordBoundary", "offset": int(offset * 1e7),
+                   "duration": int(WORD_SECONDS * 1e7), "text": word}
+            offset += WORD_SECONDS + (0.6 if word.endswith(".") else 0.05)
+        chunk_size = 4096
+        chunks = [self.audio[i:i + chunk_size] for i in range(0, len(self.audio), chunk_size)]
+        delay = offset / SYNTHESIS_SPEED / max(1, len(chunks))
+        for i in range(0, len(self.audio), chunk_size):
+            await asyncio.sleep(delay)
+            yield {"type": "audio", "data": self.audio[i:i + chunk_size]}
+
+
+def narration_text():
+    return " ".join(
+        " ".join(f"p{s}_{w}" for w in range(WORDS_PER_SENTENCE)) + "."
+        for s in range(SENTENCES)
+    )
+
+
+def words_are_audible(audio_file, words):
+    """Toda palavra da legenda precisa cair sobre som (bipe) no áudio final."""
+    audio = AudioSegment.from_file(audio_file)
+    misplaced = [w for w in words if audio[w["start"] + 60:w["end"] - 60].dBFS < -30]
+    return len(misplaced)
+
+
+def run(concurrency):
+    out_dir = tempfile.mkdtemp(prefix="tts_chunks_")
+    tts = EdgeTTS({
+        "text": narration_text(),
+        "output_basename": os.path.join(out_dir, "narration"),
+        "communicate_class": FakeCommunicate,
+        "use_cache": False,
+        "chunk_concurrency": concurrency,
+        "chunk_max_chars": 800,
+    })
+    start = time.perf_counter()
+    audio, words = asyncio.run(tts._synthesize_audio_async())
+    elapsed = time.perf_counter() - start
+    final_audio, new_words = tts._remove_silences(audio, words)
+    return elapsed, len(tts._text_chunks()), new_words, final_audio
+
+
+if __name__ == "__main__":
+    text = narration_text()
+    # o mp3 falso é gerado antes para medir só a espera pelo "serviço"
+    for chunk in [text] + chunk_text(text, 800):
+        fake_mp3(chunk.split())
+    print(f"📝 {len(text)} caracteres, {SENTENCES * WORDS_PER_SENTENCE} palavras, "
+          f"{len(chunk_text(text, 800))} blocos de até 800 caracteres")
+    baseline = None
+    for concurrency in (1, 2, 4, 8):
+        elapsed, chunks, words, final_audio = run(concurrency)
+        misplaced = words_are_audible(final_audio, words)
+        # a versão em bloco único é a referência: mesmas palavras, todas sobre som, sem sobreposição
+        baseline = baseline or [w["word"] for w in words]
+        ok = [w["word"] for w in words] == baseline and misplaced == 0 and all(
+            a["end"] <= b["start"] for a, b in zip(words, words[1:]))
+        print(f"{'✅' if ok else '❌'} concorrência {concurrency}: {elapsed:6.2f}s | blocos {chunks:>2} | "
+              f"palavras {len(words)} | fora do som {misplaced}")
@@ -0,0 +1,102 @@
+import os
+import sys
+import time
+import asyncio
+import tempfile
+import subprocess as sp
+
+import numpy as np
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+
+from moviepy.config import get_setting
+from libs.TTS_Edge import EdgeTTS
+from libs.TTSCache import TTSCache
+from libs.TTSPrefetcher import TTSPrefetcher
+
+VIDEOS = 6
+NETWORK_SECONDS = 2.0  # latência simulada do serviço por narração
+RENDER_SECONDS = 2.0  # renderização simulada (CPU) por vídeo
+WORD_SECONDS = 0.35
+
+
+def fake_mp3(words):
+    """MP3 mono 24 kHz (formato do Edge TTS): um bipe por palavra e pausas entre frases."""
+    parts = []
+    for i in range(words):
+        parts.append(f"sine=f={300 + 40 * (i % 10)}:d={WORD_SECONDS}:sample_rate=24000")
+        parts.append(f"anullsrc=r=24000:cl=mono:d={0.6 if i % 5 == 4 else 0.05}")
+    graph = ";".join(f"{p}[a{i}]" for i, p in enumerate(parts))
+    graph += ";" + "".join(f"[a{i}]" for i in range(len(parts))) + f"concat=n={len(parts)}:v=0:a=1"
+    out = sp.run([get_setting("FFMPEG_BINARY"), "-loglevel", "error", "-filter_complex", graph,
+                  "-ac", "1", "-b:a", "48k", "-f", "mp3", "-"], stdout=sp.PIPE, check=True)
+    return out.stdout
+
+
+class FakeCommunicate:
+    """Substituto local do edge_tts.Communicate: mesmo formato de stream, sem rede."""
+
+    def __init__(self, text, voice, rate=None, boundary=None):
+        self.words = text.split()
+        self.audio = fake_mp3(len(self.words))
+
+    async def stream(self):
+        chunk_size = 4096
+        chunks = [self.audio[i:i + chunk_size] for i in range(0, len(self.audio), chunk_size)]
+        delay = NETWORK_SECONDS / max(1, len(chunks))
+        offset = 0.0
+        for i, word in enumerate(self.words):
+            yield {"type": "WordBoundary", "offset": int(offset * 1e7),
+                   "duration": int(WORD_SECONDS * 1e7), "text": word}
+            offset += WORD_SECONDS + (0.6 if i % 5 == 4 else 0.05)
+        for chunk in chunks:
+            await asyncio.sleep(delay)
+            yield {"type": "audio", "data": chunk}
+
+
+def render(seconds):
+    """Carga de CPU equivalente a uma renderização."""
+    end = time.perf_counter() + seconds
+    frame = np.zeros((1920, 1080, 3), dtype=np.uint8)
+    while time.perf_counter() < end:
+        frame = (frame.astype(np.uint16) * 3 // 4).astype(np.uint8)
+
+
+def narration_text(i):
+    return " ".join(f"palavra{i}_{j}" for j in range(15))
+
+
+def run(prefetch):
+    cache_dir = tempfile.mkdtemp(prefix="tts_bench_")
+    out_dir = tempfile.mkdtemp(prefix="tts_out_")
+    cache = TTSCache({"cache_dir": cache_dir})
+    overrides = {"communicate_class": FakeCommunicate, "cache": cache}
+
+    start = time.perf_counter()
+    prefetcher = None
+    if prefetch:
+        prefetcher = TTSPrefetcher({"concurrency": 3, "tts_overrides": overrides})
+        prefetcher.submit_batch([{"text": narration_text(i)} for i in range(VIDEOS)])
+
+    waited = 0.0
+    for i in range(VIDEOS):
+        tts = EdgeTTS({"text": narration_text(i), "output_basename": os.path.join(out_dir, f"v{i}"), **overrides})
+        t0 = time.perf_counter()
+        if prefetcher:
+            prefetcher.wait(tts.cache_key())
+        tts.generate_audio_and_subtitles()
+        waited += time.perf_counter() - t0
+        render(RENDER_SECONDS)
+
+    if prefetcher:
+        prefetcher.close()
+    return time.perf_counter() - start, waited
+
+
+if __name__ == "__main__":
+    print(f"{VIDEOS} vídeos | rede simulada {NETWORK_SECONDS}s | render {RENDER_SECONDS}s por vídeo")
+    for label, flag in (("sequencial", False), ("com prefetch", True)):
+        total, waited = run(flag)
+        print(f"{label:>14}: total {total:6.2f}s | espera pela narração {waited:6.2f}s")
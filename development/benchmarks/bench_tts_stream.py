@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+import asyncio
+import tempfile
+import tracemalloc
+import subprocess as sp
+
+from pydub import AudioSegment
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+
+from moviepy.config import get_setting
+from libs.TTS_Edge import EdgeTTS
+
+MINUTES = 30
+CHUNK_SIZE = 1440  # ordem de grandeza dos chunks de áudio do Edge TTS (mp3 48 kbps)
+
+
+def synthetic_mp3(minutes):
+    """Stream mp3 mono 24 kHz / 48 kbps (formato do Edge TTS) com a duração pedida."""
+    out = sp.run([get_setting("FFMPEG_BINARY"), "-loglevel", "error",
+                  "-f", "lavfi", "-i", f"sine=f=220:d={minutes * 60}:sample_rate=24000",
+                  "-ac", "1", "-b:a", "48k", "-f", "mp3", "-"], stdout=sp.PIPE, check=True)
+    return out.stdout
+
+
+class FakeCommunicate:
+    """Substituto local do edge_tts.Communicate: entrega o mp3 em chunks, sem rede."""
+    audio = b""
+
+    def __init__(self, text, voice, rate=None, boundary=None):
+        pass
+
+    async def stream(self):
+        for i in range(0, len(self.audio), CHUNK_SIZE):
+            yield {"type": "audio", "data": self.audio[i:i + CHUNK_SIZE]}
+            if i % (CHUNK_SIZE * 64) == 0:
+                await asyncio.sleep(0)
+
+
+async def legacy_synthesize():
+    """Caminho anterior: bytes += chunk, arquivo temporário e decode com pydub."""
+    audio_data = b""
+    async for chunk in FakeCommunicate(None, None).stream():
+        audio_data += chunk["data"]
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+        tmp.write(audio_data)
+        tmp_path = tmp.name
+    audio = AudioSegment.from_file(tmp_path)
+    os.remove(tmp_path)
+    return audio
+
+
+async def streaming_synthesize():
+    tts = EdgeTTS({"text": "x", "communicate_class": FakeCommunicate, "use_cache": False})
+    audio, _ = await tts._synthesize_audio_async()
+    return audio
+
+
+def measure(coro_fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    audio = asyncio.run(coro_fn())
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 ** 2, len(audio) / 1000
+
+
+if __name__ == "__main__":
+    FakeCommunicate.audio = synthetic_mp3(MINUTES)
+    chunks = len(FakeCommunicate.audio) // CHUNK_SIZE
+    print(f"🎧 stream sintético de {MINUTES} min: {len(FakeCommunicate.audio) / 1024 ** 2:.1f} MB em {chunks} chunks")
+    for label, fn in (("bytes += + pydub", legacy_synthesize), ("decode em stream", streaming_synthesize)):
+        elapsed, peak_mb, seconds = measure(fn)
+        print(f"{label:>18}: {elapsed:6.2f}s | pico de memória Python {peak_mb:7.1f} MB | áudio {seconds:7.1f}s")
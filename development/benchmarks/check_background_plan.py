@@ -0,0 +1,92 @@
+import os
+import sys
+import math
+import tempfile
+import subprocess as sp
+
+import numpy as np
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+
+from moviepy.config import get_setting
+from libs.MediaProbe import MediaProbe
+from libs.TemplateMaster import TemplateMaster
+from libs.BackgroundVideo import LazyVideoClip, ReaderPool
+
+LIBRARY_SIZE = 30
+CLIP_SECONDS = 3.0
+VIDEO_SECONDS = 10.0
+
+
+def make_library(out_dir):
+    """Biblioteca sintética: LIBRARY_SIZE vídeos pequenos de CLIP_SECONDS."""
+    for i in range(LIBRARY_SIZE):
+        sp.run([get_setting("FFMPEG_BINARY"), "-y", "-loglevel", "error", "-f", "lavfi",
+                "-i", f"testsrc2=s=64x114:r=24:d={CLIP_SECONDS}", "-pix_fmt", "yuv420p",
+                os.path.join(out_dir, f"clip_{i:03d}.mp4")], check=True)
+
+
+def counting_probe():
+    """Conta as chamadas de MediaProbe.probe (cache vazio: toda chamada sonda o arquivo)."""
+    calls = []
+    original = MediaProbe.probe
+
+    def probe(self, path):
+        calls.append(path)
+        return original(self, path)
+
+    MediaProbe.probe = probe
+    return calls
+
+
+def check_open_readers(max_open=2, clips=5):
+    """Percorre clipes preguiçosos em sequência e mede quantos leitores ficam abertos ao mesmo tempo."""
+    opened = {"now": 0, "peak": 0}
+
+    class Reader:
+        duration = 1.0
+
+        def get_frame(self, t):
+            return np.zeros((2, 2, 3), dtype=np.uint8)
+
+        def close(self):
+            opened["now"] -= 1
+
+    def loader():
+        opened["now"] += 1
+        opened["peak"] = max(opened["peak"], opened["now"])
+        return Reader()
+
+    pool = ReaderPool(max_open)
+    lazy = [LazyVideoClip(loader, 1.0, (2, 2), pool, name=f"clip_{i}") for i in range(clips)]
+    for clip in lazy:
+        clip.get_frame(0.5)
+    pool.close_all()
+    ok = opened["peak"] <= max_open
+    print(f"{'✅' if ok else '❌'} {clips} clipes com max_open={max_open}: pico de {opened['peak']} leitores abertos")
+    assert ok, "o pool abriu mais leitores que max_open"
+
+
+if __name__ == "__main__":
+    check_open_readers()
+
+    out_dir = tempfile.mkdtemp(prefix="background_plan_")
+    library = os.path.join(out_dir, "videos")
+    os.makedirs(library)
+    make_library(library)
+    os.environ["PROBE_CACHE_FILE"] = os.path.join(out_dir, "probe_cache.json")
+    calls = counting_probe()
+
+    tm = TemplateMaster({"slug": "check", "output_folder": out_dir, "output_ratio": "9:16", "random_seed": 1})
+    tm.max_total_video_duration = VIDEO_SECONDS
+    plan = tm.background_plan({"background_videos_dir": library})
+
+    total = sum(entry["duration"] for entry in plan)
+    # só os clipes que cobrem o vídeo (sem crossfade no plano: um a mais no máximo)
+    limit = math.ceil(VIDEO_SECONDS / CLIP_SECONDS) + 1
+    ok = len(calls) <= limit and len(plan) <= limit and abs(total - VIDEO_SECONDS) < 1e-6
+    print(f"{'✅' if ok else '❌'} {LIBRARY_SIZE} arquivos, vídeo de {VIDEO_SECONDS:.0f}s: "
+          f"{len(calls)} sondagens, {len(plan)} clipes no plano, {total:.2f}s (limite {limit})")
+    assert ok, "o plano do fundo sondou/escolheu clipes demais para a duração do vídeo"
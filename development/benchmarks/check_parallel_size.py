@@ -0,0 +1,33 @@
+import os
+import sys
+import tempfile
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # fontes são caminhos relativos à raiz
+
+from libs.TemplateMaster import TemplateMaster
+from compare_timeline_backends import build_timeline
+
+DURATION = 36.0
+WORKERS = 9
+MAX_FILE_SIZE_MB = 3
+
+
+if __name__ == "__main__":
+    out_dir = tempfile.mkdtemp(prefix="parallel_size_")
+    timeline = build_timeline(out_dir, DURATION)
+    tm = TemplateMaster({"slug": "check", "output_folder": out_dir, "output_ratio": "9:16"})
+    limit = MAX_FILE_SIZE_MB * 1024 * 1024
+    for workers in (1, WORKERS):
+        # mesmo caminho do TemplateDefault: o perfil sabe em quantos trechos o vídeo será codificado
+        encoder = tm.encoder_profile({"profile": "size-targeted", "max_file_size_mb": MAX_FILE_SIZE_MB},
+                                     duration=DURATION, workers=workers)
+        output = os.path.join(out_dir, f"workers_{workers}.mp4")
+        tm.render_timeline(timeline, output, backend="ffmpeg", encoding=encoder.encoding(), workers=workers)
+        size = os.path.getsize(output)
+        ok = size <= limit
+        print(f"{'✅' if ok else '❌'} {workers} processo(s): {size / 1024:.0f} KB "
+              f"(teto {limit / 1024:.0f} KB, maxrate {encoder.maxrate})")
+        assert ok, f"o vídeo com {workers} processo(s) passou de max_file_size_mb"
@@ -0,0 +1,110 @@
+import io
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess as sp
+
+import boto3
+from botocore.stub import Stubber
+from botocore.response import StreamingBody
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+
+from moviepy.config import get_setting
+from libs.TTS_Polly import PollyTTS
+from libs.TTSCache import TTSCache
+from libs.TextChunker import chunk_text
+
+REQUEST_SECONDS = 1.0  # latência simulada de cada synthesize_speech
+
+
+def fake_mp3(seconds):
+    out = sp.run([get_setting("FFMPEG_BINARY"), "-loglevel", "error", "-f", "lavfi",
+                  "-i", f"sine=f=300:d={seconds}:sample_rate=24000", "-ac", "1", "-b:a", "48k",
+                  "-f", "mp3", "-"], stdout=sp.PIPE, check=True)
+    return out.stdout
+
+
+def fake_marks(text):
+    """Speech marks no formato do Polly: uma palavra a cada 300 ms."""
+    lines = []
+    pos = 0
+    for i, word in enumerate(text.split()):
+        start = text.index(word, pos)
+        pos = start + len(word)
+        lines.append(json.dumps({"time": i * 300, "type": "word", "start": start, "end": pos, "value": word}))
+    return "\n".join(lines).encode("utf-8")
+
+
+def body(data):
+    return {"AudioStream": StreamingBody(io.BytesIO(data), len(data)), "ContentType": "audio/mpeg",
+            "RequestCharacters": 1}
+
+
+class LocalPolly:
+    """Stand-in local do cliente Polly: responde após REQUEST_SECONDS, sem rede."""
+
+    def __init__(self, audio):
+        self.audio = audio
+
+    def synthesize_speech(self, **params):
+        time.sleep(REQUEST_SECONDS)
+        if params["OutputFormat"] == "json":
+            return body(fake_marks(params["Text"]))
+        return body(self.audio)
+
+
+def tts(text, **params):
+    temp_dir = tempfile.mkdtemp(prefix="polly_check_")
+    return PollyTTS({"text": text, "temp_dir": temp_dir, "cache": TTSCache({"cache_dir": temp_dir}), **params})
+
+
+def check_stubber(audio, seconds):
+    """Ordem das chamadas fixa (max_workers=1): áudio e marcas de cada bloco, bloco a bloco."""
+    client = boto3.client("polly", region_name="us-east-1", aws_access_key_id="x", aws_secret_access_key="x")
+    text = " ".join(f"Frase {i} com algumas palavras." for i in range(12))
+    chunks = chunk_text(text, 120)
+    stubber = Stubber(client)
+    for chunk in chunks:
+        common = {"Text": chunk, "TextType": "text", "VoiceId": "Camila", "LanguageCode": "pt-BR", "Engine": "neural"}
+        stubber.add_response("synthesize_speech", body(audio), {**common, "OutputFormat": "mp3"})
+        stubber.add_response("synthesize_speech", body(fake_marks(chunk)),
+                             {**common, "OutputFormat": "json", "SpeechMarkTypes": ["word"]})
+
+    with stubber:
+        result = tts(text, polly_client=client, max_chars=120, max_workers=1).generate_audio_and_subtitles()
+    stubber.assert_no_pending_responses()
+
+    with open(result["subtitle_file"], encoding="utf-8") as f:
+        srt = f.read()
+    words_per_chunk = len(chunks[0].split())
+    expected_second_chunk = f"{words_per_chunk + 1}\n00:00:0{seconds}"
+    ok = len(chunks) > 1 and expected_second_chunk in srt and srt.count("-->") == len(text.split())
+    print(f"{'✅' if ok else '❌'} Stubber: {len(chunks)} blocos, {2 * len(chunks)} chamadas na ordem esperada, "
+          f"marcas deslocadas pela duração do áudio")
+    return ok
+
+
+def check_concurrency(audio):
+    text = " ".join(f"Frase número {i} de uma narração longa para o teste." for i in range(150))
+    timings = {}
+    for workers in (1, 4, 8):
+        start = time.perf_counter()
+        narration = tts(text, polly_client=LocalPolly(audio), max_workers=workers)
+        narration.generate_audio_and_subtitles()
+        timings[workers] = time.perf_counter() - start
+    chunks = len(chunk_text(text, 2900))
+    print(f"⏱️ {len(text)} caracteres em {chunks} blocos ({2 * chunks} requisições de {REQUEST_SECONDS}s): "
+          + " | ".join(f"{w} simultâneas {t:5.2f}s" for w, t in timings.items()))
+    return timings[4] < timings[1]
+
+
+if __name__ == "__main__":
+    seconds = 4
+    audio = fake_mp3(seconds)
+    results = [check_stubber(audio, seconds), check_concurrency(audio)]
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,113 @@
+import io
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+from pydub import AudioSegment, silence
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+
+from libs.TTS_Edge import EdgeTTS
+from libs.SilenceDetection import detect_nonsilent, audio_segment_samples
+
+FRAME_RATE = 24000  # Edge TTS: mp3 mono 24 kHz
+ENCODER_DELAY_MS = 60  # o mp3 atrasa o som; as marcas do Edge já vêm alinhadas ao áudio final
+
+
+def synthetic_narration(seconds, seed=0):
+    """"Fala" sintética: rajadas de tom com ruído baixo e pausas de tamanhos variados."""
+    rng = np.random.default_rng(seed)
+    samples = []
+    words = []
+    t = 0.0
+    while t < seconds:
+        word = rng.uniform(0.15, 0.6)
+        n = int(word * FRAME_RATE)
+        tone = np.sin(2 * np.pi * rng.uniform(120, 400) * np.arange(n) / FRAME_RATE) * rng.uniform(2000, 12000)
+        samples.append(tone)
+        words.append({"word": f"w{len(words)}", "start": t * 1000 + ENCODER_DELAY_MS,
+                      "end": (t + word) * 1000 + ENCODER_DELAY_MS})
+        t += word
+        pause = rng.choice([0.05, 0.1, 0.3, 0.45, 0.8, 1.2])
+        samples.append(rng.normal(0, 20, int(pause * FRAME_RATE)))
+        t += pause
+    pcm = np.clip(np.concatenate(samples), -32768, 32767).astype(np.int16)
+    audio = AudioSegment(pcm.tobytes(), frame_rate=FRAME_RATE, sample_width=2, channels=1)
+    with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
+        path = tmp.name
+    audio.export(path, format="mp3", bitrate="48k")
+    with open(path, "rb") as f:
+        data = f.read()
+    os.remove(path)
+    return data, words
+
+
+def legacy_remove_silences(tts, audio_data, word_boundaries):
+    """Implementação anterior (pydub.silence + laço aninhado), mantida aqui como referência."""
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+        tmp.write(audio_data)
+        tmp_path = tmp.name
+    audio = AudioSegment.from_file(tmp_path)
+    os.remove(tmp_path)
+
+    non_silence_ranges = silence.detect_nonsilent(audio, min_silence_len=tts.min_silence_len,
+                                                  silence_thresh=tts.silence_thresh)
+    new_audio = AudioSegment.empty()
+    adjusted_boundaries = []
+    current_time = 0
+    for start, end in non_silence_ranges:
+        segment = audio[start:end + tts.keep_silence]
+        new_audio += segment
+        for w in word_boundaries:
+            if w["start"] >= start and w["end"] <= end:
+                adjusted_boundaries.append({"word": w["word"],
+                                            "start": current_time + (w["start"] - start),
+                                            "end": current_time + (w["end"] - start)})
+        current_time += len(segment)
+    adjusted_boundaries.sort(key=lambda x: x["start"])
+    return new_audio, adjusted_boundaries
+
+
+def check(seconds, seed):
+    audio_data, words = synthetic_narration(seconds, seed)
+    out_dir = tempfile.mkdtemp(prefix="silence_check_")
+    tts = EdgeTTS({"text": "x", "output_basename": os.path.join(out_dir, "new"), "use_cache": False})
+
+    t0 = time.perf_counter()
+    old_audio, old_words = legacy_remove_silences(tts, audio_data, words)
+    old_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    new_path, new_words = tts._remove_silences(audio_data, words, final_path=os.path.join(out_dir, "new.mp3"))
+    new_time = time.perf_counter() - t0
+
+    # as legendas geradas precisam ser idênticas
+    old_srt = os.path.join(out_dir, "old")
+    tts.output_basename = old_srt
+    tts._generate_srt_word_by_word(old_words)
+    tts.output_basename = os.path.join(out_dir, "new")
+    tts._generate_srt_word_by_word(new_words)
+    with open(old_srt + ".srt") as a, open(os.path.join(out_dir, "new.srt")) as b:
+        same_srt = a.read() == b.read()
+
+    new_audio = AudioSegment.from_file(new_path)
+    same_len = abs(len(new_audio) - len(old_audio)) <= 60  # atraso do encoder mp3
+
+    decoded = AudioSegment.from_file(io.BytesIO(audio_data), format="mp3")
+    same_ranges = silence.detect_nonsilent(decoded, tts.min_silence_len, tts.silence_thresh) == detect_nonsilent(
+        audio_segment_samples(decoded), decoded.frame_rate, decoded.channels, decoded.sample_width,
+        tts.min_silence_len, tts.silence_thresh)
+
+    ok = old_words == new_words and same_srt and same_len and same_ranges
+    print(f"{'✅' if ok else '❌'} {seconds:>4}s seed={seed} | palavras {len(new_words):>4} | "
+          f"antigo {old_time:6.2f}s | novo {new_time:6.2f}s")
+    return ok
+
+
+if __name__ == "__main__":
+    results = [check(seconds, seed) for seconds, seed in ((5, 0), (30, 1), (30, 2), (120, 3))]
+    sys.exit(0 if all(results) else 1)
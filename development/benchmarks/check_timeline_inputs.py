@@ -0,0 +1,37 @@
+import os
+import sys
+import math
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+
+from libs.Timeline import Timeline
+from libs.TimelineFFmpeg import FFmpegTimeline
+
+CLIP_SECONDS = 3.0
+VIDEO_SECONDS = 10.0
+# plano sem duração total: a biblioteca inteira, três vezes (30 arquivos)
+PLAN_CLIPS = 90
+
+
+def check(start):
+    """Sequência maior que o vídeo: só os clipes até timeline.duration viram entradas do ffmpeg."""
+    timeline = Timeline({"size": (64, 114), "fps": 24, "duration": VIDEO_SECONDS})
+    timeline.add_sequence([{"path": f"clip_{i:03d}.mp4", "duration": CLIP_SECONDS} for i in range(PLAN_CLIPS)],
+                          start=start)
+    cmd = FFmpegTimeline().build_command(timeline, "saida.mp4")
+    inputs = cmd.count("-i") - 1  # a primeira entrada é o fundo de cor (lavfi)
+    clips = timeline.layers[0]["clips"]
+    covered = start + sum(clip["duration"] for clip in clips)
+    limit = math.ceil((VIDEO_SECONDS - start) / CLIP_SECONDS)
+    ok = inputs == len(clips) <= limit and abs(covered - VIDEO_SECONDS) < 1e-6
+    print(f"{'✅' if ok else '❌'} {PLAN_CLIPS} clipes a partir de {start:.1f}s num vídeo de {VIDEO_SECONDS:.0f}s: "
+          f"{inputs} entradas, cobre até {covered:.2f}s (limite {limit})")
+    assert ok, "a sequência gerou entradas além do fim da timeline"
+
+
+if __name__ == "__main__":
+    check(0.0)
+    check(1.5)
+    check(9.0)
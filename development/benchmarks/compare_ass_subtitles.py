@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+import tempfile
+import subprocess as sp
+
+import numpy as np
+from PIL import Image
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # fontes são caminhos relativos à raiz
+
+if not hasattr(Image, "ANTIALIAS"):  # moviepy 1.0.3 com Pillow >= 10
+    Image.ANTIALIAS = Image.LANCZOS
+
+from moviepy.config import get_setting
+from moviepy.editor import ColorClip, CompositeVideoClip
+from libs.Subtitle import Subtitle
+from libs.AssSubtitle import AssSubtitle
+from bench_subtitles import word_by_word_srt, WORD_MS, WORDS
+
+W, H = 1080, 1920
+FPS = 24
+SECONDS = 20
+STYLE = {"font_size": 90, "stroke_width": 3}
+BG = (40, 90, 140)
+
+
+def moviepy_final(srt_path, duration):
+    """Mesma montagem do TemplateDefault sem headline."""
+    subs = Subtitle({"subtitle_narration_file": srt_path, **STYLE}).generate().set_duration(duration)
+    block = subs.resize(width=int(W * 0.8))
+    background = ColorClip((W, H), BG).set_duration(duration)
+    return CompositeVideoClip([background, block.set_position(("center", int(H * 0.3 - block.h / 2)))])
+
+
+def ass_command(vf, duration, output, extra=()):
+    color = "0x{:02x}{:02x}{:02x}".format(*BG)
+    return [get_setting("FFMPEG_BINARY"), "-y", "-loglevel", "error", "-f", "lavfi",
+            "-i", f"color=c={color}:s={W}x{H}:r={FPS}:d={duration}", "-vf", vf, *extra, output]
+
+
+if __name__ == "__main__":
+    out_dir = tempfile.mkdtemp(prefix="ass_compare_")
+    srt_path = os.path.join(out_dir, "words.srt")
+    word_by_word_srt(srt_path)
+    duration = WORDS * WORD_MS / 1000
+
+    vf = AssSubtitle({"subtitle_narration_file": srt_path, **STYLE, "block_width": int(W * 0.8)}).generate()
+    final = moviepy_final(srt_path, duration)
+
+    # comparação visual de alguns instantes
+    diffs = []
+    for i, t in enumerate((0.1, 1.2, 5.05, 12.3)):
+        ass_png = os.path.join(out_dir, f"ass_{i}.png")
+        sp.run(ass_command(vf, duration, ass_png, ("-ss", str(t), "-frames:v", "1")), check=True)
+        ass_frame = np.asarray(Image.open(ass_png).convert("RGB")).astype(np.int16)
+        mp_frame = final.get_frame(t).astype(np.int16)
+        Image.fromarray(np.hstack([mp_frame, ass_frame]).astype(np.uint8)).save(
+            os.path.join(out_dir, f"side_by_side_{i}.png"))
+        diffs.append(np.abs(mp_frame - ass_frame).mean())
+    print(f"🔎 diferença média por pixel (0-255): {', '.join(f'{d:.2f}' for d in diffs)} | imagens em {out_dir}")
+
+    # custo de renderização: composição por frame no MoviePy x libass no encode
+    clip = final.subclip(0, SECONDS)
+    start = time.perf_counter()
+    clip.write_videofile(os.path.join(out_dir, "moviepy.mp4"), fps=FPS, codec="libx264", preset="superfast",
+                         audio=False, logger=None)
+    moviepy_time = time.perf_counter() - start
+
+    background = ColorClip((W, H), BG).set_duration(SECONDS)
+    start = time.perf_counter()
+    background.write_videofile(os.path.join(out_dir, "ass.mp4"), fps=FPS, codec="libx264", preset="superfast",
+                               audio=False, logger=None, ffmpeg_params=["-vf", vf])
+    ass_time = time.perf_counter() - start
+    print(f"⏱️ {SECONDS}s de vídeo: MoviePy {moviepy_time:6.2f}s | ASS (libass) {ass_time:6.2f}s")
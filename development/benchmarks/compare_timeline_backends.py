@@ -0,0 +1,120 @@
+import os
+import sys
+import time
+import tempfile
+import subprocess as sp
+
+import numpy as np
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # fontes são caminhos relativos à raiz
+
+from moviepy.config import get_setting
+from moviepy.editor import VideoFileClip
+from libs.Headline import Headline
+from libs.Subtitle import Subtitle
+from libs.Timeline import Timeline, write_caption_sequence
+from libs.TimelineFFmpeg import FFmpegTimeline
+from libs.TimelineMoviePy import MoviePyTimeline
+from libs.TemplateMaster import SUBTITLE_STYLE, HEADLINE_WIDTH
+from bench_subtitles import word_by_word_srt
+
+W, H = 1080, 1920
+DURATION = 12.0
+SAMPLES = 16
+# bitrate alto: a comparação mede a composição, não a perda do encoder
+ENCODING = {"bitrate": "20000k", "preset": "ultrafast"}
+
+
+def lavfi(source, output, extra=()):
+    sp.run([get_setting("FFMPEG_BINARY"), "-y", "-loglevel", "error", "-f", "lavfi", "-i", source,
+            *extra, output], check=True)
+    return output
+
+
+def build_timeline(out_dir, duration=DURATION):
+    """Mesma estrutura do TemplateDefault: fundo, narração + música, headline e legendas."""
+    sources = [
+        lavfi("testsrc2=s=1920x1080:r=30:d=5", os.path.join(out_dir, "paisagem.mp4"), ("-pix_fmt", "yuv420p")),
+        lavfi("testsrc2=s=720x1280:r=25:d=5", os.path.join(out_dir, "retrato.mp4"), ("-pix_fmt", "yuv420p")),
+        lavfi("mandelbrot=s=1280x720:r=24", os.path.join(out_dir, "mandelbrot.mp4"), ("-t", "5", "-pix_fmt", "yuv420p")),
+    ]
+    narration = lavfi(f"sine=frequency=440:d={duration}", os.path.join(out_dir, "narracao.wav"))
+    music = lavfi("sine=frequency=220:d=5", os.path.join(out_dir, "musica.mp3"))
+
+    block_width = int(W * 0.8)
+    srt_path = os.path.join(out_dir, "words.srt")
+    word_by_word_srt(srt_path)
+    captions = Subtitle({"subtitle_narration_file": srt_path, **SUBTITLE_STYLE,
+                         "block_width": block_width}).generate().set_duration(duration)
+    headline_path = Headline({"title": "Governo anuncia novas medidas econômicas", "subtitle": "Impacto nas próximas semanas",
+                              "video_width": HEADLINE_WIDTH, "output_width": block_width,
+                              "output_path": os.path.join(out_dir, "headline.png")}).generate()["path"]
+
+    timeline = Timeline({"size": (W, H), "fps": 24, "duration": duration})
+    pattern = [
+        {"path": sources[0], "duration": 4.0},
+        {"path": sources[1], "duration": 3.5, "source_start": 1.0},
+        {"path": sources[2], "duration": 4.5},
+    ]
+    # o padrão de 12 s se repete até cobrir a duração
+    timeline.add_sequence(pattern * int(-(-duration // DURATION)))
+    timeline.add_audio(narration)
+    timeline.add_audio(music, volume=0.25, loop=True)
+    top = 300
+    timeline.add_image(headline_path, ((W - block_width) // 2, top), start=1.0)
+    timeline.add_captions(write_caption_sequence(captions, os.path.join(out_dir, "captions"), fps=timeline.fps),
+                          captions.size, ((W - captions.w) // 2, top + 450))
+    return timeline
+
+
+def decode_audio(path):
+    """Áudio do arquivo como float32 estéreo a 44.1 kHz (direto do ffmpeg)."""
+    raw = sp.run([get_setting("FFMPEG_BINARY"), "-loglevel", "error", "-i", path, "-f", "f32le",
+                  "-ac", "2", "-ar", "44100", "-"], stdout=sp.PIPE, check=True).stdout
+    return np.frombuffer(raw, dtype=np.float32).reshape(-1, 2)
+
+
+def psnr(a, b):
+    mse = np.mean((a.astype(np.float64) - b.astype(np.float64)) ** 2)
+    return float("inf") if mse == 0 else 10 * np.log10(255 ** 2 / mse)
+
+
+if __name__ == "__main__":
+    out_dir = tempfile.mkdtemp(prefix="timeline_backends_")
+    timeline = build_timeline(out_dir)
+
+    outputs = {}
+    for name, backend in (("moviepy", MoviePyTimeline({**ENCODING, "threads": 4})),
+                          ("ffmpeg", FFmpegTimeline({**ENCODING, "threads": 4}))):
+        output = os.path.join(out_dir, f"{name}.mp4")
+        start = time.perf_counter()
+        if name == "moviepy":
+            backend.build(timeline).write_videofile(output, fps=timeline.fps, codec=backend.codec,
+                                                    bitrate=backend.bitrate, preset=backend.preset,
+                                                    audio_codec="aac", threads=4, logger=None,
+                                                    temp_audiofile=os.path.join(out_dir, "temp-audio.m4a"))
+        else:
+            backend.render(timeline, output)
+        outputs[name] = (output, time.perf_counter() - start)
+
+    a, b = VideoFileClip(outputs["moviepy"][0]), VideoFileClip(outputs["ffmpeg"][0])
+    print(f"🎞️ duração: moviepy {a.duration:.2f}s | ffmpeg {b.duration:.2f}s | timeline {DURATION:.2f}s")
+    scores = []
+    for t in np.linspace(0.05, DURATION - 0.1, SAMPLES):
+        scores.append((t, psnr(a.get_frame(t), b.get_frame(t)),
+                       np.abs(a.get_frame(t).astype(int) - b.get_frame(t).astype(int)).mean()))
+    worst = min(scores, key=lambda s: s[1])
+    ok = worst[1] > 30
+    print(f"{'✅' if ok else '❌'} {SAMPLES} frames amostrados: PSNR mínimo {worst[1]:.1f} dB (t={worst[0]:.2f}s), "
+          f"médio {np.mean([s[1] for s in scores]):.1f} dB | diferença média máx. {max(s[2] for s in scores):.2f}/255")
+
+    fa, fb = decode_audio(outputs["moviepy"][0]), decode_audio(outputs["ffmpeg"][0])
+    n = min(len(fa), len(fb))
+    rms = lambda x: float(np.sqrt(np.mean(x ** 2)))
+    corr = float(np.corrcoef(fa[:n, 0], fb[:n, 0])[0, 1])
+    print(f"🔊 áudio: RMS moviepy {rms(fa[:n]):.4f} | ffmpeg {rms(fb[:n]):.4f} | correlação {corr:.4f}")
+    print(f"⏱️ renderização: moviepy {outputs['moviepy'][1]:6.2f}s | ffmpeg {outputs['ffmpeg'][1]:6.2f}s "
+          f"({outputs['moviepy'][1] / outputs['ffmpeg'][1]:.1f}x) | arquivos em {out_dir}")
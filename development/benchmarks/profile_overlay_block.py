@@ -0,0 +1,106 @@
+import os
+import sys
+import time
+import pstats
+import cProfile
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+# Caminho absoluto até a raiz do projeto
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # fontes são caminhos relativos à raiz
+
+if not hasattr(Image, "ANTIALIAS"):  # moviepy 1.0.3 com Pillow >= 10
+    Image.ANTIALIAS = Image.LANCZOS
+
+from moviepy.editor import VideoClip, ImageClip, CompositeVideoClip
+from libs.Headline import Headline
+from libs.Subtitle import Subtitle
+from libs.TemplateMaster import SUBTITLE_STYLE, HEADLINE_WIDTH
+from bench_subtitles import word_by_word_srt
+
+W, H = 1080, 1920
+FPS = 24
+SECONDS = 10
+GAP = 200
+TITLE = "Governo anuncia novas medidas econômicas para conter a inflação"
+SUBTITLE = "Especialistas avaliam o impacto das mudanças nas próximas semanas"
+
+
+def background(duration):
+    """Fundo sintético que muda a cada frame (sem I/O de disco)."""
+    base = np.full((H, W, 3), 90, dtype=np.uint8)
+
+    def make_frame(t):
+        frame = base.copy()
+        frame[:, : int(W * t / duration) % W] = 160
+        return frame
+
+    return VideoClip(make_frame, duration=duration)
+
+
+def headline_clip(out_dir, output_width=None):
+    path = os.path.join(out_dir, f"headline_{output_width}.png")
+    Headline({"title": TITLE, "subtitle": SUBTITLE, "video_width": HEADLINE_WIDTH,
+              "output_width": output_width, "output_path": path}).generate()
+    return ImageClip(path).set_duration(SECONDS)
+
+
+def resized_block(srt_path, out_dir):
+    """Montagem anterior do TemplateDefault: dois resize avaliados a cada frame."""
+    subs = Subtitle({"subtitle_narration_file": srt_path, **SUBTITLE_STYLE}).generate().set_duration(SECONDS)
+    head = headline_clip(out_dir)
+    subs = subs.resize(width=head.w)
+    block = CompositeVideoClip([head, subs.set_position(("center", head.h + GAP))],
+                               size=(head.w, head.h + subs.h + GAP))
+    block = block.resize(width=int(W * 0.8))
+    return CompositeVideoClip([background(SECONDS), block.set_position(("center", int(H * 0.3 - block.h / 2)))])
+
+
+def prerasterized_block(srt_path, out_dir):
+    """Montagem atual: headline e legendas rasterizadas no tamanho final."""
+    block_width = int(W * 0.8)
+    subs = Subtitle({"subtitle_narration_file": srt_path, **SUBTITLE_STYLE,
+                     "block_width": block_width}).generate().set_duration(SECONDS)
+    head = headline_clip(out_dir, block_width)
+    gap = int(round(GAP * block_width / HEADLINE_WIDTH))
+    top = int(H * 0.3 - (head.h + gap + subs.h) / 2)
+    return CompositeVideoClip([background(SECONDS), head.set_position(("center", top)),
+                               subs.set_position(("center", top + head.h + gap))])
+
+
+def profile_render(final, output):
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    final.write_videofile(output, fps=FPS, codec="libx264", preset="superfast", audio=False, logger=None)
+    profiler.disable()
+    elapsed = time.perf_counter() - start
+
+    # tempo gasto nos resize do MoviePy (função resizer de moviepy/video/fx/resize.py)
+    stats = pstats.Stats(profiler).stats
+    resize = sum(cumtime for (filename, _, name), (_, _, _, cumtime, _) in stats.items()
+                 if filename.endswith(os.path.join("fx", "resize.py")) and name == "resizer")
+    return elapsed, resize
+
+
+if __name__ == "__main__":
+    out_dir = tempfile.mkdtemp(prefix="overlay_block_")
+    srt_path = os.path.join(out_dir, "words.srt")
+    word_by_word_srt(srt_path)
+
+    old, new = resized_block(srt_path, out_dir), prerasterized_block(srt_path, out_dir)
+    for t in (0.2, 3.1, 7.5):
+        diff = np.abs(old.get_frame(t).astype(int) - new.get_frame(t).astype(int)).mean()
+        print(f"🔎 t={t:4.1f}s diferença média por pixel (0-255): {diff:.2f}")
+
+    old_time, old_resize = profile_render(old, os.path.join(out_dir, "old.mp4"))
+    new_time, new_resize = profile_render(new, os.path.join(out_dir, "new.mp4"))
+    print(f"⏱️ {SECONDS}s de vídeo a {FPS} fps (cProfile)")
+    print(f"   resize por frame: {old_time:6.2f}s | resize {old_resize:5.2f}s "
+          f"({100 * old_resize / old_time:4.1f}% da renderização)")
+    print(f"   pré-rasterizado:  {new_time:6.2f}s | resize {new_resize:5.2f}s "
+          f"| {100 * (1 - new_time / old_time):4.1f}% menos tempo")
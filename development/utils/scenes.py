@@ -37,9 +37,9 @@ for scene_name, scene_data in json_scenes_library.items():
         "slug": scene_name
     })
 
-    if narration_text and not os.path.exists(narration_file):
+    if narration_text:
         # generate narration audio file and subtitle file
-        # narration_subtitles
+        # narration_subtitles (frases repetidas vêm do cache de TTS, sem rede)
         a = TM.narration_subtitles({
             "narration_text": narration_text,
             "edge_tts": {
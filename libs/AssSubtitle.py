@@ -0,0 +1,155 @@
+import os
+import struct
+import srt
+from PIL import ImageFont, ImageColor
+
+
+def ass_time(seconds):
+    """Tempo no formato do ASS: h:mm:ss.cc (centésimos)."""
+    cs = int(round(max(0.0, seconds) * 100))
+    h, cs = divmod(cs, 360000)
+    m, cs = divmod(cs, 6000)
+    s, cs = divmod(cs, 100)
+    return f"{h}:{m:02d}:{s:02d}.{cs:02d}"
+
+
+def ass_color(color, alpha=0):
+    """Cor (nome ou hex) no formato &HAABBGGRR do ASS."""
+    r, g, b = ImageColor.getrgb(color)[:3]
+    return f"&H{alpha:02X}{b:02X}{g:02X}{r:02X}"
+
+
+def win_metrics(font_path):
+    """
+    Métricas de linha usadas pela libass, em "em": (usWinAscent, usWinDescent) / unitsPerEm
+    da tabela OS/2. Retorna None se a fonte não tiver essas tabelas.
+    """
+    with open(font_path, "rb") as f:
+        data = f.read()
+    num_tables = struct.unpack(">H", data[4:6])[0]
+    tables = {}
+    for i in range(num_tables):
+        tag, _, offset, _ = struct.unpack(">4sIII", data[12 + 16 * i:28 + 16 * i])
+        tables[tag] = offset
+    if b"head" not in tables or b"OS/2" not in tables:
+        return None
+    units_per_em = struct.unpack(">H", data[tables[b"head"] + 18:tables[b"head"] + 20])[0]
+    win_ascent, win_descent = struct.unpack(">HH", data[tables[b"OS/2"] + 74:tables[b"OS/2"] + 78])
+    return win_ascent / units_per_em, win_descent / units_per_em
+
+
+def escape_filter_path(path):
+    """Escapa um caminho para uso como argumento de filtro do ffmpeg."""
+    return os.path.abspath(path).replace("\\", "/").replace(":", "\\:").replace("'", "\\'")
+
+
+class AssSubtitle:
+    """
+    Converte o SRT palavra por palavra (EdgeTTS/PollyTTS) em um arquivo ASS com
+    o mesmo estilo do Subtitle (fonte, contorno, largura máxima, posição) para
+    ser gravado no vídeo pelo filtro "ass" do ffmpeg (libass) durante o encode
+    final, sem composição de legendas em Python por frame.
+    """
+
+    def __init__(self, params=None):
+        defaults = {
+            "subtitle_narration_file": None,
+            "output_path": None,  # padrão: mesmo nome do .srt com extensão .ass
+            "font_path": "./fonts/Poppins/Poppins-Black.ttf",
+            "font_size": 150,
+            "color": "white",
+            "stroke_color": "black",
+            "stroke_width": 7,
+            "resolution_output": (1080, 1920),
+            "max_width_percent": 0.85,
+            # largura final do bloco de legendas (ex.: resize para 80% do vídeo); None = sem escala
+            "block_width": None,
+            # centro da legenda, em fração da largura/altura do vídeo
+            "center": (0.5, 0.3),
+        }
+        if params:
+            defaults.update(params)
+        for k, v in defaults.items():
+            setattr(self, k, v)
+
+        if not self.subtitle_narration_file or not os.path.exists(self.subtitle_narration_file):
+            raise FileNotFoundError("Arquivo de legenda (.srt) não encontrado")
+        if not os.path.exists(self.font_path):
+            raise FileNotFoundError(f"Fonte TTF não encontrada: {self.font_path}")
+
+        if not self.output_path:
+            self.output_path = os.path.splitext(self.subtitle_narration_file)[0] + ".ass"
+
+        # mesma conta do resize(width=block_width) sobre a trilha de largura max_width_percent
+        track_width = int(self.resolution_output[0] * self.max_width_percent)
+        self.scale = self.block_width / track_width if self.block_width else 1.0
+
+    def _style(self):
+        font = ImageFont.truetype(self.font_path, self.font_size)
+        family, style = font.getname()
+        # na libass o tamanho da fonte é a altura da linha (métricas "win" da OS/2),
+        # no Pillow/ImageMagick é o "em": converte pelas métricas da própria fonte
+        ascent, descent = font.getmetrics()
+        # linha base abaixo do centro da caixa, como no bitmap do CaptionRenderer
+        baseline = (ascent - descent) / 2 * self.scale
+        metrics = win_metrics(self.font_path)
+        if metrics:
+            win_ascent, win_descent = metrics
+            font_size = self.font_size * (win_ascent + win_descent) * self.scale
+            # a libass centraliza a caixa "win": desloca para alinhar as linhas base
+            y_shift = baseline - self.font_size * (win_ascent - win_descent) / 2 * self.scale
+        else:
+            font_size = (ascent + descent) * self.scale
+            y_shift = 0
+        # mesmo contorno do CaptionRenderer (metade do stroke, todo para fora)
+        outline = round(self.stroke_width / 2) * self.scale
+        font_name = family if style in ("Regular", "Normal") else f"{family} {style}"
+        return font_name, font_size, outline, y_shift
+
+    def ffmpeg_filter(self):
+        fonts_dir = os.path.dirname(self.font_path)
+        return f"ass={escape_filter_path(self.output_path)}:fontsdir={escape_filter_path(fonts_dir)}"
+
+    def generate(self):
+        """Grava o arquivo .ass e retorna o filtro do ffmpeg que o aplica."""
+        with open(self.subtitle_narration_file, "r", encoding="utf-8") as f:
+            subtitles = list(srt.parse(f.read()))
+        if not subtitles:
+            raise RuntimeError("Nenhuma legenda pôde ser gerada!")
+
+        width, height = self.resolution_output
+        font_name, font_size, outline, y_shift = self._style()
+        # largura máxima da legenda, já com a escala do bloco
+        max_width = int(width * self.max_width_percent * self.scale)
+        margin = max(0, (width - max_width) // 2)
+        x, y = int(width * self.center[0]), int(round(height * self.center[1] + y_shift))
+
+        lines = [
+            "[Script Info]",
+            "ScriptType: v4.00+",
+            f"PlayResX: {width}",
+            f"PlayResY: {height}",
+            "WrapStyle: 0",
+            "ScaledBorderAndShadow: yes",
+            "",
+            "[V4+ Styles]",
+            "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+            "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, "
+            "Alignment, MarginL, MarginR, MarginV, Encoding",
+            f"Style: Default,{font_name},{font_size:.2f},{ass_color(self.color)},{ass_color(self.color)},"
+            f"{ass_color(self.stroke_color)},{ass_color(self.stroke_color, 0xFF)},0,0,0,0,100,100,0,0,1,"
+            f"{outline:.2f},0,5,{margin},{margin},0,1",
+            "",
+            "[Events]",
+            "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+        ]
+        for sub in subtitles:
+            txt = sub.content.replace("\n", " ").upper().replace("{", "(").replace("}", ")")
+            lines.append(
+                f"Dialogue: 0,{ass_time(sub.start.total_seconds())},{ass_time(sub.end.total_seconds())},"
+                f"Default,,0,0,0,,{{\\pos({x},{y})}}{txt}"
+            )
+
+        with open(self.output_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return self.ffmpeg_filter()
@@ -0,0 +1,92 @@
+import queue
+import threading
+import subprocess as sp
+
+from pydub import AudioSegment
+
+
+class AudioStreamDecoder:
+    """
+    Decodifica um stream de áudio comprimido (ex.: mp3 do Edge TTS) para PCM
+    enquanto os chunks ainda estão chegando.
+
+    Os chunks vão para o stdin de um processo ffmpeg por uma thread escritora
+    (feed() nunca bloqueia o loop asyncio) e o PCM é lido do stdout por outra
+    thread para um bytearray que cresce sem recópias.
+    """
+
+    def __init__(self, params=None):
+        defaults = {
+            "input_format": "mp3",
+            "frame_rate": 24000,
+            "channels": 1,
+            "sample_width": 2,
+            "read_size": 64 * 1024,
+        }
+        if params:
+            defaults.update(params)
+        for k, v in defaults.items():
+            setattr(self, k, v)
+
+        cmd = [
+            AudioSegment.converter, "-loglevel", "error",
+            "-f", self.input_format, "-i", "pipe:0",
+            "-f", "s16le", "-acodec", "pcm_s16le",
+            "-ac", str(self.channels), "-ar", str(self.frame_rate),
+            "pipe:1",
+        ]
+        self.proc = sp.Popen(cmd, stdin=sp.PIPE, stdout=sp.PIPE, stderr=sp.PIPE)
+        self.pcm = bytearray()
+        self.bytes_in = 0
+        self._chunks = queue.Queue()
+        self._stderr = b""
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._writer.start()
+        self._reader.start()
+
+    def _write_loop(self):
+        try:
+            while True:
+                chunk = self._chunks.get()
+                if chunk is None:
+                    break
+                self.proc.stdin.write(chunk)
+        except (BrokenPipeError, OSError):
+            pass
+        finally:
+            try:
+                self.proc.stdin.close()
+            except OSError:
+                pass
+
+    def _read_loop(self):
+        while True:
+            data = self.proc.stdout.read1(self.read_size)
+            if not data:
+                break
+            self.pcm += data
+        self._stderr = self.proc.stderr.read()
+
+    def feed(self, data):
+        self.bytes_in += len(data)
+        self._chunks.put(bytes(data))
+
+    def finish(self):
+        """Fecha a entrada e retorna o áudio decodificado como AudioSegment."""
+        self._chunks.put(None)
+        self._writer.join()
+        self._reader.join()
+        self.proc.wait()
+        if self.proc.returncode != 0:
+            raise RuntimeError(f"Falha ao decodificar áudio: {self._stderr.decode('utf-8', 'ignore').strip()[-300:]}")
+        if not self.bytes_in:
+            raise ValueError("Nenhum áudio recebido do serviço de TTS.")
+        # o bytearray vai direto para o AudioSegment (sem cópia extra do PCM)
+        pcm, self.pcm = self.pcm, bytearray()
+        return AudioSegment(pcm, frame_rate=self.frame_rate, sample_width=self.sample_width, channels=self.channels)
+
+    def abort(self):
+        self._chunks.put(None)
+        if self.proc.poll() is None:
+            self.proc.kill()
@@ -1,9 +1,17 @@
 import os
 import random
+import tempfile
 import PIL.Image
-from moviepy.editor import VideoFileClip, CompositeVideoClip, concatenate_videoclips
+import numpy as np
+from moviepy.editor import VideoClip, VideoFileClip, concatenate_videoclips
 from moviepy.video.fx.all import crop, resize
 
+from libs.ProxyCache import ProxyCache
+from libs.MediaProbe import MediaProbe
+from libs.TransitionTrack import CrossfadeTrack
+from libs.FFmpegBackground import FFmpegBackground
+from libs.ScaledVideoClip import ScaledVideoFileClip
+
 if not hasattr(PIL.Image, 'ANTIALIAS'):
     PIL.Image.ANTIALIAS = PIL.Image.Resampling.LANCZOS
 
@@ -21,8 +29,17 @@ class BackgroundVideo:
             "enable_crossfade": False,  # <-- nova flag
             "max_clips": None,
             "shuffle_clips": True,
+            "random_seed": None,
             "valid_extensions": ["mp4", "mkv", "avi", "mov", "flv", "webm"],
             "loop_background": True,
+            "fps": 24,
+            "use_proxy_cache": False,
+            "scale_at_decode": True,  # crop/scale feitos pelo ffmpeg no decode
+            "proxy_cache": None,  # instância de ProxyCache (opcional)
+            "media_probe": None,  # instância de MediaProbe (opcional)
+            "max_open_readers": 2,
+            "engine": "moviepy",  # moviepy | ffmpeg
+            "ffmpeg_output_path": None,  # arquivo intermediário do engine ffmpeg
         }
         if params:
             defaults.update(params)
@@ -31,7 +48,44 @@ class BackgroundVideo:
         for k, v in defaults.items():
             setattr(self, k, v)
 
+        self._reader_pool = ReaderPool(self.max_open_readers)
+        self.rng = random.Random(self.random_seed)
+
+    def _get_proxy_cache(self):
+        if self.proxy_cache is None:
+            self.proxy_cache = ProxyCache({
+                "output_ratio": self.output_ratio,
+                "resolution_output": self.resolution_output,
+                "fps": self.fps,
+            })
+        return self.proxy_cache
+
+    def load_proxy_clip(self, video_path):
+        """Carrega o proxy já normalizado do cache (sem crop/resize por frame)."""
+        proxy_path = self._get_proxy_cache().get_proxy(video_path)
+        if not proxy_path:
+            return None
+        video = VideoFileClip(proxy_path, audio=False)
+        if video.duration > self.max_clip_duration:
+            video = video.subclip(0, self.max_clip_duration)
+        return video
+
     def load_and_resize_clip(self, video_path):
+        if self.use_proxy_cache:
+            try:
+                video = self.load_proxy_clip(video_path)
+                if video:
+                    return video
+            except Exception as e:
+                print(f"[ERRO] Falha ao carregar proxy, usando o original: {e}")
+        if self.scale_at_decode:
+            try:
+                video = ScaledVideoFileClip(video_path, self.resolution_output)
+                if video.duration > self.max_clip_duration:
+                    video = video.subclip(0, self.max_clip_duration)
+                return video
+            except Exception as e:
+                print(f"[ERRO] Falha no scale no decode, usando resize por frame: {e}")
         try:
             video = VideoFileClip(video_path, audio=False)
             if video.duration > self.max_clip_duration:
@@ -59,70 +113,165 @@ class BackgroundVideo:
     def apply_crossfade_transition(self, clips):
         if not clips:
             return None
-        base = clips[0]
-        for next_clip in clips[1:]:
-            next_clip = next_clip.crossfadein(self.crossfade_duration).set_start(base.duration - self.crossfade_duration)
-            base = CompositeVideoClip([base, next_clip]).set_duration(base.duration + next_clip.duration - self.crossfade_duration)
-        return base
-
-    def generate_background_video(self):
-        # Lista de vídeos válidos
-        video_files = [f for f in os.listdir(self.background_videos_dir)
-                    if any(f.lower().endswith(ext) for ext in self.valid_extensions)]
-        if not video_files:
-            print("[ERRO] Nenhum arquivo de vídeo válido encontrado.")
-            return None
+        return CrossfadeTrack(clips, crossfade_duration=self.crossfade_duration, size=self.resolution_output)
 
+    def list_video_files(self):
+        video_files = sorted(f for f in os.listdir(self.background_videos_dir)
+                    if any(f.lower().endswith(ext) for ext in self.valid_extensions))
         if self.shuffle_clips:
-            random.shuffle(video_files)
+            self.rng.shuffle(video_files)
         if self.max_clips:
             video_files = video_files[:self.max_clips]
+        return [os.path.join(self.background_videos_dir, f) for f in video_files]
 
-        # Carregar e redimensionar clipes
-        clips = []
-        for video_name in video_files:
-            path = os.path.join(self.background_videos_dir, video_name)
-            clip = self.load_and_resize_clip(path)
-            if clip:
-                clips.append(clip)
-            else:
-                print(f"[ERRO] Falha ao carregar: {video_name}")
+    def plan_clips(self):
+        """
+        Escolhe os clipes (caminho + duração) em ordem de timeline usando só metadados.
+        Só sonda os arquivos necessários para preencher max_total_video_duration;
+        nenhum leitor de vídeo é aberto aqui.
+        """
+        video_files = self.list_video_files()
+        if not video_files:
+            print("[ERRO] Nenhum arquivo de vídeo válido encontrado.")
+            return []
 
-        if not clips:
-            print("[ERRO] Nenhum clipe pôde ser carregado.")
-            return None
+        probe = self.media_probe or MediaProbe()
 
-        # Ajustar duração total considerando o crossfade:
-        # A duração final = (soma das durações dos clipes) - (n_clips - 1)*crossfade_duration.
-        if self.max_total_video_duration:
+        def candidates():
+            for path in video_files:
+                info = probe.probe(path)
+                if info and info["duration"]:
+                    yield {"path": path, "duration": min(info["duration"], self.max_clip_duration)}
+                else:
+                    print(f"[ERRO] Falha ao carregar: {os.path.basename(path)}")
+
+        try:
+            if not self.max_total_video_duration:
+                plan = list(candidates())
+                if self.loop_background:
+                    # Repetir clipes algumas vezes para ter vídeo mais longo
+                    plan = plan * 3
+                return plan
+
+            # Ajustar duração total considerando o crossfade:
+            # A duração final = (soma das durações dos clipes) - (n_clips - 1)*crossfade_duration.
+            # Sem crossfade os clipes só são concatenados: não há sobreposição.
+            overlap = self.crossfade_duration if self.enable_crossfade else 0
+            plan = []
+            loaded = []
+            source = candidates()
             final_duration = 0
-            extended_clips = []
             idx = 0
             while True:
-                clip = clips[idx % len(clips)]
-                if extended_clips:
+                entry = next(source, None) if source else None
+                if entry:
+                    loaded.append(entry)
+                else:
+                    # Biblioteca esgotada: repetir os clipes já escolhidos
+                    source = None
+                    if not loaded:
+                        return []
+                    entry = loaded[idx % len(loaded)]
+
+                if plan:
                     # Ao adicionar um novo clipe, perde-se crossfade_duration
-                    nova_duracao = final_duration + clip.duration - self.crossfade_duration
+                    nova_duracao = final_duration + entry["duration"] - overlap
                 else:
-                    nova_duracao = final_duration + clip.duration
+                    nova_duracao = final_duration + entry["duration"]
 
                 if nova_duracao >= self.max_total_video_duration:
                     # Ajusta o último clipe para que o vídeo fique exatamente com a duração desejada.
                     restante = self.max_total_video_duration - final_duration
-                    if extended_clips:
-                        restante += self.crossfade_duration  # recuperar o tempo de crossfade não utilizado
-                    if restante < clip.duration:
-                        clip = clip.subclip(0, restante)
-                    extended_clips.append(clip)
-                    break
-                else:
-                    extended_clips.append(clip)
-                    final_duration = nova_duracao
-                    idx += 1
-            clips = extended_clips
-        elif self.loop_background:
-            # Repetir clipes algumas vezes para ter vídeo mais longo
-            clips = clips * 3
+                    if plan:
+                        restante += overlap  # recuperar o tempo de crossfade não utilizado
+                    plan.append({**entry, "duration": min(entry["duration"], restante)})
+                    return plan
+
+                plan.append(entry)
+                final_duration = nova_duracao
+                idx += 1
+        finally:
+            probe.save()
+
+    def lazy_clip(self, entry):
+        """Clipe com tamanho/duração conhecidos que só abre o leitor no primeiro frame."""
+        duration = entry["duration"]
+
+        def loader():
+            clip = self.load_and_resize_clip(entry["path"])
+            if clip is None:
+                return None
+            if clip.duration > duration:
+                clip = clip.subclip(0, duration)
+            return clip
+
+        return LazyVideoClip(loader, duration, self.resolution_output, self._reader_pool, name=entry["path"])
+
+    def render_with_ffmpeg(self, plan):
+        """
+        Monta o fundo inteiro no ffmpeg e retorna o caminho do arquivo intermediário.
+        Com o cache de proxies, usa concat demuxer + stream copy (sem reencode).
+        Exige max_total_video_duration: sem ela o plano cobre a biblioteca inteira.
+        """
+        if not self.max_total_video_duration:
+            raise ValueError("render_with_ffmpeg precisa de max_total_video_duration (duração do vídeo)")
+        normalized = False
+        if self.use_proxy_cache:
+            proxies = [self._get_proxy_cache().get_proxy(entry["path"]) for entry in plan]
+            if all(proxies):
+                plan = [{**entry, "path": proxy} for entry, proxy in zip(plan, proxies)]
+                normalized = True
+
+        output_path = self.ffmpeg_output_path or os.path.join(tempfile.gettempdir(), f"background_{os.getpid()}.mp4")
+        engine = FFmpegBackground({
+            "resolution_output": self.resolution_output,
+            "fps": self.fps,
+            "output_path": output_path,
+        })
+        return engine.render(plan, self.max_total_video_duration, normalized=normalized)
+
+    def timeline_plan(self):
+        """
+        Plano do fundo para a Timeline (IR): [{"path", "duration"}] na ordem.
+        Com engine ffmpeg vira um único arquivo intermediário; com o cache de
+        proxies, usa os proxies já normalizados que existirem.
+        """
+        plan = self.plan_clips()
+        if not plan:
+            print("[ERRO] Nenhum clipe pôde ser carregado.")
+            return []
+
+        if self.engine == "ffmpeg":
+            try:
+                path = self.render_with_ffmpeg(plan)
+                duration = sum(entry["duration"] for entry in plan)
+                if self.max_total_video_duration:
+                    duration = min(duration, self.max_total_video_duration)
+                return [{"path": path, "duration": duration}]
+            except Exception as e:
+                print(f"[ERRO] Falha no engine ffmpeg, usando os clipes de origem: {e}")
+
+        if self.use_proxy_cache:
+            proxies = [self._get_proxy_cache().get_proxy(entry["path"]) for entry in plan]
+            plan = [{**entry, "path": proxy or entry["path"]} for entry, proxy in zip(plan, proxies)]
+        return plan
+
+    def generate_background_video(self):
+        plan = self.plan_clips()
+        if not plan:
+            print("[ERRO] Nenhum clipe pôde ser carregado.")
+            return None
+
+        if self.engine == "ffmpeg" and not self.enable_crossfade:
+            try:
+                final_video = VideoFileClip(self.render_with_ffmpeg(plan), audio=False)
+                if self.max_total_video_duration and final_video.duration > self.max_total_video_duration:
+                    final_video = final_video.subclip(0, self.max_total_video_duration)
+                return final_video
+            except Exception as e:
+                print(f"[ERRO] Falha no engine ffmpeg, usando moviepy: {e}")
+
+        clips = [self.lazy_clip(entry) for entry in plan]
 
         if self.enable_crossfade:
             final_video = self.apply_crossfade_transition(clips)
@@ -134,3 +283,63 @@ class BackgroundVideo:
         
         return final_video
 
+
+class ReaderPool:
+    """Mantém no máximo `max_open` leitores de vídeo abertos (fecha o usado há mais tempo)."""
+
+    def __init__(self, max_open=2):
+        self.max_open = max_open
+        self._open = []
+
+    def acquire(self, lazy_clip):
+        if lazy_clip in self._open:
+            self._open.remove(lazy_clip)
+            self._open.append(lazy_clip)
+            return
+        while len(self._open) >= self.max_open:
+            self._open.pop(0).release()
+        self._open.append(lazy_clip)
+
+    def discard(self, lazy_clip):
+        if lazy_clip in self._open:
+            self._open.remove(lazy_clip)
+
+    def close_all(self):
+        while self._open:
+            self._open.pop(0).release()
+
+
+class LazyVideoClip(VideoClip):
+    def __init__(self, loader, duration, size, pool, name=""):
+        VideoClip.__init__(self)
+        self.loader = loader
+        self.pool = pool
+        self.name = name
+        self.size = tuple(size)
+        self.duration = self.end = duration
+        self._clip = None
+        self._failed = False
+        self.make_frame = self._make_frame
+
+    def _make_frame(self, t):
+        if self._failed:
+            w, h = self.size
+            return np.zeros((h, w, 3), dtype=np.uint8)
+        # reserva a vaga antes de abrir: o pool fecha o leitor mais antigo primeiro
+        self.pool.acquire(self)
+        if self._clip is None:
+            self._clip = self.loader()
+            if self._clip is None:
+                self._failed = True
+                self.pool.discard(self)
+                print(f"[ERRO] Falha ao carregar: {os.path.basename(self.name)}")
+                return self._make_frame(t)
+        return self._clip.get_frame(min(t, self._clip.duration - 1e-3))
+
+    def release(self):
+        if self._clip is not None:
+            self._clip.close()
+            self._clip = None
+
+    def close(self):
+        self.release()
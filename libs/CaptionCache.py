@@ -0,0 +1,136 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from libs.DiskCache import DiskCache, DEFAULT_CACHE_ROOT, hash_key
+
+# muda quando o desenho do CaptionRenderer mudar (invalida bitmaps antigos)
+RENDER_VERSION = 1
+
+
+class CaptionCache:
+    """
+    Cache de bitmaps de legenda (RGBA) compartilhado entre vídeos.
+
+    Dois níveis: memória (LRU por bytes, dentro do lote) e disco (DiskCache,
+    persistente entre execuções, arquivos .npy). A chave é o texto mais todos
+    os parâmetros que mudam o desenho.
+    """
+
+    def __init__(self, params=None):
+        defaults = {
+            "cache_dir": os.getenv("CAPTION_CACHE_DIR", os.path.join(DEFAULT_CACHE_ROOT, "captions")),
+            "max_cache_size_mb": float(os.getenv("CAPTION_CACHE_MAX_MB", 1024)),
+            "max_memory_mb": float(os.getenv("CAPTION_CACHE_MEMORY_MB", 256)),
+        }
+        if params:
+            defaults.update(params)
+        for k, v in defaults.items():
+            setattr(self, k, v)
+
+        max_size = int(self.max_cache_size_mb * 1024 ** 2) if self.max_cache_size_mb else None
+        self.disk = DiskCache({"cache_dir": self.cache_dir, "max_size_bytes": max_size})
+        self.max_memory_bytes = int(self.max_memory_mb * 1024 ** 2)
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "render_seconds": 0.0}
+
+    @staticmethod
+    def make_key(text, font_path, **params):
+        try:
+            font_size_bytes = os.path.getsize(font_path)
+        except OSError:
+            font_size_bytes = None
+        return hash_key("caption", RENDER_VERSION, text, os.path.abspath(font_path), font_size_bytes, params)
+
+    def _remember(self, key, bitmap):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return
+            self._memory[key] = bitmap
+            self._memory_bytes += bitmap.nbytes
+            while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+                _, old = self._memory.popitem(last=False)
+                self._memory_bytes -= old.nbytes
+
+    def get_or_render(self, key, render):
+        """Retorna o bitmap do cache ou chama render() e guarda o resultado."""
+        with self._lock:
+            bitmap = self._memory.get(key)
+            if bitmap is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return bitmap
+
+        path = self.disk.get(key, ".npy")
+        if path:
+            try:
+                bitmap = np.load(path, allow_pickle=False)
+            except (OSError, ValueError):
+                bitmap = None
+            if bitmap is not None:
+                bitmap.setflags(write=False)
+                self.stats["disk_hits"] += 1
+                self._remember(key, bitmap)
+                return bitmap
+
+        start = time.perf_counter()
+        bitmap = np.ascontiguousarray(render())
+        self.stats["render_seconds"] += time.perf_counter() - start
+        self.stats["misses"] += 1
+        bitmap.setflags(write=False)
+
+        tmp_path = self.disk.tmp_path_for(key, ".npy")
+        try:
+            with open(tmp_path, "wb") as f:
+                np.save(f, bitmap, allow_pickle=False)
+            self.disk.commit(tmp_path, key, ".npy")
+        except OSError as e:
+            print(f"⚠️  Não foi possível gravar legenda no cache: {e}")
+        self._remember(key, bitmap)
+        return bitmap
+
+    def hit_rate(self):
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    def summary(self):
+        """Resumo legível das estatísticas (acertos, taxa e tempo de rasterização evitado)."""
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        if not total:
+            return "nenhuma legenda rasterizada"
+        text = (
+            f"{hits}/{total} acertos ({100 * self.hit_rate():.1f}%: "
+            f"{self.stats['memory_hits']} memória, {self.stats['disk_hits']} disco) | "
+            f"{self.stats['misses']} rasterizadas em {self.stats['render_seconds']:.2f}s"
+        )
+        if self.stats["misses"]:
+            # estimativa: cada acerto evitou uma rasterização de custo médio
+            avg_render = self.stats["render_seconds"] / self.stats["misses"]
+            text += f" | ~{hits * avg_render:.2f}s economizados"
+        return text
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_caption_cache():
+    """Instância única do processo: todos os vídeos do lote dividem memória e estatísticas."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = CaptionCache()
+        return _shared_cache
+
+
+def caption_cache_summary():
+    """Resumo do cache compartilhado, ou None se nenhuma legenda passou por ele."""
+    return _shared_cache.summary() if _shared_cache else None
@@ -0,0 +1,149 @@
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont, ImageColor
+
+
+class CaptionRenderer:
+    """
+    Rasteriza legendas com Pillow, no próprio processo (sem ImageMagick).
+    Equivalente ao TextClip(method="caption", align="center", size=(max_width, None)):
+    largura fixa em max_width, quebra de linha por palavra, linhas centralizadas e contorno.
+    """
+
+    def __init__(self, params=None):
+        defaults = {
+            "font_path": "./fonts/Poppins/Poppins-Black.ttf",
+            "font_size": 150,
+            "color": "white",
+            "stroke_color": "black",
+            "stroke_width": 7,
+            "max_width": 918,
+            "align": "center",
+            # escala da fonte e do contorno: desenha já no tamanho final na tela
+            # (max_width é a largura final), sem resize por frame no MoviePy
+            "scale": 1.0,
+            "cache": None,  # CaptionCache (opcional): reaproveita bitmaps entre vídeos
+        }
+        if params:
+            defaults.update(params)
+        for k, v in defaults.items():
+            setattr(self, k, v)
+
+        self.font = ImageFont.truetype(self.font_path, max(1, int(round(self.font_size * self.scale))))
+        self.fill = ImageColor.getrgb(self.color)
+        self.stroke_fill = ImageColor.getrgb(self.stroke_color) if self.stroke_color else None
+        # o ImageMagick centraliza o traço no contorno do glifo; no Pillow ele é todo externo
+        self.stroke_px = int(round(round(self.stroke_width / 2) * self.scale)) if self.stroke_fill else 0
+
+        ascent, descent = self.font.getmetrics()
+        self.line_height = ascent + descent
+
+    def _text_width(self, text):
+        return self.font.getlength(text) + 2 * self.stroke_px
+
+    def wrap(self, text):
+        """Quebra o texto em linhas que cabem em max_width (palavra por palavra)."""
+        lines, current = [], ""
+        for word in text.split():
+            candidate = f"{current} {word}".strip()
+            if current and self._text_width(candidate) > self.max_width:
+                lines.append(current)
+                current = word
+            else:
+                current = candidate
+        if current:
+            lines.append(current)
+        return lines
+
+    def render(self, text):
+        """Retorna a legenda como array RGBA (altura x max_width x 4, uint8)."""
+        if not self.cache:
+            return self._render(text)
+        key = self.cache.make_key(
+            text,
+            self.font_path,
+            font_size=self.font_size,
+            color=self.color,
+            stroke_color=self.stroke_color,
+            stroke_width=self.stroke_width,
+            max_width=self.max_width,
+            align=self.align,
+            scale=self.scale,
+        )
+        return self.cache.get_or_render(key, lambda: self._render(text))
+
+    def layout(self, text):
+        """
+        Posição de cada palavra no bitmap de render(text), com a mesma quebra de linha.
+        Retorna (altura do bitmap, [(palavra, x, y)]): (x, y) é o canto do sprite de
+        render_word(palavra) que reproduz a palavra naquele ponto.
+        """
+        lines = self.wrap(text) or [""]
+        height = len(lines) * self.line_height + 2 * self.stroke_px
+        positions = []
+        for i, line in enumerate(lines):
+            x = self._line_x(line)
+            words = line.split()
+            for j, word in enumerate(words):
+                # avanço medido no prefixo inteiro (mantém o kerning do espaço)
+                prefix = self.font.getlength(" ".join(words[:j]) + " ") if j else 0
+                positions.append((word, int(round(x + prefix)), i * self.line_height))
+        return height, positions
+
+    def render_word(self, word, color=None):
+        """Sprite RGBA justo de uma palavra (altura de uma linha), na cor dada ou na padrão."""
+        color = color or self.color
+        if not self.cache:
+            return self._render_word(word, color)
+        key = self.cache.make_key(
+            word,
+            self.font_path,
+            sprite=True,
+            font_size=self.font_size,
+            color=color,
+            stroke_color=self.stroke_color,
+            stroke_width=self.stroke_width,
+            scale=self.scale,
+        )
+        return self.cache.get_or_render(key, lambda: self._render_word(word, color))
+
+    def _render_word(self, word, color):
+        width = int(np.ceil(self._text_width(word)))
+        img = Image.new("RGBA", (max(1, width), self.line_height + 2 * self.stroke_px), (0, 0, 0, 0))
+        ImageDraw.Draw(img).text(
+            (self.stroke_px, self.stroke_px),
+            word,
+            font=self.font,
+            fill=ImageColor.getrgb(color),
+            stroke_width=self.stroke_px,
+            stroke_fill=self.stroke_fill,
+        )
+        return np.asarray(img)
+
+    def _line_x(self, line):
+        line_width = self._text_width(line)
+        if self.align == "left":
+            return 0
+        if self.align == "right":
+            return self.max_width - line_width
+        return (self.max_width - line_width) / 2
+
+    def _render(self, text):
+        lines = self.wrap(text) or [""]
+        height = len(lines) * self.line_height + 2 * self.stroke_px
+        img = Image.new("RGBA", (self.max_width, height), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+
+        y = self.stroke_px
+        for line in lines:
+            x = self._line_x(line)
+            draw.text(
+                (x + self.stroke_px, y),
+                line,
+                font=self.font,
+                fill=self.fill,
+                stroke_width=self.stroke_px,
+                stroke_fill=self.stroke_fill,
+            )
+            y += self.line_height
+
+        return np.asarray(img)
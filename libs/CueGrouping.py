@@ -0,0 +1,65 @@
+import json
+
+SENTENCE_END = (".", "!", "?", "…", ":", ";")
+
+DEFAULT_GROUPING = {
+    "max_words": 4,
+    "max_chars": 24,  # sem contar espaços entre palavras
+    "max_duration_ms": 1800,
+    "max_gap_ms": 350,  # pausa maior que isso abre uma nova legenda
+    "break_on_punctuation": True,  # fim de frase fecha a legenda
+}
+
+
+def grouping_params(config):
+    """Normaliza a configuração de agrupamento: True usa os padrões, dict sobrescreve."""
+    if not config:
+        return None
+    params = dict(DEFAULT_GROUPING)
+    if isinstance(config, dict):
+        params.update(config)
+    return params
+
+
+def group_words(word_boundaries, max_words=4, max_chars=24, max_duration_ms=1800, max_gap_ms=350,
+                break_on_punctuation=True):
+    """
+    Junta marcas de palavras adjacentes ({"word", "start", "end"} em ms) em frases curtas.
+    Retorna [{"text", "start", "end", "words"}]; "words" guarda a timeline de cada palavra
+    (para destaque palavra a palavra).
+    """
+    cues = []
+    current = []
+
+    def close():
+        if current:
+            cues.append({
+                "text": " ".join(w["word"] for w in current),
+                "start": current[0]["start"],
+                "end": current[-1]["end"],
+                "words": [{"word": w["word"], "start": w["start"], "end": w["end"]} for w in current],
+            })
+            current.clear()
+
+    for w in sorted(word_boundaries, key=lambda x: x["start"]):
+        if current:
+            chars = sum(len(c["word"]) for c in current) + len(w["word"])
+            if (
+                len(current) >= max_words
+                or chars > max_chars
+                or w["end"] - current[0]["start"] > max_duration_ms
+                or w["start"] - current[-1]["end"] > max_gap_ms
+            ):
+                close()
+        current.append(w)
+        if break_on_punctuation and w["word"].endswith(SENTENCE_END):
+            close()
+    close()
+    return cues
+
+
+def write_word_timeline(cues, path):
+    """Grava a timeline de palavras por legenda (JSON) ao lado do .srt."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(cues, f, ensure_ascii=False)
+    return path
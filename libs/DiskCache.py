@@ -0,0 +1,124 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_ROOT = os.getenv("CACHE_DIR", os.path.join(PROJECT_ROOT, "cache"))
+
+
+def hash_key(*parts) -> str:
+    """Gera uma chave estável (sha256) a partir de valores serializáveis em JSON."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    Diretório de cache com limite de tamanho e remoção LRU.
+
+    Cada entrada é identificada por uma chave e pode ter vários arquivos
+    (ex.: "<chave>.mp3" + "<chave>.json"); a remoção trata todos como uma unidade.
+    O horário de modificação (mtime) é usado como marca do último acesso.
+    """
+
+    TMP_SUFFIX = ".part"
+
+    def __init__(self, params=None):
+        defaults = {
+            "cache_dir": DEFAULT_CACHE_ROOT,
+            "max_size_bytes": None,  # None = sem limite
+        }
+        if params:
+            defaults.update(params)
+        for k, v in defaults.items():
+            setattr(self, k, v)
+
+        self.cache_dir = os.path.abspath(self.cache_dir)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def path_for(self, key, ext):
+        return os.path.join(self.cache_dir, f"{key}{ext}")
+
+    def tmp_path_for(self, key, ext):
+        return f"{self.path_for(key, ext)}.{os.getpid()}.{threading.get_ident()}{self.TMP_SUFFIX}"
+
+    def get(self, key, ext):
+        """Retorna o caminho da entrada (marcando o acesso) ou None se não existir."""
+        path = self.path_for(key, ext)
+        if not os.path.exists(path):
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return path
+
+    def commit(self, tmp_path, key, ext):
+        """Move um arquivo temporário para o cache de forma atômica e aplica o limite de tamanho."""
+        path = self.path_for(key, ext)
+        os.replace(tmp_path, path)
+        self.evict()
+        return path
+
+    def put_bytes(self, key, ext, data):
+        tmp_path = self.tmp_path_for(key, ext)
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        return self.commit(tmp_path, key, ext)
+
+    def _entries(self):
+        entries = {}
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(self.TMP_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            key = name.split(".", 1)[0]
+            entry = entries.setdefault(key, {"size": 0, "mtime": 0, "paths": []})
+            entry["size"] += st.st_size
+            entry["mtime"] = max(entry["mtime"], st.st_mtime)
+            entry["paths"].append(path)
+        return entries
+
+    def total_size(self):
+        return sum(e["size"] for e in self._entries().values())
+
+    def evict(self):
+        """Remove as entradas menos usadas recentemente até respeitar max_size_bytes."""
+        if not self.max_size_bytes:
+            return []
+
+        removed = []
+        with self._lock:
+            entries = self._entries()
+            total = sum(e["size"] for e in entries.values())
+            for key, entry in sorted(entries.items(), key=lambda item: item[1]["mtime"]):
+                if total <= self.max_size_bytes:
+                    break
+                for path in entry["paths"]:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= entry["size"]
+                removed.append(key)
+        return removed
+
+    def clean_stale_tmp(self, max_age_seconds=3600):
+        """Apaga arquivos temporários deixados por execuções interrompidas."""
+        now = time.time()
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(self.TMP_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if now - os.path.getmtime(path) > max_age_seconds:
+                    os.remove(path)
+            except OSError:
+                pass
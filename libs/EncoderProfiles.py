@@ -0,0 +1,155 @@
+import copy
+import os
+
+# Perfis nomeados de encode. "shorts-upload" é o encode de sempre (4000k, superfast).
+ENCODER_PROFILES = {
+    # rascunho: rápido e pequeno, só para conferir o vídeo
+    "draft": {"preset": "ultrafast", "crf": 30, "bitrate": None, "audio_bitrate": "96k"},
+    "shorts-upload": {"preset": "superfast", "bitrate": "4000k"},
+    # cópia de guarda: qualidade alta, sem pressa
+    "archive": {"preset": "slow", "crf": 18, "bitrate": None, "audio_bitrate": "192k"},
+    # qualidade constante com teto de bitrate: vídeos parados ficam bem menores
+    "size-targeted": {"preset": "medium", "crf": 23, "bitrate": None, "maxrate": "4000k", "bufsize": "8000k"},
+}
+DEFAULT_PROFILE = os.getenv("ENCODER_PROFILE", "shorts-upload")
+# encode fixo de antes dos perfis (vídeo 4000k + aac padrão do ffmpeg): referência da economia
+REFERENCE_KBPS = 4000 + 128
+# folga do orçamento de max_file_size_mb (VBV não é um limite exato, mais o contêiner)
+SIZE_MARGIN = 0.95
+
+
+def kbps(rate):
+    """Bitrate ("4000k", "4M" ou número em bits/s) em kbps."""
+    if isinstance(rate, (int, float)):
+        return rate / 1000
+    rate = str(rate).strip().lower()
+    if rate.endswith("k"):
+        return float(rate[:-1])
+    if rate.endswith("m"):
+        return float(rate[:-1]) * 1000
+    return float(rate) / 1000
+
+
+def size_report(path, duration):
+    """Tamanho do arquivo e economia (bytes) em relação ao encode fixo de REFERENCE_KBPS."""
+    size = os.path.getsize(path)
+    reference = int(duration * REFERENCE_KBPS * 1000 / 8)
+    return {"size": size, "reference": reference, "saved": reference - size}
+
+
+def available_threads():
+    """Núcleos que o processo pode usar (respeita affinity/cgroups quando o SO informa)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class EncoderProfile:
+    """
+    Parâmetros de codificação de um vídeo: um perfil nomeado (ENCODER_PROFILES)
+    mais ajustes do JSON. Com "crf" o encode é de qualidade constante (bitrate
+    None) ou limitado por "maxrate"/"bufsize"; sem "crf" usa "bitrate" fixo.
+    """
+
+    def __init__(self, params=None):
+        defaults = {
+            "profile": DEFAULT_PROFILE,
+            "codec": "libx264",
+            "audio_codec": "aac",
+            "audio_bitrate": None,
+            "fps": 24,
+            "crf": None,
+            "bitrate": "4000k",
+            "maxrate": None,
+            "bufsize": None,
+            "preset": "superfast",
+            "tune": None,  # ex.: "stillimage" para imagens paradas (template de produto)
+            "threads": None,  # None: todos os núcleos disponíveis
+            "x264_params": None,  # dict {"chave": valor} ou string "chave=valor:..."
+            "max_file_size_mb": None,  # teto do arquivo: vira maxrate conforme a duração (fit_duration)
+        }
+        params = params or {}
+        profile = params.get("profile", defaults["profile"])
+        if profile not in ENCODER_PROFILES:
+            raise ValueError(f"Perfil de encode desconhecido: {profile}. Use: {', '.join(ENCODER_PROFILES)}")
+        defaults.update(ENCODER_PROFILES[profile])
+        defaults.update(params)
+        for k, v in defaults.items():
+            setattr(self, k, v)
+
+        self.threads = self.threads or available_threads()
+
+    @classmethod
+    def from_config(cls, config=None, defaults=None):
+        """
+        config: bloco "encoding" do vídeo, nome do perfil ou {"profile": nome, ...ajustes}.
+        defaults: ajustes do template (ex.: tune), que o JSON ainda pode sobrescrever.
+        """
+        if isinstance(config, str):
+            config = {"profile": config}
+        return cls({**(defaults or {}), **(config or {})})
+
+    def fit_duration(self, duration, segments=1):
+        """
+        Cópia do perfil com o teto de bitrate que cabe em max_file_size_mb para
+        um vídeo de duration segundos (descontado o áudio). segments: trechos
+        codificados em separado (ParallelTimeline). Sem max_file_size_mb
+        retorna o próprio perfil.
+        """
+        if not self.max_file_size_mb or not duration:
+            return self
+        audio_kbps = kbps(self.audio_bitrate) if self.audio_bitrate else REFERENCE_KBPS - 4000
+        # o buffer do VBV (1 s de maxrate) pode ser gasto de uma vez além da taxa média,
+        # e cada trecho começa com o buffer cheio: reserva um buffer por trecho
+        size_kbit = self.max_file_size_mb * 8 * 1024 * 1024 / 1000
+        budget = int(size_kbit * SIZE_MARGIN / (duration + max(1, segments)) - audio_kbps)
+        if budget < 500:
+            print(f"⚠️ max_file_size_mb={self.max_file_size_mb} deixa só {budget}k para {duration:.0f}s de vídeo")
+        budget = max(budget, 100)
+        fitted = copy.copy(self)
+        if self.maxrate is None or kbps(self.maxrate) > budget:
+            fitted.maxrate = f"{budget}k"
+            fitted.bufsize = f"{budget}k"
+        if self.bitrate and kbps(self.bitrate) > budget:
+            fitted.bitrate = f"{budget}k"
+        return fitted
+
+    def ffmpeg_params(self):
+        """Argumentos de saída do ffmpeg além de codec, bitrate, preset e threads."""
+        params = []
+        if self.crf is not None:
+            params += ["-crf", str(self.crf)]
+        if self.maxrate:
+            params += ["-maxrate", self.maxrate, "-bufsize", self.bufsize or self.maxrate]
+        if self.tune:
+            params += ["-tune", self.tune]
+        if self.x264_params and self.codec == "libx264":
+            x264_params = self.x264_params
+            if isinstance(x264_params, dict):
+                x264_params = ":".join(f"{k}={v}" for k, v in x264_params.items())
+            params += ["-x264-params", x264_params]
+        return params
+
+    def encoding(self):
+        """Parâmetros dos backends da Timeline (FFmpegTimeline, MoviePyTimeline, ParallelTimeline)."""
+        return {
+            "codec": self.codec,
+            "audio_codec": self.audio_codec,
+            "audio_bitrate": self.audio_bitrate,
+            "bitrate": self.bitrate,
+            "preset": self.preset,
+            "threads": self.threads,
+            "ffmpeg_params": self.ffmpeg_params(),
+        }
+
+    def write_videofile_params(self):
+        """Argumentos do write_videofile do MoviePy (templates que renderizam o clipe direto)."""
+        return {**self.encoding(), "fps": self.fps, "ffmpeg_params": self.ffmpeg_params() or None}
+
+    def describe(self):
+        rate = f"crf {self.crf}" if self.crf is not None else self.bitrate
+        if self.crf is not None and self.maxrate:
+            rate += f" (máx. {self.maxrate})"
+        if self.max_file_size_mb:
+            rate += f", até {self.max_file_size_mb} MB"
+        return f"{self.profile}: {rate}, {self.preset}" + (f", tune {self.tune}" if self.tune else "")
@@ -0,0 +1,100 @@
+import os
+import subprocess as sp
+
+from moviepy.config import get_setting
+
+
+class FFmpegBackground:
+    """
+    Monta a trilha de fundo direto no ffmpeg, sem passar frames pelo Python.
+
+    - Clipes de origem: um único filtergraph trim/crop/scale/concat.
+    - Proxies já normalizados (ProxyCache): concat demuxer com stream copy.
+
+    Recebe o plano de BackgroundVideo.plan_clips() (lista de {"path", "duration"})
+    e gera um único arquivo intermediário.
+    """
+
+    def __init__(self, params=None):
+        defaults = {
+            "resolution_output": (1080, 1920),
+            "fps": 24,
+            "crf": 18,
+            "preset": "veryfast",
+            "output_path": "background.mp4",
+        }
+        if params:
+            defaults.update(params)
+        for k, v in defaults.items():
+            setattr(self, k, v)
+
+    def _run(self, cmd):
+        proc = sp.run(cmd, stdout=sp.DEVNULL, stderr=sp.PIPE)
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.decode("utf-8", "ignore").strip()[-800:])
+
+    def build_filtergraph(self, plan):
+        """Retorna (argumentos de entrada, filter_complex) para o plano."""
+        w, h = self.resolution_output
+        inputs = []
+        chains = []
+        for i, entry in enumerate(plan):
+            # -t na entrada: o ffmpeg nem decodifica além do necessário
+            inputs += ["-t", f"{entry['duration']:.3f}", "-i", entry["path"]]
+            chains.append(
+                f"[{i}:v]crop=w='min(iw,ih*{w}/{h})':h='min(ih,iw*{h}/{w})',"
+                f"scale={w}:{h},setsar=1,fps={self.fps},setpts=PTS-STARTPTS[v{i}]"
+            )
+        labels = "".join(f"[v{i}]" for i in range(len(plan)))
+        chains.append(f"{labels}concat=n={len(plan)}:v=1:a=0[outv]")
+        return inputs, ";".join(chains)
+
+    def render_filtergraph(self, plan, total_duration=None):
+        inputs, graph = self.build_filtergraph(plan)
+        cmd = [get_setting("FFMPEG_BINARY"), "-y", "-loglevel", "error"] + inputs + [
+            "-filter_complex", graph,
+            "-map", "[outv]",
+            "-an",
+            "-r", str(self.fps),
+            "-c:v", "libx264",
+            "-preset", self.preset,
+            "-crf", str(self.crf),
+            "-pix_fmt", "yuv420p",
+        ]
+        if total_duration:
+            cmd += ["-t", f"{total_duration:.3f}"]
+        self._run(cmd + [self.output_path])
+        return self.output_path
+
+    def render_concat_copy(self, plan, total_duration=None):
+        """Concatena proxies com stream copy (sem reencode)."""
+        list_path = f"{os.path.splitext(self.output_path)[0]}_concat.txt"
+        with open(list_path, "w", encoding="utf-8") as f:
+            f.write("ffconcat version 1.0\n")
+            for entry in plan:
+                path = os.path.abspath(entry["path"]).replace("'", "'\\''")
+                f.write(f"file '{path}'\n")
+                f.write(f"outpoint {entry['duration']:.3f}\n")
+
+        cmd = [get_setting("FFMPEG_BINARY"), "-y", "-loglevel", "error",
+               "-f", "concat", "-safe", "0", "-i", list_path,
+               "-an", "-c", "copy"]
+        if total_duration:
+            cmd += ["-t", f"{total_duration:.3f}"]
+        try:
+            self._run(cmd + [self.output_path])
+        finally:
+            os.remove(list_path)
+        return self.output_path
+
+    def render(self, plan, total_duration=None, normalized=False):
+        """
+        Gera o vídeo de fundo. normalized=True indica que todos os arquivos do
+        plano já estão na resolução/fps/codec de saída (proxies).
+        """
+        if not plan:
+            raise ValueError("Plano de clipes vazio.")
+        os.makedirs(os.path.dirname(os.path.abspath(self.output_path)), exist_ok=True)
+        if normalized:
+            return self.render_concat_copy(plan, total_duration)
+        return self.render_filtergraph(plan, total_duration)
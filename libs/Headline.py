@@ -21,7 +21,9 @@ class Headline:
             "gap": 0,
             "margin_top_percent": 0.05,
             "scale": 2,  # 🔽 Reduzido de 8 → 2
-            "antialias": True  # ✅ Novo: reduz imagem no final para suavizar o texto
+            "antialias": True,  # ✅ Novo: reduz imagem no final para suavizar o texto
+            # largura final da imagem (layout continua em video_width): evita redimensionar depois
+            "output_width": None,
         }
 
         if params:
@@ -106,10 +108,11 @@ class Headline:
             draw.text((x, y), line, font=subtitle_font, fill=self.subtitle_color)
             y += line_height_sub
 
-        # ✅ Antialias opcional: reduz o tamanho final
-        if self.antialias and scale > 1:
+        # ✅ Antialias opcional: reduz o tamanho final (direto para output_width, uma reamostragem só)
+        output_width = self.output_width or self.video_width
+        if (self.antialias and scale > 1) or output_width != self.video_width:
             image = image.resize(
-                (self.video_width, total_height // scale),
+                (output_width, total_height * output_width // (self.video_width * scale)),
                 Image.LANCZOS
             )
 
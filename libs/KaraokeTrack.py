@@ -0,0 +1,110 @@
+import json
+
+import numpy as np
+
+from libs.SubtitleTrack import SubtitleTrack
+
+
+class WordAtlas:
+    """
+    Sprites das palavras, cada uma rasterizada uma única vez por estilo
+    (normal e destacado) e compartilhada por todas as frases em que aparece.
+    """
+
+    def __init__(self, renderer, highlight_color):
+        self.renderer = renderer
+        self.highlight_color = highlight_color
+        self.sprites = {}
+
+    def sprite(self, word, highlighted=False):
+        key = (word, highlighted)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            color = self.highlight_color if highlighted else None
+            sprite = self.sprites[key] = self.renderer.render_word(word, color)
+        return sprite
+
+    @property
+    def nbytes(self):
+        return sum(s.nbytes for s in self.sprites.values())
+
+
+class KaraokePhrase:
+    """Frase na tela: tamanho do bloco e posição de cada palavra (sprites do atlas)."""
+
+    def __init__(self, width, height, words):
+        self.width = width
+        self.height = height
+        # [(palavra, x, y)] para cada palavra da narração (pode ter mais de um token)
+        self.words = words
+
+
+class KaraokeTrack(SubtitleTrack):
+    """
+    Legendas estilo karaokê: a frase inteira fica na tela e a palavra falada
+    no momento aparece destacada.
+
+    Cada (frase, palavra destacada) vira um intervalo da SubtitleTrack, mas sem
+    bitmap próprio: o frame é montado colando os sprites do WordAtlas nas
+    posições calculadas pelo CaptionRenderer.layout. Memória e custo por frame
+    dependem só da frase visível, não do número de estados.
+
+    cues: lista de (início, fim, (KaraokePhrase, índice da palavra destacada)).
+    """
+
+    def __init__(self, cues, atlas, size, position=("center", "bottom"), cache_size=8):
+        self.atlas = atlas
+        SubtitleTrack.__init__(self, cues, size=size, position=position, cache_size=cache_size)
+
+    def _compose(self, cue_indexes):
+        frame = self._blank_frame.astype(np.float32)
+        mask = self._blank_mask.copy()
+
+        for k in cue_indexes:
+            phrase, highlighted = self.cues[k][2]
+            ox, oy = self._place(phrase.width, phrase.height)
+            for i, tokens in enumerate(phrase.words):
+                for token, x, y in tokens:
+                    sprite = self.atlas.sprite(token, i == highlighted)
+                    self._blit(frame, mask, sprite, ox + x, oy + y)
+
+        return np.round(frame).astype(np.uint8), mask
+
+    @classmethod
+    def from_word_timeline(cls, words_file, renderer, highlight_color, position=("center", "bottom")):
+        """
+        Monta a trilha a partir do {basename}.words.json do EdgeTTS (tempos em ms).
+        A palavra fica destacada do seu início até o início da próxima; a frase
+        ocupa o mesmo intervalo da legenda no .srt.
+        """
+        with open(words_file, "r", encoding="utf-8") as f:
+            timeline = json.load(f)
+
+        atlas = WordAtlas(renderer, highlight_color)
+        cues = []
+        max_height = 0
+        for cue in timeline:
+            words = [w["word"].upper() for w in cue["words"]]
+            height, positions = renderer.layout(" ".join(words))
+            max_height = max(max_height, height)
+
+            # uma palavra da narração pode ocupar mais de um token do layout
+            grouped, k = [], 0
+            for word in words:
+                n = len(word.split())
+                grouped.append(positions[k:k + n])
+                k += n
+            phrase = KaraokePhrase(renderer.max_width, height, grouped)
+
+            # mesmos limites da legenda no .srt (ver EdgeTTS._generate_srt)
+            start = max(0, cue["start"])
+            end = max(start + 50, cue["end"])
+            for i, w in enumerate(cue["words"]):
+                word_start = start if i == 0 else max(start, w["start"])
+                word_end = end if i == len(cue["words"]) - 1 else min(end, cue["words"][i + 1]["start"])
+                if word_end > word_start:
+                    cues.append((word_start / 1000, word_end / 1000, (phrase, i)))
+
+        if not cues:
+            raise RuntimeError("Nenhuma legenda pôde ser gerada!")
+        return cls(cues, atlas, size=(renderer.max_width, max_height), position=position)
@@ -0,0 +1,264 @@
+from collections import OrderedDict
+
+import numpy as np
+from moviepy.editor import VideoClip, ImageClip, CompositeAudioClip
+
+# atalhos de posição do MoviePy (VideoClip.blit_on)
+POSITION_SHORTCUTS = {
+    "center": ["center", "center"],
+    "left": ["left", "center"],
+    "right": ["right", "center"],
+    "top": ["center", "top"],
+    "bottom": ["center", "bottom"],
+}
+
+
+def layer_key(clip, t):
+    """
+    Chave do conteúdo (frame + máscara) de uma camada no instante t do clipe.
+    Mesma chave = mesmos pixels. None = camada animada, muda a cada frame.
+
+    - clipes com frame_key(t) (SubtitleTrack, KaraokeTrack) informam a chave;
+    - ImageClip sem efeito temporal (frame e máscara são sempre o mesmo array) é estático;
+    - qualquer outro clipe é tratado como animado.
+    """
+    frame_key = getattr(clip, "frame_key", None)
+    if frame_key is not None:
+        return frame_key(t)
+    if not isinstance(clip, ImageClip) or clip.get_frame(t) is not clip.img:
+        return None
+    if clip.mask is None:
+        return id(clip.img), None
+    if not isinstance(clip.mask, ImageClip) or clip.mask.get_frame(t) is not clip.mask.img:
+        return None
+    return id(clip.img), id(clip.mask.img)
+
+
+class LayerCompositor(VideoClip):
+    """
+    Substitui o CompositeVideoClip sabendo quais camadas estão paradas.
+
+    A cada frame cada camada ativa tem uma chave de conteúdo (layer_key) e uma
+    posição. Com isso:
+    - camadas estáticas abaixo da primeira animada viram um fundo pré-composto,
+      montado uma vez e reaproveitado enquanto as chaves não mudam;
+    - camadas estáticas acima da última animada viram um overlay (RGB
+      pré-multiplicado + alpha) recortado na área delas, aplicado com uma
+      mistura só;
+    - sem camadas animadas, se nada mudou o frame anterior é devolvido como
+      está; se só algumas camadas mudaram (ex.: a legenda atual), apenas os
+      retângulos sujos (posição antiga e nova) são recompostos.
+
+    O resultado é o mesmo do CompositeVideoClip (mesma ordem, posições e
+    máscaras; arredondamento no fim em vez de a cada camada).
+    Os frames devolvidos podem ser reutilizados: não devem ser alterados.
+    """
+
+    def __init__(self, clips, size=None, bg_color=(0, 0, 0), cache_size=8):
+        VideoClip.__init__(self)
+        if not clips:
+            raise ValueError("LayerCompositor precisa de pelo menos uma camada.")
+
+        self.clips = clips
+        self.size = tuple(size or clips[0].size)
+        self.bg_color = bg_color
+        self.cache_size = cache_size
+
+        fpss = [c.fps for c in clips if getattr(c, "fps", None)]
+        self.fps = max(fpss) if fpss else None
+
+        ends = [c.end for c in clips]
+        if None not in ends:
+            self.duration = self.end = max(ends)
+
+        audioclips = [c.audio for c in clips if c.audio is not None]
+        if audioclips:
+            self.audio = CompositeAudioClip(audioclips)
+
+        w, h = self.size
+        self._bg_frame = np.empty((h, w, 3), dtype=np.uint8)
+        self._bg_frame[:] = bg_color
+        self._backgrounds = OrderedDict()
+        self._overlays = OrderedDict()
+        self._last = None  # (chaves, retângulos, frame) do último frame sem camadas animadas
+        self.stats = {"frames": 0, "reused": 0, "dirty": 0, "full": 0}
+        self.make_frame = self._make_frame
+
+    def _layers(self, t):
+        """Camadas ativas em t: (índice, clipe, tempo do clipe, chave, (x, y, w, h))."""
+        layers = []
+        for i, clip in enumerate(self.clips):
+            if not clip.is_playing(t):
+                continue
+            ct = t - clip.start
+            key = layer_key(clip, ct)
+            cw, ch = clip.size
+            x, y = self._position(clip, ct, cw, ch)
+            layers.append((i, clip, ct, key, (x, y, cw, ch)))
+        return layers
+
+    def _position(self, clip, ct, cw, ch):
+        """Mesma conta de posição do VideoClip.blit_on do MoviePy."""
+        w, h = self.size
+        pos = clip.pos(ct)
+        pos = list(POSITION_SHORTCUTS[pos]) if isinstance(pos, str) else list(pos)
+        if clip.relative_pos:
+            for i, dim in enumerate((w, h)):
+                if not isinstance(pos[i], str):
+                    pos[i] = dim * pos[i]
+        if isinstance(pos[0], str):
+            pos[0] = {"left": 0, "center": (w - cw) / 2, "right": w - cw}[pos[0]]
+        if isinstance(pos[1], str):
+            pos[1] = {"top": 0, "center": (h - ch) / 2, "bottom": h - ch}[pos[1]]
+        return int(pos[0]), int(pos[1])
+
+    def _clip_rect(self, rect):
+        """Recorta (x, y, w, h) no quadro; retorna (x1, y1, x2, y2) ou None se vazio."""
+        w, h = self.size
+        x, y, cw, ch = rect
+        x1, y1, x2, y2 = max(0, x), max(0, y), min(w, x + cw), min(h, y + ch)
+        if x1 >= x2 or y1 >= y2:
+            return None
+        return x1, y1, x2, y2
+
+    @staticmethod
+    def _union(boxes):
+        boxes = [b for b in boxes if b]
+        if not boxes:
+            return None
+        return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+    def _blend(self, region, alpha, layers, box):
+        """
+        Mistura as camadas sobre region (float32, RGB pré-multiplicado se alpha
+        não for None), limitado a box = (x1, y1, x2, y2) em coordenadas do quadro.
+        """
+        bx1, by1, bx2, by2 = box
+        for _, clip, ct, _, rect in layers:
+            inter = self._clip_rect(rect)
+            if not inter:
+                continue
+            x1, y1, x2, y2 = max(inter[0], bx1), max(inter[1], by1), min(inter[2], bx2), min(inter[3], by2)
+            if x1 >= x2 or y1 >= y2:
+                continue
+            x, y = rect[0], rect[1]
+            img = clip.get_frame(ct)[y1 - y:y2 - y, x1 - x:x2 - x]
+            target = region[y1 - by1:y2 - by1, x1 - bx1:x2 - bx1]
+            if clip.mask is None:
+                target[:] = img
+                if alpha is not None:
+                    alpha[y1 - by1:y2 - by1, x1 - bx1:x2 - bx1] = 1.0
+                continue
+            mask = clip.mask.get_frame(ct)[y1 - y:y2 - y, x1 - x:x2 - x]
+            target *= (1.0 - mask)[:, :, None]
+            target += img * mask[:, :, None]
+            if alpha is not None:
+                a = alpha[y1 - by1:y2 - by1, x1 - bx1:x2 - bx1]
+                a *= 1.0 - mask
+                a += mask
+
+    def _cached(self, cache, key, build):
+        value = cache.get(key)
+        if value is None:
+            value = cache[key] = build()
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return value
+
+    def _compose(self, layers, under, box):
+        """Compõe as camadas sobre o frame under (uint8), só dentro de box."""
+        x1, y1, x2, y2 = box
+        region = under[y1:y2, x1:x2].astype(np.float32)
+        self._blend(region, None, layers, box)
+        return np.round(region).astype(np.uint8)
+
+    def _background(self, layers):
+        """Fundo pré-composto das camadas estáticas de baixo (cache pelas chaves)."""
+        if not layers:
+            return self._bg_frame
+        key = tuple((i, k, rect) for i, _, _, k, rect in layers)
+        w, h = self.size
+        return self._cached(self._backgrounds, key, lambda: self._compose(layers, self._bg_frame, (0, 0, w, h)))
+
+    def _overlay(self, layers):
+        """Camadas estáticas de cima em um único overlay pré-multiplicado (cache pelas chaves)."""
+        box = self._union([self._clip_rect(rect) for *_, rect in layers])
+        if not box:
+            return None
+
+        def build():
+            x1, y1, x2, y2 = box
+            premultiplied = np.zeros((y2 - y1, x2 - x1, 3), dtype=np.float32)
+            alpha = np.zeros((y2 - y1, x2 - x1), dtype=np.float32)
+            self._blend(premultiplied, alpha, layers, box)
+            return box, premultiplied, (1.0 - alpha)[:, :, None]
+
+        key = tuple((i, k, rect) for i, _, _, k, rect in layers)
+        return self._cached(self._overlays, key, build)
+
+    def _make_frame(self, t):
+        self.stats["frames"] += 1
+        layers = self._layers(t)
+        dynamic = [n for n, layer in enumerate(layers) if layer[3] is None]
+
+        if not dynamic:
+            return self._static_frame(layers)
+
+        self._last = None
+        first, last = dynamic[0], dynamic[-1]
+        frame = self._background(layers[:first])
+        w, h = self.size
+        self.stats["full"] += 1
+
+        # camadas animadas: recompostas a cada frame, como no CompositeVideoClip
+        animated = layers[first:last + 1]
+        _, clip, ct, _, rect = animated[0]
+        if clip.mask is None and rect == (0, 0, w, h):
+            # primeira camada opaca cobrindo o quadro (ex.: vídeo de fundo): dispensa o fundo
+            frame = clip.get_frame(ct)
+            animated = animated[1:]
+        if animated:
+            frame = self._compose(animated, frame, (0, 0, w, h))
+        else:
+            frame = frame.copy()
+
+        overlay = self._overlay(layers[last + 1:])
+        if overlay:
+            (x1, y1, x2, y2), premultiplied, inverse_alpha = overlay
+            region = frame[y1:y2, x1:x2] * inverse_alpha
+            region += premultiplied
+            frame[y1:y2, x1:x2] = np.round(region)
+        return frame
+
+    def _static_frame(self, layers):
+        keys = tuple((i, k, rect) for i, _, _, k, rect in layers)
+        if self._last and self._last[0] == keys:
+            self.stats["reused"] += 1
+            return self._last[2]
+
+        w, h = self.size
+        rects = {i: self._clip_rect(rect) for i, _, _, _, rect in layers}
+        box = (0, 0, w, h)
+        previous = None
+        if self._last:
+            # retângulos sujos: camadas que mudaram, entraram ou saíram (posição antiga e nova)
+            old_keys, old_rects, previous = self._last
+            old = {entry[0]: entry for entry in old_keys}
+            new = {entry[0]: entry for entry in keys}
+            changed = [i for i in set(old) | set(new) if old.get(i) != new.get(i)]
+            box = self._union([rects.get(i) for i in changed] + [old_rects.get(i) for i in changed])
+
+        if previous is not None and box and (box[2] - box[0]) * (box[3] - box[1]) < w * h / 2:
+            self.stats["dirty"] += 1
+            frame = previous.copy()
+            x1, y1, x2, y2 = box
+            frame[y1:y2, x1:x2] = self._compose(layers, self._bg_frame, box)
+        else:
+            self.stats["full"] += 1
+            frame = self._compose(layers, self._bg_frame, (0, 0, w, h))
+
+        self._last = (keys, rects, frame)
+        return frame
@@ -0,0 +1,79 @@
+import os
+import json
+import threading
+
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+from libs.DiskCache import DEFAULT_CACHE_ROOT
+
+
+class MediaProbe:
+    """
+    Metadados de vídeo (duração, tamanho, fps) com cache persistente em JSON.
+
+    A chave de cada arquivo é (caminho absoluto, tamanho, mtime): se o arquivo
+    mudar, ele é sondado de novo. Cada vídeo só abre um processo ffmpeg na
+    primeira vez que é visto.
+    """
+
+    def __init__(self, params=None):
+        defaults = {
+            "cache_file": os.getenv("PROBE_CACHE_FILE", os.path.join(DEFAULT_CACHE_ROOT, "probe_cache.json")),
+        }
+        if params:
+            defaults.update(params)
+        for k, v in defaults.items():
+            setattr(self, k, v)
+
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries = {}
+        if self.cache_file and os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._entries = {}
+
+    @staticmethod
+    def _cache_key(path):
+        st = os.stat(path)
+        return f"{os.path.abspath(path)}|{st.st_size}|{int(st.st_mtime)}"
+
+    def probe(self, path):
+        """Retorna {"duration", "size", "fps"} ou None se o arquivo não for um vídeo válido."""
+        try:
+            key = self._cache_key(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+
+        try:
+            infos = ffmpeg_parse_infos(path)
+            info = {
+                "duration": infos.get("video_duration") or infos["duration"],
+                "size": list(infos["video_size"]),
+                "fps": infos.get("video_fps"),
+            }
+        except Exception as e:
+            print(f"[ERRO] Falha ao ler metadados de {os.path.basename(path)}: {e}")
+            info = None
+
+        with self._lock:
+            self._entries[key] = info
+            self._dirty = True
+        return info
+
+    def save(self):
+        if not self._dirty or not self.cache_file:
+            return
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_file)), exist_ok=True)
+            tmp_path = f"{self.cache_file}.{os.getpid()}.part"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.cache_file)
+            self._dirty = False
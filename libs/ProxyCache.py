@@ -0,0 +1,172 @@
+import os
+import hashlib
+import argparse
+import subprocess as sp
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from moviepy.config import get_setting
+
+from libs.DiskCache import DiskCache, DEFAULT_CACHE_ROOT, hash_key
+
+AVAILABLE_RESOLUTIONS = {"9:16": (1080, 1920), "16:9": (1920, 1080)}
+VALID_EXTENSIONS = ["mp4", "mkv", "avi", "mov", "flv", "webm"]
+
+
+class ProxyCache:
+    """
+    Cache persistente de "proxies" dos vídeos de fundo.
+
+    Cada vídeo de origem é transcodificado uma única vez (por proporção,
+    resolução e fps) para um arquivo já recortado e redimensionado. As
+    renderizações seguintes leem o proxy direto, sem crop/resize por frame.
+    """
+
+    def __init__(self, params=None):
+        defaults = {
+            "cache_dir": os.getenv("PROXY_CACHE_DIR", os.path.join(DEFAULT_CACHE_ROOT, "proxies")),
+            "max_cache_size_gb": float(os.getenv("PROXY_CACHE_MAX_GB", 20)),
+            "output_ratio": "9:16",
+            "resolution_output": (1080, 1920),
+            "available_resolutions": AVAILABLE_RESOLUTIONS,
+            "fps": 24,
+            "crf": 18,
+            "preset": "veryfast",
+            "max_proxy_duration": None,  # None = vídeo inteiro
+        }
+        if params:
+            defaults.update(params)
+        if defaults["output_ratio"] in defaults["available_resolutions"]:
+            defaults["resolution_output"] = defaults["available_resolutions"][defaults["output_ratio"]]
+        for k, v in defaults.items():
+            setattr(self, k, v)
+
+        max_size = int(self.max_cache_size_gb * 1024 ** 3) if self.max_cache_size_gb else None
+        self.cache = DiskCache({"cache_dir": self.cache_dir, "max_size_bytes": max_size})
+
+    @staticmethod
+    def source_fingerprint(video_path, sample_size=1024 * 1024):
+        """
+        Hash rápido do arquivo de origem: tamanho + primeiro e último MiB.
+        Evita ler vídeos 4K inteiros a cada renderização.
+        """
+        size = os.path.getsize(video_path)
+        h = hashlib.sha1(str(size).encode())
+        with open(video_path, "rb") as f:
+            h.update(f.read(sample_size))
+            if size > sample_size:
+                f.seek(max(sample_size, size - sample_size))
+                h.update(f.read(sample_size))
+        return h.hexdigest()
+
+    def proxy_key(self, video_path):
+        return hash_key(
+            "proxy",
+            self.source_fingerprint(video_path),
+            list(self.resolution_output),
+            self.fps,
+            self.crf,
+            self.preset,
+            self.max_proxy_duration,
+        )
+
+    def _filter_chain(self):
+        w, h = self.resolution_output
+        # crop central para a proporção de saída (mesma regra do load_and_resize_clip) + scale
+        return (
+            f"crop=w='min(iw,ih*{w}/{h})':h='min(ih,iw*{h}/{w})',"
+            f"scale={w}:{h}:flags=lanczos,setsar=1,fps={self.fps}"
+        )
+
+    def _transcode(self, video_path, tmp_path):
+        cmd = [get_setting("FFMPEG_BINARY"), "-y", "-loglevel", "error", "-i", video_path, "-an"]
+        if self.max_proxy_duration:
+            cmd += ["-t", f"{self.max_proxy_duration:.3f}"]
+        cmd += [
+            "-vf", self._filter_chain(),
+            "-c:v", "libx264",
+            "-preset", self.preset,
+            "-crf", str(self.crf),
+            "-pix_fmt", "yuv420p",
+            # GOP de 1s e sem B-frames: permite cortes precisos com stream copy
+            "-g", str(self.fps),
+            "-bf", "0",
+            "-movflags", "+faststart",
+            "-f", "mp4",
+            tmp_path,
+        ]
+        proc = sp.run(cmd, stdout=sp.DEVNULL, stderr=sp.PIPE)
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.decode("utf-8", "ignore").strip()[-500:])
+
+    def get_proxy(self, video_path, create=True):
+        """
+        Retorna o caminho do proxy para o vídeo. Se não existir e create=True,
+        transcodifica agora. Retorna None se não houver proxy disponível.
+        """
+        key = self.proxy_key(video_path)
+        cached = self.cache.get(key, ".mp4")
+        if cached or not create:
+            return cached
+
+        tmp_path = self.cache.tmp_path_for(key, ".mp4")
+        try:
+            self._transcode(video_path, tmp_path)
+        except Exception as e:
+            print(f"[ERRO] Falha ao gerar proxy de {video_path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+        return self.cache.commit(tmp_path, key, ".mp4")
+
+    def warm(self, videos_dir, workers=None, valid_extensions=None):
+        """Pré-gera os proxies de todos os vídeos de um diretório em paralelo."""
+        valid_extensions = valid_extensions or VALID_EXTENSIONS
+        video_files = sorted(
+            os.path.join(videos_dir, f) for f in os.listdir(videos_dir)
+            if any(f.lower().endswith(ext) for ext in valid_extensions)
+        )
+        if not video_files:
+            print(f"⚠️  Nenhum vídeo encontrado em: {videos_dir}")
+            return {}
+
+        workers = workers or max(1, (os.cpu_count() or 2) // 2)
+        print(f"🔥 Pré-gerando {len(video_files)} proxies ({self.output_ratio}, {self.fps}fps) com {workers} workers...")
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self.get_proxy, path): path for path in video_files}
+            for done, future in enumerate(as_completed(futures), 1):
+                path = futures[future]
+                results[path] = future.result()
+                status = "✅" if results[path] else "❌"
+                print(f"{status} [{done}/{len(video_files)}] {os.path.basename(path)}")
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pré-gera proxies normalizados dos vídeos de fundo.")
+    parser.add_argument("videos_dirs", nargs="+", help="Diretório(s) com os vídeos de origem")
+    parser.add_argument("--ratio", action="append", choices=list(AVAILABLE_RESOLUTIONS.keys()),
+                        help="Proporção de saída (pode repetir). Padrão: 9:16")
+    parser.add_argument("--fps", type=int, default=24)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-dir", default=None)
+    parser.add_argument("--max-size-gb", type=float, default=None)
+    args = parser.parse_args()
+
+    params = {"fps": args.fps}
+    if args.cache_dir:
+        params["cache_dir"] = args.cache_dir
+    if args.max_size_gb is not None:
+        params["max_cache_size_gb"] = args.max_size_gb
+
+    for ratio in args.ratio or ["9:16"]:
+        cache = ProxyCache({**params, "output_ratio": ratio})
+        cache.cache.clean_stale_tmp()
+        for videos_dir in args.videos_dirs:
+            cache.warm(videos_dir, workers=args.workers)
+
+
+if __name__ == "__main__":
+    # uso: python -m libs.ProxyCache videos_default/futbool --ratio 9:16 --workers 8
+    main()
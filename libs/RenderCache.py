@@ -0,0 +1,99 @@
+import os
+import json
+import time
+
+from libs.DiskCache import PROJECT_ROOT, hash_key
+
+MEDIA_EXTENSIONS = (".mp4", ".mkv", ".avi", ".mov", ".flv", ".webm", ".mp3", ".wav", ".m4a", ".aac")
+
+
+class RenderCache:
+    """
+    Manifesto dos vídeos já renderizados, indexado pelo slug.
+
+    Cada vídeo recebe um hash canônico da sua configuração + impressões digitais
+    dos arquivos de entrada (vídeos de fundo, músicas, fontes). Se o hash não
+    mudou e a saída existe, o vídeo pode ser pulado ao rodar o mesmo JSON de novo.
+    """
+
+    def __init__(self, params=None):
+        def to_bool(value):
+            return str(value).lower() in ("true", "1", "yes", "on")
+
+        defaults = {
+            "manifest_file": os.getenv("RENDER_CACHE_FILE", "output/render_cache.json"),
+            "enabled": to_bool(os.getenv("RENDER_CACHE", True)),
+            "fonts_dir": os.path.join(PROJECT_ROOT, "fonts"),
+        }
+        if params:
+            defaults.update(params)
+        for k, v in defaults.items():
+            setattr(self, k, v)
+
+        self.manifest = {}
+        if os.path.exists(self.manifest_file):
+            try:
+                with open(self.manifest_file, "r", encoding="utf-8") as f:
+                    self.manifest = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                print(f"⚠️  Manifesto de cache inválido, ignorando: {self.manifest_file}")
+                self.manifest = {}
+
+    @staticmethod
+    def fingerprint_file(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return [path, None]
+        return [path, st.st_size, int(st.st_mtime)]
+
+    def fingerprint_dir(self, directory, extensions=MEDIA_EXTENSIONS):
+        if not directory or not os.path.isdir(directory):
+            return [directory, None]
+        files = []
+        for root, _, names in os.walk(directory):
+            for name in names:
+                if name.lower().endswith(extensions):
+                    st = os.stat(os.path.join(root, name))
+                    files.append([os.path.relpath(os.path.join(root, name), directory), st.st_size, int(st.st_mtime)])
+        return [directory, sorted(files)]
+
+    def video_hash(self, video_config):
+        """Hash canônico da configuração do vídeo + arquivos de entrada."""
+        background = video_config.get("background") or {}
+        assets = {
+            "videos": self.fingerprint_dir(background.get("videos_dir")),
+            "music_dir": self.fingerprint_dir(background.get("music_dir")),
+            "music_file": self.fingerprint_file(background["music_file"]) if background.get("music_file") else None,
+            "fonts": self.fingerprint_dir(self.fonts_dir, (".ttf", ".otf")),
+        }
+        return hash_key("render", video_config, assets)
+
+    @staticmethod
+    def seed_from_hash(video_hash):
+        """Semente determinística para os sorteios (clipes, música) do vídeo."""
+        return int(video_hash[:16], 16)
+
+    def is_complete(self, slug, video_hash):
+        if not self.enabled:
+            return False
+        entry = self.manifest.get(slug)
+        if not entry or entry.get("hash") != video_hash:
+            return False
+        # pasta removida após upload para o YouTube também conta como concluído
+        return entry.get("output_removed") or bool(entry.get("output_file") and os.path.exists(entry["output_file"]))
+
+    def record(self, slug, video_hash, output_file=None, output_removed=False):
+        if not self.enabled:
+            return
+        self.manifest[slug] = {
+            "hash": video_hash,
+            "output_file": output_file,
+            "output_removed": bool(output_removed),
+            "completed_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.manifest_file)), exist_ok=True)
+        tmp_path = f"{self.manifest_file}.part"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_file)
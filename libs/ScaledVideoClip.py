@@ -0,0 +1,76 @@
+import os
+import subprocess as sp
+
+from moviepy.config import get_setting
+from moviepy.editor import VideoClip
+from moviepy.video.io.ffmpeg_reader import FFMPEG_VideoReader
+
+
+def crop_scale_filter(target_size):
+    """Filtro ffmpeg: crop central para a proporção de saída + scale para target_size."""
+    w, h = target_size
+    return f"crop=w='min(iw,ih*{w}/{h})':h='min(ih,iw*{h}/{w})',scale={w}:{h}"
+
+
+class ScaledVideoReader(FFMPEG_VideoReader):
+    """
+    FFMPEG_VideoReader que pede ao ffmpeg frames já recortados e redimensionados.
+    O Python nunca recebe o frame na resolução original (ex.: 4K).
+    """
+
+    def __init__(self, filename, target_size, resize_algo="lanczos", **kwargs):
+        self.video_filter = crop_scale_filter(target_size)
+        # target_resolution é (altura, largura) no FFMPEG_VideoReader
+        FFMPEG_VideoReader.__init__(
+            self, filename,
+            target_resolution=(target_size[1], target_size[0]),
+            resize_algo=resize_algo,
+            **kwargs
+        )
+
+    def initialize(self, starttime=0):
+        """Mesmo pipe do FFMPEG_VideoReader, trocando o scale pelo crop + scale."""
+        self.close()
+
+        if starttime != 0:
+            offset = min(1, starttime)
+            i_arg = ['-ss', "%.06f" % (starttime - offset),
+                     '-i', self.filename,
+                     '-ss', "%.06f" % offset]
+        else:
+            i_arg = ['-i', self.filename]
+
+        cmd = ([get_setting("FFMPEG_BINARY")] + i_arg +
+               ['-loglevel', 'error',
+                '-f', 'image2pipe',
+                '-vf', self.video_filter,
+                '-sws_flags', self.resize_algo,
+                "-pix_fmt", self.pix_fmt,
+                '-vcodec', 'rawvideo', '-'])
+        popen_params = {"bufsize": self.bufsize,
+                        "stdout": sp.PIPE,
+                        "stderr": sp.PIPE,
+                        "stdin": sp.DEVNULL}
+
+        if os.name == "nt":
+            popen_params["creationflags"] = 0x08000000
+
+        self.proc = sp.Popen(cmd, **popen_params)
+
+
+class ScaledVideoFileClip(VideoClip):
+    """Equivalente a VideoFileClip(audio=False) + crop + resize, feito no decode."""
+
+    def __init__(self, filename, target_size, resize_algo="lanczos"):
+        VideoClip.__init__(self)
+        self.filename = filename
+        self.reader = ScaledVideoReader(filename, target_size, resize_algo=resize_algo)
+        self.duration = self.end = self.reader.duration
+        self.fps = self.reader.fps
+        self.size = self.reader.size
+        self.make_frame = lambda t: self.reader.get_frame(t)
+
+    def close(self):
+        if self.reader:
+            self.reader.close()
+            self.reader = None
@@ -0,0 +1,79 @@
+import numpy as np
+
+
+def _window_rms(samples, frame_rate, channels, seg_len, starts, window_ms):
+    """
+    RMS (inteiro, como audioop.rms) de cada janela [start, start + window_ms) em ms.
+    Usa soma acumulada dos quadrados: O(1) por janela.
+    """
+    frames = samples.reshape(-1, channels).astype(np.int64)
+    squares = np.concatenate(([0], np.cumsum((frames * frames).sum(axis=1))))
+    n_frames = len(frames)
+
+    # mesma conversão ms -> frame do pydub: int(ms * (frame_rate / 1000.0))
+    ms_to_frame = frame_rate / 1000.0
+    start_f = (starts * ms_to_frame).astype(np.int64)
+    end_f = (np.minimum(starts + window_ms, seg_len) * ms_to_frame).astype(np.int64)
+
+    # frames além do fim (arredondamento do len em ms) contam como silêncio, igual ao pydub
+    total = squares[np.minimum(end_f, n_frames)] - squares[np.minimum(start_f, n_frames)]
+    count = (end_f - start_f) * channels
+    rms = np.zeros(len(starts), dtype=np.float64)
+    valid = count > 0
+    rms[valid] = np.floor(np.sqrt(total[valid] / count[valid]))
+    return rms
+
+
+def detect_silence(samples, frame_rate, channels, sample_width, min_silence_len=1000, silence_thresh=-16, seek_step=1):
+    """Equivalente vetorizado de pydub.silence.detect_silence sobre um array PCM."""
+    seg_len = round(1000 * (len(samples) // channels) / frame_rate)
+    if seg_len < min_silence_len:
+        return []
+
+    max_possible_amplitude = float(1 << (8 * sample_width - 1))
+    thresh = (10 ** (silence_thresh / 20.0)) * max_possible_amplitude
+
+    last_slice_start = seg_len - min_silence_len
+    starts = np.arange(0, last_slice_start + 1, seek_step, dtype=np.int64)
+    if last_slice_start % seek_step:
+        starts = np.append(starts, last_slice_start)
+
+    rms = _window_rms(samples, frame_rate, channels, seg_len, starts, min_silence_len)
+    silence_starts = starts[rms <= thresh]
+    if len(silence_starts) == 0:
+        return []
+
+    # quebra um trecho quando o próximo início não é contínuo e está além da janela
+    gaps = np.diff(silence_starts)
+    breaks = np.nonzero((gaps != seek_step) & (silence_starts[1:] > silence_starts[:-1] + min_silence_len))[0]
+    range_starts = np.concatenate(([silence_starts[0]], silence_starts[breaks + 1]))
+    range_ends = np.concatenate((silence_starts[breaks], [silence_starts[-1]])) + min_silence_len
+    return [[int(s), int(e)] for s, e in zip(range_starts, range_ends)]
+
+
+def detect_nonsilent(samples, frame_rate, channels, sample_width, min_silence_len=1000, silence_thresh=-16, seek_step=1):
+    """Equivalente vetorizado de pydub.silence.detect_nonsilent sobre um array PCM."""
+    silent_ranges = detect_silence(samples, frame_rate, channels, sample_width, min_silence_len, silence_thresh, seek_step)
+    len_seg = round(1000 * (len(samples) // channels) / frame_rate)
+
+    if not silent_ranges:
+        return [[0, len_seg]]
+    if silent_ranges[0][0] == 0 and silent_ranges[0][1] == len_seg:
+        return []
+
+    prev_end_i = 0
+    nonsilent_ranges = []
+    for start_i, end_i in silent_ranges:
+        nonsilent_ranges.append([prev_end_i, start_i])
+        prev_end_i = end_i
+    if end_i != len_seg:
+        nonsilent_ranges.append([prev_end_i, len_seg])
+    if nonsilent_ranges[0] == [0, 0]:
+        nonsilent_ranges.pop(0)
+    return nonsilent_ranges
+
+
+def audio_segment_samples(audio):
+    """Array PCM (intercalado) de um pydub.AudioSegment, sem cópia."""
+    dtype = {1: np.int8, 2: np.int16, 4: np.int32}[audio.sample_width]
+    return np.frombuffer(audio.raw_data, dtype=dtype)
@@ -2,6 +2,11 @@ import os
 import srt
 from moviepy.editor import TextClip, CompositeVideoClip
 
+from libs.CaptionRenderer import CaptionRenderer
+from libs.CaptionCache import get_caption_cache
+from libs.SubtitleTrack import SubtitleTrack
+from libs.KaraokeTrack import KaraokeTrack
+
 
 class Subtitle:
     def __init__(self, params=None):
@@ -15,6 +20,15 @@ class Subtitle:
             "resolution_output": (1080, 1920),
             "position": ("center", "bottom"),
             "max_width_percent": 0.85,  # 85% da largura do vídeo
+            # largura final da trilha na tela (ex.: 80% do vídeo): as legendas já são
+            # rasterizadas nesse tamanho, sem resize por frame; None = sem escala
+            "block_width": None,
+            # "pillow": rasteriza no próprio processo | "imagemagick": TextClip (um subprocesso por legenda)
+            "renderer": os.getenv("SUBTITLE_RENDERER", "pillow"),
+            "caption_cache": os.getenv("CAPTION_CACHE", "1") != "0",  # bitmaps compartilhados entre vídeos
+            # karaokê: timeline de palavras ({basename}.words.json) + cor da palavra falada
+            "words_file": None,
+            "highlight_color": None,
         }
         if params:
             defaults.update(params)
@@ -33,20 +47,48 @@ class Subtitle:
 
         # Calcula largura máxima permitida para o texto
         max_width = int(self.resolution_output[0] * self.max_width_percent)
+        # mesma conta do resize(width=block_width) que o template fazia por frame
+        scale = self.block_width / max_width if self.block_width else 1.0
+        max_width = self.block_width or max_width
+
+        renderer = None
+        if self.renderer == "pillow":
+            renderer = CaptionRenderer({
+                "font_path": self.font_path,
+                "font_size": self.font_size,
+                "color": self.color,
+                "stroke_color": self.stroke_color,
+                "stroke_width": self.stroke_width,
+                "max_width": max_width,
+                "scale": scale,
+                "cache": get_caption_cache() if self.caption_cache else None,
+            })
+
+        if self.highlight_color:
+            if renderer and self.words_file and os.path.exists(self.words_file):
+                return KaraokeTrack.from_word_timeline(
+                    self.words_file, renderer, self.highlight_color, position=self.position)
+            print("⚠️  Karaokê requer o renderer pillow e a timeline de palavras - usando legendas simples")
 
         subtitle_clips = []
+        cues = []
         for sub in subtitles:
             txt = sub.content.replace("\n", " ").upper()
             start, end = sub.start.total_seconds(), sub.end.total_seconds()
 
             try:
+                if renderer:
+                    # bitmaps vão para a SubtitleTrack (um clipe só, busca binária por frame)
+                    cues.append((start, end, renderer.render(txt)))
+                    continue
+
                 clip = (TextClip(
                         txt,
                         font=self.font_path,
-                        fontsize=self.font_size,
+                        fontsize=int(round(self.font_size * scale)),
                         color=self.color,
                         stroke_color=self.stroke_color,
-                        stroke_width=self.stroke_width,
+                        stroke_width=self.stroke_width * scale,
                         size=(max_width, None),  # Define largura máxima
                         method="caption",
                         align="center"
@@ -59,6 +101,9 @@ class Subtitle:
                 print(f"⚠️  Erro ao gerar legenda '{txt[:30]}...': {e}")
                 continue
 
+        if cues:
+            return SubtitleTrack(cues, position=self.position)
+
         if not subtitle_clips:
             raise RuntimeError("Nenhuma legenda pôde ser gerada!")
 
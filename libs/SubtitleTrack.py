@@ -0,0 +1,142 @@
+from bisect import bisect_right
+from collections import OrderedDict
+
+import numpy as np
+from moviepy.editor import VideoClip
+
+
+class SubtitleTrack(VideoClip):
+    """
+    Trilha de legendas em uma única camada, com índice de intervalos.
+
+    Os inícios e fins das legendas dividem a timeline em intervalos elementares,
+    cada um com um conjunto fixo de legendas ativas. Para um instante t, uma
+    busca binária acha o intervalo e o frame/máscara já montados são reaproveitados
+    (LRU pequeno): o custo por frame não depende do número de legendas.
+
+    cues: lista de (início, fim, bitmap RGBA uint8), tempos em segundos.
+    size: tamanho da trilha; por padrão o da primeira legenda, como no
+    CompositeVideoClip(subtitle_clips) que esta classe substitui.
+    """
+
+    def __init__(self, cues, size=None, position=("center", "bottom"), cache_size=8):
+        VideoClip.__init__(self)
+        if not cues:
+            raise ValueError("SubtitleTrack precisa de pelo menos uma legenda.")
+
+        self.cues = sorted(cues, key=lambda c: c[0])
+        first = self.cues[0][2]
+        self.size = tuple(size or (first.shape[1], first.shape[0]))
+        self.position = position
+        self.cache_size = cache_size
+        self._frames = OrderedDict()
+
+        # intervalos elementares: entre dois limites consecutivos o conjunto ativo não muda
+        self.bounds = sorted({t for start, end, _ in self.cues for t in (start, end)})
+        self.active = []
+        current, j = [], 0
+        for t in self.bounds[:-1]:
+            # varredura: entra quem começa até t, sai quem terminou (is_playing: start <= t < end)
+            while j < len(self.cues) and self.cues[j][0] <= t:
+                current.append(j)
+                j += 1
+            current = [k for k in current if self.cues[k][1] > t]
+            # cópia: a próxima iteração acrescenta legendas em current
+            self.active.append(list(current))
+
+        w, h = self.size
+        self._blank_frame = np.zeros((h, w, 3), dtype=np.uint8)
+        self._blank_mask = np.zeros((h, w), dtype=np.float32)
+
+        self.duration = self.end = self.bounds[-1]
+        self.make_frame = lambda t: self.frame_and_mask(t)[0]
+        self.mask = VideoClip(ismask=True)
+        self.mask.make_frame = lambda t: self.frame_and_mask(t)[1]
+        self.mask.size = self.size
+        self.mask.duration = self.mask.end = self.duration
+
+    def interval_index(self, t):
+        """Índice do intervalo elementar que contém t, ou None fora da trilha."""
+        i = bisect_right(self.bounds, t) - 1
+        if i < 0 or i >= len(self.active):
+            return None
+        return i
+
+    def frame_key(self, t):
+        """Chave do conteúdo em t para o LayerCompositor: mesma chave = mesmo frame e máscara."""
+        i = self.interval_index(t)
+        if i is None or not self.active[i]:
+            return -1
+        return i
+
+    def _offset(self, bitmap):
+        return self._place(bitmap.shape[1], bitmap.shape[0])
+
+    def _place(self, bw, bh):
+        """Canto superior esquerdo de uma caixa bw x bh na trilha, conforme position."""
+        w, h = self.size
+        px, py = self.position
+
+        if px == "left":
+            x = 0
+        elif px == "right":
+            x = w - bw
+        elif px == "center":
+            x = (w - bw) // 2
+        else:
+            x = int(px)
+
+        if py == "top":
+            y = 0
+        elif py == "bottom":
+            y = h - bh
+        elif py == "center":
+            y = (h - bh) // 2
+        else:
+            y = int(py)
+        return x, y
+
+    def _blit(self, frame, mask, bitmap, x, y):
+        """Aplica um bitmap RGBA em (x, y) sobre frame/máscara (alpha "over")."""
+        w, h = self.size
+        # recorta o que sair da trilha (igual ao blit do MoviePy)
+        x1, y1 = max(0, x), max(0, y)
+        x2, y2 = min(w, x + bitmap.shape[1]), min(h, y + bitmap.shape[0])
+        if x1 >= x2 or y1 >= y2:
+            return
+        part = bitmap[y1 - y:y2 - y, x1 - x:x2 - x]
+        alpha = part[:, :, 3].astype(np.float32) / 255.0
+
+        region = frame[y1:y2, x1:x2]
+        region *= (1.0 - alpha)[:, :, None]
+        region += part[:, :, :3] * alpha[:, :, None]
+        mask[y1:y2, x1:x2] = alpha + mask[y1:y2, x1:x2] * (1.0 - alpha)
+
+    def _compose(self, cue_indexes):
+        """Monta frame RGB e máscara das legendas ativas (a última fica por cima)."""
+        w, h = self.size
+        frame = np.zeros((h, w, 3), dtype=np.float32)
+        mask = np.zeros((h, w), dtype=np.float32)
+
+        for k in cue_indexes:
+            bitmap = self.cues[k][2]
+            x, y = self._offset(bitmap)
+            self._blit(frame, mask, bitmap, x, y)
+
+        return np.round(frame).astype(np.uint8), mask
+
+    def frame_and_mask(self, t):
+        i = self.interval_index(t)
+        if i is None or not self.active[i]:
+            return self._blank_frame, self._blank_mask
+
+        cached = self._frames.get(i)
+        if cached is not None:
+            self._frames.move_to_end(i)
+            return cached
+
+        cached = self._compose(self.active[i])
+        self._frames[i] = cached
+        if len(self._frames) > self.cache_size:
+            self._frames.popitem(last=False)
+        return cached
@@ -0,0 +1,66 @@
+import os
+import json
+import shutil
+import unicodedata
+
+from libs.DiskCache import DiskCache, DEFAULT_CACHE_ROOT, hash_key
+
+
+class TTSCache:
+    """
+    Cache de síntese de voz (áudio + marcas de palavras) compartilhado por EdgeTTS e PollyTTS.
+
+    A chave é (provedor, parâmetros de voz, texto normalizado). Um acerto devolve
+    o áudio e as marcas sem nenhuma chamada de rede.
+    """
+
+    def __init__(self, params=None):
+        defaults = {
+            "cache_dir": os.getenv("TTS_CACHE_DIR", os.path.join(DEFAULT_CACHE_ROOT, "tts")),
+            "max_cache_size_mb": float(os.getenv("TTS_CACHE_MAX_MB", 2048)),
+        }
+        if params:
+            defaults.update(params)
+        for k, v in defaults.items():
+            setattr(self, k, v)
+
+        max_size = int(self.max_cache_size_mb * 1024 ** 2) if self.max_cache_size_mb else None
+        self.cache = DiskCache({"cache_dir": self.cache_dir, "max_size_bytes": max_size})
+
+    @staticmethod
+    def normalize_text(text):
+        return unicodedata.normalize("NFC", " ".join(str(text).split()))
+
+    def make_key(self, provider, text, **params):
+        return hash_key("tts", provider, self.normalize_text(text), params)
+
+    def get(self, key, audio_ext):
+        """Retorna {"audio_path", "data"} ou None."""
+        audio_path = self.cache.get(key, audio_ext)
+        data_path = self.cache.get(key, ".json")
+        if not audio_path or not data_path:
+            return None
+        try:
+            with open(data_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return {"audio_path": audio_path, "data": data}
+
+    def put(self, key, audio_ext, data, audio_path=None, audio_bytes=None):
+        """Guarda o áudio (de um arquivo ou bytes) e os metadados JSON da síntese."""
+        tmp_audio = self.cache.tmp_path_for(key, audio_ext)
+        if audio_path:
+            shutil.copyfile(audio_path, tmp_audio)
+        else:
+            with open(tmp_audio, "wb") as f:
+                f.write(audio_bytes)
+        # metadados primeiro: a entrada só é válida com os dois arquivos
+        self.cache.put_bytes(key, ".json", json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        return self.cache.commit(tmp_audio, key, audio_ext)
+
+    @staticmethod
+    def restore(cached, destination):
+        """Copia o áudio do cache para o caminho de saída esperado pelo chamador."""
+        shutil.copyfile(cached["audio_path"], destination)
+        return destination
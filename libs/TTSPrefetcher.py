@@ -0,0 +1,74 @@
+import os
+import asyncio
+import threading
+
+from libs.TTS_Edge import EdgeTTS
+
+
+class TTSPrefetcher:
+    """
+    Sintetiza as narrações dos próximos vídeos em segundo plano.
+
+    Um único loop asyncio roda em uma thread própria e executa até `concurrency`
+    sínteses ao mesmo tempo, enquanto a renderização (CPU) do vídeo atual segue
+    na thread principal. Os resultados vão para o TTSCache; a narração do vídeo
+    só precisa esperar (wait) a sua própria síntese terminar.
+    """
+
+    def __init__(self, params=None):
+        defaults = {
+            "concurrency": int(os.getenv("TTS_PREFETCH_CONCURRENCY", 3)),
+            "tts_overrides": {},  # parâmetros extras repassados ao EdgeTTS
+        }
+        if params:
+            defaults.update(params)
+        for k, v in defaults.items():
+            setattr(self, k, v)
+
+        self._futures = {}
+        self._loop = asyncio.new_event_loop()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._thread = threading.Thread(target=self._run_loop, name="tts-prefetch", daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    async def _prefetch(self, tts):
+        async with self._semaphore:
+            return await tts.prefetch_async()
+
+    def submit(self, tts_params):
+        """Agenda a síntese e retorna a chave de cache correspondente (ou None)."""
+        tts = EdgeTTS({**tts_params, **self.tts_overrides})
+        if not tts.cache or not tts.text:
+            return None
+        key = tts.cache_key()
+        if key not in self._futures:
+            self._futures[key] = asyncio.run_coroutine_threadsafe(self._prefetch(tts), self._loop)
+        return key
+
+    def submit_batch(self, tts_params_list):
+        keys = [self.submit(params) for params in tts_params_list]
+        pending = len([k for k in keys if k])
+        if pending:
+            print(f"🎙️ Pré-carregando {pending} narração(ões) em segundo plano (concorrência {self.concurrency})...")
+        return keys
+
+    def wait(self, key, timeout=None):
+        """Bloqueia até a síntese da chave terminar. Erros só são reportados (a narração tenta de novo)."""
+        future = self._futures.get(key)
+        if not future:
+            return False
+        try:
+            return future.result(timeout)
+        except Exception as e:
+            print(f"⚠️  Falha no pré-carregamento da narração: {e}")
+            return False
+
+    def close(self):
+        for future in self._futures.values():
+            future.cancel()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
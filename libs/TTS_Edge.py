@@ -3,10 +3,18 @@ import io
 import asyncio
 from pathlib import Path
 from mutagen.mp3 import MP3
-from pydub import AudioSegment, silence
+from pydub import AudioSegment
 import edge_tts
 import tempfile
 
+from libs.TTSCache import TTSCache
+from libs.SilenceDetection import detect_nonsilent, audio_segment_samples
+from libs.AudioStreamDecoder import AudioStreamDecoder
+from libs.TextChunker import chunk_text
+from libs.CueGrouping import grouping_params, group_words, write_word_timeline
+
+EDGE_TTS_RATE = "+15%"
+
 
 def ms_to_srt_time(ms: float) -> str:
     total_seconds = int(ms // 1000)
@@ -29,6 +37,18 @@ class EdgeTTS:
             "min_silence_len": 400,
             "keep_silence": 275,
             # "rate": "+15%"
+            "use_cache": True,
+            "cache": None,  # instância de TTSCache (opcional)
+            "communicate_class": edge_tts.Communicate,
+            "stream_decode": True,  # decodifica o mp3 enquanto a síntese chega
+            # textos longos são divididos em frases e sintetizados em paralelo
+            "chunk_max_chars": int(os.getenv("EDGE_TTS_CHUNK_CHARS", 1500)),
+            "chunk_concurrency": int(os.getenv("EDGE_TTS_CONCURRENCY", 4)),
+            # narração em PCM na memória até o mux final (sem mp3 intermediário)
+            "pcm_output": False,
+            "write_audio_file": True,  # no modo PCM, grava o mp3 avulso só se pedido
+            # agrupa palavras em frases curtas no .srt (True = padrões, dict = limites); None = palavra a palavra
+            "cue_grouping": None,
         }
         if params:
             defaults.update(params)
@@ -39,75 +59,203 @@ class EdgeTTS:
         if self.text is None and self.text_file_path.exists():
             self.text = self.text_file_path.read_text(encoding="utf-8").strip()
 
+        if self.use_cache and self.cache is None:
+            self.cache = TTSCache()
+
+    def cache_key(self):
+        # a divisão em blocos muda o áudio final; texto em bloco único mantém a chave de sempre
+        chunking = {"chunk_max_chars": self.chunk_max_chars} if len(self._text_chunks()) > 1 else {}
+        return self.cache.make_key(
+            "edge",
+            self.text,
+            voice_id=self.voice_id,
+            rate=EDGE_TTS_RATE,
+            audio_format="wav" if self.pcm_output else self.audio_format,
+            silence_thresh=self.silence_thresh,
+            min_silence_len=self.min_silence_len,
+            keep_silence=self.keep_silence,
+            **chunking
+        )
+
+    def _text_chunks(self):
+        if not self.text:
+            return []
+        if self.chunk_concurrency <= 1 or not self.chunk_max_chars or len(self.text) <= self.chunk_max_chars:
+            return [self.text]
+        return chunk_text(self.text, self.chunk_max_chars) or [self.text]
+
     async def _synthesize_audio_async(self):
         if not self.text:
             raise ValueError("Nenhum texto disponível para síntese.")
 
-        communicate = edge_tts.Communicate(
-            self.text,
+        chunks = self._text_chunks()
+        if len(chunks) == 1:
+            return await self._synthesize_chunk_async(chunks[0])
+
+        semaphore = asyncio.Semaphore(self.chunk_concurrency)
+
+        async def synthesize(text):
+            async with semaphore:
+                return await self._synthesize_chunk_async(text)
+
+        tasks = [asyncio.ensure_future(synthesize(text)) for text in chunks]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return await asyncio.get_running_loop().run_in_executor(None, self._join_chunks, results)
+
+    @staticmethod
+    def _join_chunks(results):
+        """
+        Junta os blocos sintetizados em uma única timeline: concatena o PCM
+        e desloca as marcas de cada bloco pela duração exata dos anteriores.
+        Os silêncios nas junções são tratados depois por _remove_silences.
+        """
+        segments = []
+        for audio, _ in results:
+            if not isinstance(audio, AudioSegment):
+                audio = AudioSegment.from_file(io.BytesIO(audio), format="mp3")
+            segments.append(audio)
+
+        first = segments[0]
+        word_boundaries = []
+        pcm = []
+        offset_ms = 0.0
+        for audio, (_, boundaries) in zip(segments, results):
+            if (audio.frame_rate, audio.channels, audio.sample_width) != (first.frame_rate, first.channels, first.sample_width):
+                audio = audio.set_frame_rate(first.frame_rate).set_channels(first.channels).set_sample_width(first.sample_width)
+            for w in boundaries:
+                word_boundaries.append({
+                    "word": w["word"],
+                    "start": w["start"] + offset_ms,
+                    "end": w["end"] + offset_ms
+                })
+            pcm.append(audio.raw_data)
+            offset_ms += 1000 * (len(audio.raw_data) // audio.frame_width) / audio.frame_rate
+
+        return first._spawn(b"".join(pcm)), word_boundaries
+
+    async def _synthesize_chunk_async(self, text):
+        communicate = self.communicate_class(
+            text,
             self.voice_id,
-            rate="+15%",
+            rate=EDGE_TTS_RATE,
             boundary="WordBoundary"
         )
 
         word_boundaries = []
-        audio_data = b""
-
-        async for chunk in communicate.stream():
-            if chunk["type"] == "audio":
-                audio_data += chunk["data"]
-            elif chunk["type"] == "WordBoundary":
-                D = 10000
-                start_ms = chunk["offset"] / D
-                end_ms = start_ms + (chunk["duration"] / D)
-                word_boundaries.append({
-                    "word": chunk["text"],
-                    "start": start_ms,
-                    "end": end_ms
-                })
+        # decodifica enquanto a síntese chega; sem decoder, acumula sem recópias
+        decoder = AudioStreamDecoder() if self.stream_decode else None
+        audio_buffer = bytearray()
 
-        return audio_data, word_boundaries
+        try:
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    if decoder:
+                        decoder.feed(chunk["data"])
+                    else:
+                        audio_buffer += chunk["data"]
+                elif chunk["type"] == "WordBoundary":
+                    D = 10000
+                    start_ms = chunk["offset"] / D
+                    end_ms = start_ms + (chunk["duration"] / D)
+                    word_boundaries.append({
+                        "word": chunk["text"],
+                        "start": start_ms,
+                        "end": end_ms
+                    })
+        except BaseException:
+            if decoder:
+                decoder.abort()
+            raise
+
+        if decoder:
+            # termina a decodificação fora do loop (espera o ffmpeg esvaziar o pipe)
+            audio = await asyncio.get_running_loop().run_in_executor(None, decoder.finish)
+            return audio, word_boundaries
+        return bytes(audio_buffer), word_boundaries
+
+    @staticmethod
+    def _realign_word_boundaries(kept_ranges, word_boundaries):
+        """
+        Reposiciona as palavras na timeline sem silêncios.
+        kept_ranges: [(start, end, offset)] em ms, ordenados; offset = início do trecho no novo áudio.
+        Dois ponteiros (trechos x palavras ordenadas): O(trechos + palavras).
+        """
+        words = sorted(word_boundaries, key=lambda x: x["start"])
+        adjusted_boundaries = []
+        j = 0
+        for start, end, offset in kept_ranges:
+            # palavras que começam antes do trecho não cabem nele nem nos próximos
+            while j < len(words) and words[j]["start"] < start:
+                j += 1
+            while j < len(words) and words[j]["start"] <= end:
+                w = words[j]
+                if w["end"] <= end:
+                    adjusted_boundaries.append({
+                        "word": w["word"],
+                        "start": offset + (w["start"] - start),
+                        "end": offset + (w["end"] - start)
+                    })
+                j += 1
+        return adjusted_boundaries
 
-    def _remove_silences(self, audio_data, word_boundaries):
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-            tmp.write(audio_data)
-            tmp.flush()
-            tmp_path = tmp.name
+    def _cache_ext(self):
+        # no modo PCM o cache guarda wav (sem perdas)
+        return ".wav" if self.pcm_output else f".{self.audio_format}"
 
-        audio = AudioSegment.from_file(tmp_path)
-        os.remove(tmp_path)
+    def _cut_silences(self, audio_data, word_boundaries):
+        """Remove os silêncios longos e retorna (AudioSegment, marcas realinhadas)."""
+        if isinstance(audio_data, AudioSegment):
+            audio = audio_data  # já decodificado durante o stream
+        else:
+            audio = AudioSegment.from_file(io.BytesIO(audio_data), format="mp3")
+        samples = audio_segment_samples(audio)
 
-        non_silence_ranges = silence.detect_nonsilent(
-            audio,
+        non_silence_ranges = detect_nonsilent(
+            samples,
+            audio.frame_rate,
+            audio.channels,
+            audio.sample_width,
             min_silence_len=self.min_silence_len,
             silence_thresh=self.silence_thresh
         )
 
-        new_audio = AudioSegment.empty()
-        adjusted_boundaries = []
+        # Corta os trechos com som (mesmo arredondamento ms -> frame do pydub)
+        raw = audio.raw_data
+        frame_width = audio.frame_width
+        ms_to_frame = audio.frame_rate / 1000.0
+        audio_len = len(audio)
+        chunks = []
+        kept_ranges = []
         current_time = 0
 
         for start, end in non_silence_ranges:
-            segment = audio[start:end + self.keep_silence]
-            new_audio += segment
-
-            # Realinha palavras que caem dentro desse trecho
-            for w in word_boundaries:
-                if w["start"] >= start and w["end"] <= end:
-                    new_start = current_time + (w["start"] - start)
-                    new_end = current_time + (w["end"] - start)
-                    adjusted_boundaries.append({
-                        "word": w["word"],
-                        "start": new_start,
-                        "end": new_end
-                    })
+            seg_start = int(min(start, audio_len) * ms_to_frame) * frame_width
+            seg_end = int(min(end + self.keep_silence, audio_len) * ms_to_frame) * frame_width
+            chunk = raw[seg_start:seg_end]
+            # frames que faltam pelo arredondamento do len() viram silêncio, igual ao pydub
+            chunk += b"\x00" * ((seg_end - seg_start) - len(chunk))
+            chunks.append(chunk)
+            kept_ranges.append((start, end, current_time))
+            current_time += round(1000 * (len(chunk) // frame_width) / audio.frame_rate)
 
-            current_time += len(segment)
+        new_audio = audio._spawn(b"".join(chunks))
+
+        # Realinha palavras que caem dentro de cada trecho
+        adjusted_boundaries = self._realign_word_boundaries(kept_ranges, word_boundaries)
 
         # garante ordenação e remove sobreposições
         adjusted_boundaries.sort(key=lambda x: x["start"])
+        return new_audio, adjusted_boundaries
 
-        final_path = f"{self.output_basename}.{self.audio_format}"
+    def _remove_silences(self, audio_data, word_boundaries, final_path=None):
+        new_audio, adjusted_boundaries = self._cut_silences(audio_data, word_boundaries)
+        final_path = final_path or f"{self.output_basename}.{self.audio_format}"
         new_audio.export(final_path, format=self.audio_format, bitrate="192k")
         return final_path, adjusted_boundaries
 
@@ -122,15 +270,127 @@ class EdgeTTS:
                 f.write(f"{w['word']}\n\n")
         return srt_path
 
+    def _generate_srt(self, word_boundaries):
+        """
+        Gera o .srt: palavra a palavra ou, com cue_grouping, em frases curtas.
+        Agrupado, grava também a timeline das palavras ({basename}.words.json).
+        Retorna (srt_path, words_path ou None).
+        """
+        grouping = grouping_params(self.cue_grouping)
+        if not grouping:
+            return self._generate_srt_word_by_word(word_boundaries), None
+
+        cues = group_words(word_boundaries, **grouping)
+        srt_path = f"{self.output_basename}.srt"
+        with open(srt_path, "w", encoding="utf-8") as f:
+            for i, cue in enumerate(cues, 1):
+                start = max(0, cue['start'])
+                end = max(start + 50, cue['end'])
+                f.write(f"{i}\n")
+                f.write(f"{ms_to_srt_time(start)} --> {ms_to_srt_time(end)}\n")
+                f.write(f"{cue['text']}\n\n")
+        words_path = write_word_timeline(cues, f"{self.output_basename}.words.json")
+        return srt_path, words_path
+
+    async def prefetch_async(self):
+        """
+        Sintetiza e guarda no cache de TTS sem gerar arquivos de saída.
+        O processamento de silêncio roda em uma thread para não travar o loop.
+        """
+        if not self.cache or not self.text:
+            return False
+        key = self.cache_key()
+        ext = self._cache_ext()
+        if self.cache.get(key, ext):
+            return True
+
+        audio_data, word_boundaries = await self._synthesize_audio_async()
+
+        def process():
+            if self.pcm_output:
+                new_audio, new_boundaries = self._cut_silences(audio_data, word_boundaries)
+                self.cache.put(key, ext, {"word_boundaries": new_boundaries}, audio_bytes=self._wav_bytes(new_audio))
+                return
+            fd, tmp_path = tempfile.mkstemp(suffix=ext)
+            os.close(fd)
+            try:
+                _, new_boundaries = self._remove_silences(audio_data, word_boundaries, final_path=tmp_path)
+                self.cache.put(key, ext, {"word_boundaries": new_boundaries}, audio_path=tmp_path)
+            finally:
+                os.remove(tmp_path)
+
+        await asyncio.get_running_loop().run_in_executor(None, process)
+        return True
+
+    @staticmethod
+    def _wav_bytes(audio):
+        # wav é escrito pelo próprio pydub (módulo wave), sem ffmpeg
+        buffer = io.BytesIO()
+        audio.export(buffer, format="wav")
+        return buffer.getvalue()
+
+    def _generate_pcm(self, key):
+        """
+        Modo PCM: a narração sai como AudioSegment na memória (cache em wav).
+        O mp3 só é codificado se write_audio_file estiver ativo.
+        """
+        ext = self._cache_ext()
+        cached = self.cache.get(key, ext) if key else None
+
+        if cached:
+            print("♻️ Narração encontrada no cache de TTS")
+            new_audio = AudioSegment.from_wav(cached["audio_path"])
+            new_boundaries = cached["data"]["word_boundaries"]
+        else:
+            audio_data, word_boundaries = asyncio.get_event_loop().run_until_complete(
+                self._synthesize_audio_async()
+            )
+            new_audio, new_boundaries = self._cut_silences(audio_data, word_boundaries)
+            if key:
+                self.cache.put(key, ext, {"word_boundaries": new_boundaries}, audio_bytes=self._wav_bytes(new_audio))
+
+        audio_file = None
+        if self.write_audio_file:
+            audio_file = f"{self.output_basename}.{self.audio_format}"
+            new_audio.export(audio_file, format=self.audio_format, bitrate="192k")
+
+        srt_file, words_file = self._generate_srt(new_boundaries)
+        return {
+            "audio_file": audio_file,
+            "audio_segment": new_audio,
+            "subtitle_file": str(srt_file),
+            "words_file": words_file,
+            "audio_total_duration": new_audio.frame_count() / new_audio.frame_rate
+        }
+
     def generate_audio_and_subtitles(self):
-        audio_data, word_boundaries = asyncio.get_event_loop().run_until_complete(
-            self._synthesize_audio_async()
-        )
-        final_audio, new_boundaries = self._remove_silences(audio_data, word_boundaries)
-        srt_file = self._generate_srt_word_by_word(new_boundaries)
+        if not self.text:
+            raise ValueError("Nenhum texto disponível para síntese.")
+
+        key = self.cache_key() if self.cache else None
+        if self.pcm_output:
+            return self._generate_pcm(key)
+
+        ext = self._cache_ext()
+        cached = self.cache.get(key, ext) if key else None
+
+        if cached:
+            print("♻️ Narração encontrada no cache de TTS")
+            final_audio = self.cache.restore(cached, f"{self.output_basename}{ext}")
+            new_boundaries = cached["data"]["word_boundaries"]
+        else:
+            audio_data, word_boundaries = asyncio.get_event_loop().run_until_complete(
+                self._synthesize_audio_async()
+            )
+            final_audio, new_boundaries = self._remove_silences(audio_data, word_boundaries)
+            if key:
+                self.cache.put(key, ext, {"word_boundaries": new_boundaries}, audio_path=final_audio)
+
+        srt_file, words_file = self._generate_srt(new_boundaries)
         duration = MP3(str(final_audio)).info.length
         return {
             "audio_file": str(final_audio),
             "subtitle_file": str(srt_file),
+            "words_file": words_file,
             "audio_total_duration": duration
         }
@@ -1,14 +1,32 @@
 import os
+import io
 import json
+import threading
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 import boto3
 from dotenv import load_dotenv
 from mutagen.mp3 import MP3
+from mutagen.oggvorbis import OggVorbis
 import wave, contextlib
 
+from libs.TTSCache import TTSCache
+from libs.TextChunker import chunk_text
+
 load_dotenv()
 
+# clientes boto3 são thread-safe: um por região, reaproveitado entre vídeos
+_polly_clients = {}
+_polly_clients_lock = threading.Lock()
+
+
+def get_polly_client(region):
+    with _polly_clients_lock:
+        if region not in _polly_clients:
+            _polly_clients[region] = boto3.client("polly", region_name=region)
+        return _polly_clients[region]
+
 
 def ms_to_srt_time(ms: int) -> str:
     td = timedelta(milliseconds=int(ms))
@@ -34,6 +52,13 @@ class PollyTTS:
             "text": None,
             "min_word_duration": 160,
             "last_word_duration": 400,
+            "use_cache": True,
+            "cache": None,  # instância de TTSCache (opcional)
+            "polly_client": None,  # cliente injetável (Stubber / stand-in local)
+            # limite de caracteres por requisição do Polly (3000, com folga)
+            "max_chars": int(os.getenv("POLLY_MAX_CHARS", 2900)),
+            # requisições simultâneas (áudio e marcas de cada bloco); 1 = ordem fixa, útil com Stubber
+            "max_workers": int(os.getenv("POLLY_CONCURRENCY", 4)),
         }
         if params:
             defaults.update(params)
@@ -47,7 +72,28 @@ class PollyTTS:
         if self.text is None and self.text_file_path.exists():
             self.text = self.text_file_path.read_text(encoding="utf-8").strip()
 
-        self.polly = boto3.client("polly", region_name=self.region)
+        self.polly = self.polly_client or get_polly_client(self.region)
+
+        if self.use_cache and self.cache is None:
+            self.cache = TTSCache()
+
+    def cache_key(self):
+        # texto em bloco único mantém a chave de sempre
+        chunking = {"max_chars": self.max_chars} if len(self._text_chunks()) > 1 else {}
+        return self.cache.make_key(
+            "polly",
+            self.text,
+            voice_id=self.voice_id,
+            engine=self.engine,
+            audio_format=self.audio_format,
+            language_code=self.language_code,
+            **chunking
+        )
+
+    def _text_chunks(self):
+        if not self.max_chars or len(self.text) <= self.max_chars:
+            return [self.text]
+        return chunk_text(self.text, self.max_chars) or [self.text]
 
     def _synthesize_with_engine(self, **params):
         if self.engine:
@@ -69,43 +115,26 @@ class PollyTTS:
                     srtf.write(f"{i}\n{ms_to_srt_time(start)} --> {ms_to_srt_time(end)}\n{text_word}\n\n")
         return srt_path
 
-    def generate_audio_and_subtitles(self):
-        if not self.text:
-            raise ValueError("Nenhum texto disponível para síntese.")
-
-        audio_params = dict(
-            Text=self.text,
+    def _request_audio(self, text):
+        resp = self._synthesize_with_engine(
+            Text=text,
             TextType="text",
             OutputFormat=self.audio_format,
             VoiceId=self.voice_id,
             LanguageCode=self.language_code,
         )
-        audio_resp = self._synthesize_with_engine(**audio_params)
-
-        ext = self.audio_format if self.audio_format != "pcm" else "raw"
-        audio_path = self.temp_dir / f"{self.output_basename}.{ext}"
-        with open(audio_path, "wb") as f:
-            f.write(audio_resp["AudioStream"].read())
-
-        wav_path = None
-        if self.audio_format == "pcm":
-            wav_path = self.temp_dir / f"{self.output_basename}.wav"
-            with open(audio_path, "rb") as pcmf, contextlib.closing(wave.open(str(wav_path), "wb")) as wavf:
-                wavf.setnchannels(1)
-                wavf.setsampwidth(2)
-                wavf.setframerate(22050)
-                wavf.writeframes(pcmf.read())
+        return resp["AudioStream"].read()
 
-        sm_params = dict(
-            Text=self.text,
+    def _request_marks(self, text):
+        resp = self._synthesize_with_engine(
+            Text=text,
             TextType="text",
             OutputFormat="json",
             VoiceId=self.voice_id,
             LanguageCode=self.language_code,
             SpeechMarkTypes=["word"],
         )
-        sm_resp = self._synthesize_with_engine(**sm_params)
-        sm_data = sm_resp["AudioStream"].read().decode("utf-8")
+        sm_data = resp["AudioStream"].read().decode("utf-8")
 
         words = []
         for ln in sm_data.splitlines():
@@ -115,6 +144,71 @@ class PollyTTS:
                     words.append(obj)
             except json.JSONDecodeError:
                 continue
+        return words
+
+    def _audio_duration_ms(self, audio_bytes):
+        if self.audio_format == "pcm":
+            return 1000 * len(audio_bytes) / (2 * 22050)
+        if self.audio_format == "mp3":
+            return 1000 * MP3(io.BytesIO(audio_bytes)).info.length
+        return 1000 * OggVorbis(io.BytesIO(audio_bytes)).info.length
+
+    def _synthesize_audio_and_marks(self, audio_path):
+        """
+        Sintetiza o áudio (gravado em audio_path) e retorna as speech marks de palavras.
+        Áudio e marcas são pedidos ao mesmo tempo; textos acima de max_chars viram
+        blocos paralelos, com as marcas deslocadas pela duração dos blocos anteriores.
+        """
+        chunks = self._text_chunks()
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as pool:
+            requests = [(pool.submit(self._request_audio, text), pool.submit(self._request_marks, text))
+                        for text in chunks]
+            results = [(audio.result(), marks.result()) for audio, marks in requests]
+
+        words = []
+        time_offset = 0
+        text_offset = 0
+        with open(audio_path, "wb") as f:
+            for text, (audio_bytes, marks) in zip(chunks, results):
+                f.write(audio_bytes)
+                for mark in marks:
+                    mark = dict(mark)
+                    mark["time"] = int(round(mark.get("time", 0) + time_offset))
+                    if "start" in mark and "end" in mark:
+                        mark["start"] += text_offset
+                        mark["end"] += text_offset
+                    words.append(mark)
+                if len(chunks) > 1:
+                    time_offset += self._audio_duration_ms(audio_bytes)
+                text_offset += len(text.encode("utf-8")) + 1
+        return words
+
+    def generate_audio_and_subtitles(self):
+        if not self.text:
+            raise ValueError("Nenhum texto disponível para síntese.")
+
+        ext = self.audio_format if self.audio_format != "pcm" else "raw"
+        audio_path = self.temp_dir / f"{self.output_basename}.{ext}"
+
+        key = self.cache_key() if self.cache else None
+        cached = self.cache.get(key, f".{ext}") if key else None
+        if cached:
+            print("♻️ Narração encontrada no cache de TTS")
+            self.cache.restore(cached, audio_path)
+            words = cached["data"]["words"]
+        else:
+            words = self._synthesize_audio_and_marks(audio_path)
+            if key:
+                self.cache.put(key, f".{ext}", {"words": words}, audio_path=audio_path)
+
+        wav_path = None
+        if self.audio_format == "pcm":
+            wav_path = self.temp_dir / f"{self.output_basename}.wav"
+            with open(audio_path, "rb") as pcmf, contextlib.closing(wave.open(str(wav_path), "wb")) as wavf:
+                wavf.setnchannels(1)
+                wavf.setsampwidth(2)
+                wavf.setframerate(22050)
+                wavf.writeframes(pcmf.read())
 
         srt_file = self._generate_srt(words)
 
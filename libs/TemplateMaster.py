@@ -2,23 +2,46 @@ import random
 import os
 import shutil
 
+import numpy as np
+
 from libs.Subtitle import Subtitle
+from libs.AssSubtitle import AssSubtitle
 from libs.BackgroundVideo import BackgroundVideo
 from libs.TTS_Edge import EdgeTTS
 from libs.Headline import Headline
 from libs.YouTube import YouTube
+from libs.Timeline import Timeline
+from libs.TimelineFFmpeg import FFmpegTimeline
+from libs.TimelineMoviePy import MoviePyTimeline
+from libs.TimelineParallel import ParallelTimeline
+from libs.EncoderProfiles import EncoderProfile, size_report
 
 from moviepy.editor import CompositeVideoClip, AudioFileClip, ImageClip, CompositeAudioClip, concatenate_audioclips
+from moviepy.audio.AudioClip import AudioArrayClip
 
 AVALIABLE_RATIOS = {"9:16": (1080, 1920), "16:9": (1920, 1080)}
+# taxa de áudio do write_videofile: a narração em PCM já é entregue nela
+AUDIO_FPS = 44100
+# estilo das legendas da narração (compartilhado pelos modos MoviePy e ASS)
+SUBTITLE_STYLE = {"font_size": 90, "stroke_width": 3}
+# largura de layout da headline (quebra de linha e tamanho das fontes)
+HEADLINE_WIDTH = 700
+# cor padrão da palavra falada nas legendas karaokê
+KARAOKE_HIGHLIGHT_COLOR = "#FFD60A"
+# duração máxima de cada clipe do fundo (o total vem de max_total_video_duration)
+BACKGROUND_MAX_CLIP_DURATION = float(os.getenv("MAX_CLIP_DURATION", 8))
 
 class TemplateMaster:
+    # TTSPrefetcher compartilhado pelo lote (definido em main.py)
+    tts_prefetcher = None
+
     def __init__(self, video_config=None):
         default_video_config = {
             "slug": False,
             "output_folder": False,
             "output_ratio": "9:16",
             "max_total_video_duration": False,
+            "random_seed": None,
         }
 
         # Atualizar o default_video_config com os valores fornecidos em video_config
@@ -35,17 +58,24 @@ class TemplateMaster:
         for k, v in default_video_config.items():
             setattr(self, k, v)
 
+        # gerador próprio: com random_seed os sorteios (clipes, música) são reproduzíveis
+        self.rng = random.Random(self.random_seed)
+
     def validate_configs(self):
         # Implement validation logic here
         pass
         
-    def narration_subtitles(self, params=None):
+    @staticmethod
+    def edge_tts_params(params=None):
         """
-        Gera a narração e as legendas para o vídeo.
-        Retorna um dicionário com o áudio da narração e os clipes de legendas.
+        Monta os parâmetros do EdgeTTS a partir do bloco "tts" do vídeo.
+        Usado pela narração e pelo pré-carregamento (TTSPrefetcher).
         """
         params_default = {
             "narration_text": False,
+            # narração em PCM até o mux final; "narration_file" grava também o mp3 avulso
+            "pcm_narration": False,
+            "narration_file": False,
             "edge_tts": {
                 "voice_id": "pt-BR-AntonioNeural",
                 "rate": "0%",
@@ -57,59 +87,204 @@ class TemplateMaster:
             params_default.update(params)
             # Atualizar edge_tts separadamente para preservar valores padrão
             if "edge_tts" in params:
-                params_default["edge_tts"].update(params["edge_tts"])
+                params_default["edge_tts"] = {"voice_id": "pt-BR-AntonioNeural", "rate": "0%", **params["edge_tts"]}
 
-        original_dir = os.getcwd()
-        os.chdir(self.output_folder)
-        
-        tts = EdgeTTS({
+        return {
             "text": params_default["narration_text"],
             "voice_id": params_default["edge_tts"]["voice_id"],
             "rate": params_default["edge_tts"].get("rate", "0%"),
-            "output_basename": self.slug,
+            "pcm_output": bool(params_default["pcm_narration"]),
+            "write_audio_file": not params_default["pcm_narration"] or bool(params_default["narration_file"]),
+        }
+
+    @staticmethod
+    def narration_clip(audio_segment):
+        """
+        Converte a narração em PCM (pydub.AudioSegment) em um AudioArrayClip estéreo
+        na taxa do write_videofile, sem passar por arquivo nem por ffmpeg.
+        """
+        audio = audio_segment.set_sample_width(2).set_frame_rate(AUDIO_FPS)
+        samples = np.frombuffer(audio.raw_data, dtype=np.int16).reshape(-1, audio.channels)
+        samples = samples.astype(np.float32) / 32768.0
+        if audio.channels == 1:
+            samples = np.repeat(samples, 2, axis=1)
+        return AudioArrayClip(samples, fps=AUDIO_FPS)
+
+    def narration_subtitles(self, params=None, burn_in=False, cue_grouping=None, karaoke=None, block_width=None):
+        """
+        Gera a narração e as legendas para o vídeo.
+        Retorna um dicionário com o áudio da narração e os clipes de legendas.
+        Com burn_in=True os clipes não são gerados: as legendas serão gravadas
+        pelo ffmpeg a partir de "subtitle_file" (ver ass_subtitles).
+        cue_grouping: agrupa as palavras em frases curtas (ver CueGrouping).
+        karaoke: True ou uma cor - frase inteira na tela com a palavra falada
+        destacada (ver KaraokeTrack); liga o agrupamento padrão se não houver.
+        block_width: largura final das legendas na tela; rasteriza já nesse tamanho.
+        """
+        highlight_color = None
+        if karaoke:
+            highlight_color = karaoke if isinstance(karaoke, str) else KARAOKE_HIGHLIGHT_COLOR
+            cue_grouping = cue_grouping or True
+
+        tts = EdgeTTS({
+            **self.edge_tts_params(params),
+            # caminho completo: sem os.chdir (global ao processo)
+            "output_basename": os.path.join(self.output_folder, self.slug),
+            "cue_grouping": cue_grouping,
         })
+
+        # narração pode já estar sendo sintetizada em segundo plano
+        if self.tts_prefetcher and tts.cache:
+            self.tts_prefetcher.wait(tts.cache_key())
+
         tts_result = tts.generate_audio_and_subtitles()
-        
-        # Voltar para o diretório original
-        os.chdir(original_dir)
 
         # retorna obj com o audio da narração carregado e o clip de legendas
-        audio_path = os.path.join(self.output_folder, tts_result["audio_file"])
-        subtitle_path = os.path.join(self.output_folder, tts_result["subtitle_file"])
+        audio_path = tts_result["audio_file"]
+        subtitle_path = tts_result["subtitle_file"]
 
-        # carregar audio da narração
-        audio_narration = AudioFileClip(audio_path)
+        # carregar audio da narração (modo PCM: direto da memória)
+        if tts_result.get("audio_segment") is not None:
+            audio_narration = self.narration_clip(tts_result["audio_segment"])
+        else:
+            audio_narration = AudioFileClip(audio_path)
 
         # gerar legendas
-        sub = Subtitle({
-            "subtitle_narration_file": subtitle_path,
-            "font_size": 90,
-            "stroke_width": 3,
-            "resolution_output": self.resolution_output,
-        })
+        subtitle_clips = None
+        if not burn_in:
+            sub = Subtitle({
+                "subtitle_narration_file": subtitle_path,
+                **SUBTITLE_STYLE,
+                "resolution_output": self.resolution_output,
+                "words_file": tts_result.get("words_file"),
+                "highlight_color": highlight_color,
+                "block_width": block_width,
+            })
 
-        subtitle_clips = sub.generate().set_duration(audio_narration.duration)
+            subtitle_clips = sub.generate().set_duration(audio_narration.duration)
         
         return {
             "audio_narration": audio_narration,
-            "subtitle_clips": subtitle_clips
+            "subtitle_clips": subtitle_clips,
+            "subtitle_file": subtitle_path,
+            "words_file": tts_result.get("words_file"),
+            "audio_file": audio_path,
+            "audio_segment": tts_result.get("audio_segment"),
         }
 
-    def background_videos(self, params=None):
+    def narration_audio_file(self, narration_result):
+        """
+        Caminho de um arquivo com a narração (para a Timeline). No modo PCM sem
+        arquivo avulso, grava um WAV (sem codificação) a partir da memória.
+        """
+        if narration_result.get("audio_file"):
+            return narration_result["audio_file"]
+        path = os.path.join(self.output_folder, f"{self.slug}_narration.wav")
+        narration_result["audio_segment"].export(path, format="wav")
+        return path
+
+    @staticmethod
+    def encoder_profile(config=None, defaults=None, duration=None, workers=1):
+        """
+        Perfil de encode do vídeo (bloco "encoding" do JSON): nome do perfil
+        ("draft", "shorts-upload", "archive", "size-targeted") ou
+        {"profile": nome, ...ajustes}. defaults: ajustes do template (ex.: tune).
+        duration: aplica o teto de "max_file_size_mb" (ver EncoderProfile.fit_duration).
+        workers: o mesmo de render_timeline (em quantos trechos o vídeo será codificado).
+        """
+        encoder = EncoderProfile.from_config(config, defaults)
+        segments = 1
+        if duration and (workers is None or workers > 1):
+            parallel = ParallelTimeline({"workers": workers} if workers else None)
+            segments = len(parallel.segment_bounds(Timeline({"duration": duration, "fps": encoder.fps}))) - 1
+        encoder = encoder.fit_duration(duration, segments)
+        print(f"🎛️ Perfil de encode: {encoder.describe()}")
+        return encoder
+
+    @staticmethod
+    def log_output_size(output_file, duration):
+        """Loga o tamanho do vídeo e quanto ele economiza em relação ao encode fixo de 4000k."""
+        report = size_report(output_file, duration)
+        mb = 1024 * 1024
+        saved = report["saved"] / report["reference"] * 100 if report["reference"] else 0
+        print(f"📦 Tamanho: {report['size'] / mb:.1f} MB "
+              f"({report['saved'] / mb:+.1f} MB / {saved:+.0f}% de economia vs. 4000k fixo)")
+        return report
+
+    def render_timeline(self, timeline, output_file, backend="moviepy", encoding=None, workers=1):
+        """
+        Renderiza a Timeline. backend "ffmpeg": um único filter_complex, sem
+        frames no Python; se falhar, cai para o MoviePy (que também é o padrão).
+        encoding: parâmetros de codificação dos backends (EncoderProfile.encoding()).
+        workers > 1 (ou None = todos os núcleos): divide o vídeo em trechos
+        renderizados em processos separados e concatenados sem recodificar.
+        """
+        def renderer(name):
+            if workers is None or workers > 1:
+                return ParallelTimeline({"backend": name, "encoding": encoding,
+                                         **({"workers": workers} if workers else {})})
+            return (FFmpegTimeline if name == "ffmpeg" else MoviePyTimeline)(encoding)
+
+        if backend == "ffmpeg":
+            try:
+                return renderer("ffmpeg").render(timeline, output_file)
+            except Exception as e:
+                print(f"⚠️  Falha no backend ffmpeg, usando MoviePy: {e}")
+        return renderer("moviepy").render(timeline, output_file)
+
+    def ass_subtitles(self, params=None):
+        """
+        Gera o arquivo ASS das legendas e retorna o filtro de vídeo do ffmpeg
+        que o grava no vídeo ("ass" da libass; ver Timeline.add_filter).
+        """
+        params_default = {
+            "subtitle_file": False,
+            "block_width": int(self.width * 0.8),
+            "center": (0.5, 0.3),
+        }
+
+        if params:
+            params_default.update(params)
+
+        ass = AssSubtitle({
+            "subtitle_narration_file": params_default["subtitle_file"],
+            **SUBTITLE_STYLE,
+            "resolution_output": self.resolution_output,
+            "block_width": params_default["block_width"],
+            "center": params_default["center"],
+        })
+        return ass.generate()
+
+    def _background_video(self, params=None):
         params_default = {
-            "background_videos_dir": False
+            "background_videos_dir": False,
+            "use_proxy_cache": False,
+            "engine": "moviepy",
+            "max_clip_duration": BACKGROUND_MAX_CLIP_DURATION,
         }
 
         # Atualizar o params_default com os valores fornecidos em params
         if params:
             params_default.update(params)
 
-        bg = BackgroundVideo({
+        return BackgroundVideo({
             "output_ratio": self.output_ratio,
             "background_videos_dir": params_default["background_videos_dir"],
-            "max_clip_duration": self.max_total_video_duration,
+            "max_clip_duration": params_default["max_clip_duration"],
+            # o plano só sonda os clipes necessários para cobrir o vídeo
+            "max_total_video_duration": self.max_total_video_duration or None,
+            "use_proxy_cache": params_default["use_proxy_cache"],
+            "engine": params_default["engine"],
+            "random_seed": self.rng.getrandbits(64),
+            "ffmpeg_output_path": os.path.join(self.output_folder, f"{self.slug}_background.mp4"),
         })
 
+    def background_plan(self, params=None):
+        """Clipes do fundo ({"path", "duration"}) para a camada "sequence" da Timeline."""
+        return self._background_video(params).timeline_plan()
+
+    def background_videos(self, params=None):
+        bg = self._background_video(params)
         final_video = bg.generate_background_video()
 
         # max duration
@@ -118,7 +293,8 @@ class TemplateMaster:
 
         return final_video
 
-    def background_music(self, params=None):
+    def background_music_path(self, params=None):
+        """Escolhe o arquivo de música de fundo (ou None, com o aviso)."""
         params_default = {
             "background_music_file": False,
             "background_music_dir": False,
@@ -135,17 +311,15 @@ class TemplateMaster:
                 print("ℹ️  Continuando sem música de fundo.")
                 return None
             
-            music_files = [f for f in os.listdir(bg_music_dir) if f.lower().endswith(('.mp3', '.wav', '.m4a', '.aac'))]
+            music_files = sorted(f for f in os.listdir(bg_music_dir) if f.lower().endswith(('.mp3', '.wav', '.m4a', '.aac')))
             if not music_files:
                 print(f"⚠️  Nenhum arquivo de música encontrado em: {bg_music_dir}")
                 print("ℹ️  Continuando sem música de fundo.")
                 return None
             
-            selected_music = random.choice(music_files)
-            music_path = os.path.join(bg_music_dir, selected_music)
+            selected_music = self.rng.choice(music_files)
             print(f"🎶 Música selecionada: {selected_music}")
-
-            music_clip = AudioFileClip(music_path)
+            return os.path.join(bg_music_dir, selected_music)
 
         elif params_default["background_music_file"]:
             music_path = params_default["background_music_file"]
@@ -153,13 +327,18 @@ class TemplateMaster:
                 print(f"⚠️  Arquivo de música de fundo não encontrado: {music_path}")
                 print("ℹ️  Continuando sem música de fundo.")
                 return None
-            
-            music_clip = AudioFileClip(music_path)
+            return music_path
         else:
             print("⚠️  Nenhum arquivo ou diretório de música de fundo fornecido.")
             print("ℹ️  Continuando sem música de fundo.")
             return None
 
+    def background_music(self, params=None):
+        music_path = self.background_music_path(params)
+        if not music_path:
+            return None
+        music_clip = AudioFileClip(music_path)
+
         # duration
         if self.max_total_video_duration and music_clip.duration > self.max_total_video_duration:
             music_clip = music_clip.subclip(0, self.max_total_video_duration)
@@ -171,10 +350,13 @@ class TemplateMaster:
 
         return music_clip
 
-    def headline(self, params=None):
+    def headline_image(self, params=None):
+        """Gera o PNG da headline e retorna o caminho."""
         params_default = {
             "title": False,
-            "subtitle": False
+            "subtitle": False,
+            # largura final na tela; None = HEADLINE_WIDTH
+            "output_width": None,
         }
 
         if params:
@@ -186,12 +368,14 @@ class TemplateMaster:
             "output_path": output_path,
             "title": params_default["title"],
             "subtitle": params_default["subtitle"],
-            "video_width": 700,
+            "video_width": HEADLINE_WIDTH,
+            "output_width": params_default["output_width"],
         })
-        headline_data = headline.generate()
+        return headline.generate()["path"]
 
+    def headline(self, params=None):
         # return image clip
-        headline_clip = ImageClip(output_path)
+        headline_clip = ImageClip(self.headline_image(params))
 
         if self.max_total_video_duration:
             headline_clip = headline_clip.set_duration(self.max_total_video_duration)
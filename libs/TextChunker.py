@@ -0,0 +1,54 @@
+import re
+
+# fim de frase: pontuação final (com aspas/parênteses de fechamento) seguida de espaço
+SENTENCE_END = re.compile(r"(?<=[.!?…])[\"'”’)\]]*\s+")
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+# pontos de quebra aceitáveis dentro de uma frase longa demais
+SOFT_BREAK = re.compile(r"[,;:—–-]\s+")
+
+
+def split_sentences(text):
+    """Divide o texto em frases, respeitando parágrafos."""
+    sentences = []
+    for paragraph in PARAGRAPH_BREAK.split(text or ""):
+        for sentence in SENTENCE_END.split(paragraph.strip()):
+            sentence = " ".join(sentence.split())
+            if sentence:
+                sentences.append(sentence)
+    return sentences
+
+
+def _split_long_sentence(sentence, max_chars):
+    """Quebra uma frase maior que max_chars em pausas (vírgula, ponto e vírgula...) ou espaços."""
+    parts = []
+    while len(sentence) > max_chars:
+        window = sentence[:max_chars + 1]
+        cut = max((m.end() for m in SOFT_BREAK.finditer(window)), default=0)
+        if cut <= 0:
+            cut = window.rfind(" ") + 1
+        if cut <= 0:
+            cut = max_chars  # palavra sem espaço maior que o limite
+        parts.append(sentence[:cut].strip())
+        sentence = sentence[cut:].strip()
+    if sentence:
+        parts.append(sentence)
+    return parts
+
+
+def chunk_text(text, max_chars):
+    """
+    Agrupa frases inteiras em blocos de até max_chars caracteres.
+    Só quebra dentro de uma frase quando ela sozinha passa do limite.
+    """
+    chunks = []
+    current = ""
+    for sentence in split_sentences(text):
+        for part in _split_long_sentence(sentence, max_chars):
+            if current and len(current) + 1 + len(part) > max_chars:
+                chunks.append(current)
+                current = part
+            else:
+                current = f"{current} {part}" if current else part
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,225 @@
+import os
+
+import numpy as np
+from PIL import Image
+
+
+class Timeline:
+    """
+    Representação intermediária (IR) de um vídeo: só dados (caminhos, tempos,
+    posições), sem objetos do MoviePy. Os templates montam a timeline e um
+    backend a renderiza (TimelineFFmpeg: um único filter_complex do ffmpeg;
+    TimelineMoviePy: composição quadro a quadro, fallback).
+
+    Camadas de vídeo, na ordem de empilhamento (a primeira fica por baixo):
+    - "sequence": clipes de vídeo concatenados, recortados/escalados para
+      preencher o quadro ("cover"), a partir de start;
+    - "image": imagem parada (PNG, com ou sem alpha) em (x, y) entre start e end;
+    - "captions": sequência de PNGs RGBA (lista ffconcat com durações) em (x, y),
+      pulando os primeiros "offset" segundos da lista (opcional, ver segment).
+    Trilhas de áudio ("audio") são mixadas por soma, com volume, início e loop.
+    "filters" são filtros de vídeo do ffmpeg aplicados no final (ex.: legendas ASS).
+    Tempos em segundos; posições em pixels do quadro final.
+    """
+
+    def __init__(self, params=None):
+        defaults = {
+            "size": (1080, 1920),
+            "fps": 24,
+            "duration": None,
+            "bg_color": (0, 0, 0),
+        }
+        if params:
+            defaults.update(params)
+        for k, v in defaults.items():
+            setattr(self, k, v)
+
+        self.size = tuple(self.size)
+        self.layers = []
+        self.audio = []
+        self.filters = []
+
+    def add_sequence(self, clips, start=0.0, position=(0, 0)):
+        """
+        clips: [{"path", "duration", "source_start" (opcional)}] na ordem.
+        Com duration definida, clipes além do fim da timeline são descartados e
+        o último é aparado (cada clipe vira uma entrada do backend ffmpeg).
+        """
+        end = self.duration - start if self.duration is not None else None
+        sequence = []
+        t = 0.0
+        for c in clips:
+            duration = c["duration"]
+            if end is not None:
+                if end - t <= 1e-6:
+                    break
+                duration = min(duration, end - t)
+            sequence.append({"path": c["path"], "duration": duration, "source_start": c.get("source_start", 0.0)})
+            t += duration
+        clips = sequence
+        self.layers.append({"type": "sequence", "clips": clips, "start": start, "position": tuple(position)})
+
+    def add_image(self, path, position, start=0.0, end=None):
+        self.layers.append({"type": "image", "path": path, "position": tuple(position),
+                            "start": start, "end": end if end is not None else self.duration})
+
+    def add_captions(self, list_path, size, position):
+        """list_path: lista ffconcat de write_caption_sequence (cobre a timeline desde 0)."""
+        self.layers.append({"type": "captions", "path": list_path, "size": tuple(size),
+                            "position": tuple(position)})
+
+    def add_audio(self, path, start=0.0, volume=1.0, loop=False):
+        self.audio.append({"path": path, "start": start, "volume": volume, "loop": loop})
+
+    def add_filter(self, video_filter):
+        self.filters.append(video_filter)
+
+    def segment(self, start, end):
+        """
+        Trecho [start, end) como uma nova Timeline que começa em 0 (renderização
+        em paralelo, ver TimelineParallel). As trilhas de áudio ficam de fora:
+        o áudio é mixado uma vez só, para o vídeo inteiro.
+        """
+        part = Timeline({"size": self.size, "fps": self.fps, "duration": end - start, "bg_color": self.bg_color})
+        for layer in self.layers:
+            if layer["type"] == "sequence":
+                clips = []
+                first = None
+                t = layer["start"]
+                for clip in layer["clips"]:
+                    a, b = max(t, start), min(t + clip["duration"], end)
+                    if b > a:
+                        first = a if first is None else first
+                        clips.append({"path": clip["path"], "duration": b - a,
+                                      "source_start": clip["source_start"] + a - t})
+                    t += clip["duration"]
+                if clips:
+                    part.add_sequence(clips, start=first - start, position=layer["position"])
+            elif layer["type"] == "image":
+                a, b = max(layer["start"], start), min(layer["end"], end)
+                if b > a:
+                    part.add_image(layer["path"], layer["position"], start=a - start, end=b - start)
+            elif layer["type"] == "captions":
+                # a lista de PNGs é a mesma; o backend pula os primeiros "offset" segundos
+                part.layers.append({**layer, "offset": layer.get("offset", 0.0) + start})
+            else:
+                part.layers.append(dict(layer))
+        if self.filters and start:
+            # filtros com tempo absoluto (legendas ASS) veem o PTS original do trecho
+            part.filters = [f"setpts=PTS+{start:.6f}/TB"] + self.filters + ["setpts=PTS-STARTPTS"]
+        else:
+            part.filters = list(self.filters)
+        return part
+
+    def to_dict(self):
+        return {
+            "size": self.size,
+            "fps": self.fps,
+            "duration": self.duration,
+            "bg_color": tuple(self.bg_color),
+            "layers": self.layers,
+            "audio": self.audio,
+            "filters": self.filters,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        timeline = cls({k: data[k] for k in ("size", "fps", "duration", "bg_color")})
+        timeline.layers = list(data.get("layers", []))
+        timeline.audio = list(data.get("audio", []))
+        timeline.filters = list(data.get("filters", []))
+        return timeline
+
+
+def _ffconcat_path(path):
+    return os.path.abspath(path).replace("'", "'\\''")
+
+
+def write_caption_sequence(track, output_dir, basename="captions", fps=24):
+    """
+    Converte uma trilha de legendas (SubtitleTrack, KaraokeTrack ou o
+    CompositeVideoClip do renderer imagemagick) em PNGs RGBA do tamanho da
+    trilha, um por intervalo com conteúdo diferente, e uma lista ffconcat com
+    a duração de cada um (intervalos vazios usam um PNG transparente).
+    Os limites são alinhados à grade de frames (fps), o que não muda nenhum
+    frame amostrado e deixa os tempos exatos na base de tempo do ffmpeg.
+    Retorna o caminho da lista.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    w, h = track.size
+    if hasattr(track, "bounds"):
+        bounds = list(track.bounds)
+    else:
+        bounds = sorted({t for c in track.clips for t in (c.start, c.end) if t is not None})
+    if not bounds or bounds[0] > 0:
+        bounds = [0.0] + bounds
+    end = getattr(track, "duration", None)
+    if end and end > bounds[-1]:
+        bounds.append(end)
+
+    blank = os.path.join(output_dir, f"{basename}_blank.png")
+    Image.new("RGBA", (w, h), (0, 0, 0, 0)).save(blank, compress_level=1)
+
+    def snap(t):
+        # primeiro frame em que o conteúdo novo aparece
+        return int(np.ceil(t * fps - 1e-6))
+
+    entries = []
+    written = {}
+    for i, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+        first, last = snap(start), snap(stop)
+        if last <= first:
+            continue  # intervalo sem nenhum frame
+        t = (start + stop) / 2
+        key = track.frame_key(t) if hasattr(track, "frame_key") else i
+        if key == -1:
+            path = blank
+        elif key in written:
+            path = written[key]
+        else:
+            frame = track.get_frame(t)
+            alpha = track.mask.get_frame(t) if track.mask is not None else np.ones((h, w))
+            if not alpha.any():
+                path = blank
+            else:
+                # frame já vem multiplicado pela máscara (composição sobre preto): desfaz para RGBA
+                a = alpha[:, :, None]
+                rgb = np.where(a > 0, frame / np.maximum(a, 1e-6), 0).round().clip(0, 255)
+                rgba = np.dstack([rgb, (alpha * 255).round()]).astype(np.uint8)
+                path = os.path.join(output_dir, f"{basename}_{len(written):05d}.png")
+                Image.fromarray(rgba, "RGBA").save(path, compress_level=1)
+            written[key] = path
+        if entries and entries[-1][0] == path:
+            entries[-1] = (path, entries[-1][1] + last - first)
+        else:
+            entries.append((path, last - first))
+
+    list_path = os.path.join(output_dir, f"{basename}.ffconcat")
+    with open(list_path, "w", encoding="utf-8") as f:
+        f.write("ffconcat version 1.0\n")
+        for path, frames in entries:
+            f.write(f"file '{_ffconcat_path(path)}'\n")
+            # base de tempo da imagem em 1/fps (o padrão do image2 é 1/25)
+            f.write(f"option framerate {fps}\n")
+            f.write(f"duration {frames / fps:.6f}\n")
+        # o concat demuxer ignora a duração da última entrada: repete o último arquivo
+        f.write(f"file '{_ffconcat_path(entries[-1][0] if entries else blank)}'\n")
+        f.write(f"option framerate {fps}\n")
+    return list_path
+
+
+def read_caption_sequence(list_path):
+    """Lê a lista ffconcat de write_caption_sequence: [(início, fim, caminho do PNG)]."""
+    cues = []
+    t = 0.0
+    path = None
+    with open(list_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("file "):
+                path = line[5:].strip()[1:-1].replace("'\\''", "'")
+            elif line.startswith("duration ") and path:
+                duration = float(line.split()[1])
+                cues.append((t, t + duration, path))
+                t += duration
+    return cues
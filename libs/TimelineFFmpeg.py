@@ -0,0 +1,163 @@
+import os
+import subprocess as sp
+
+from moviepy.config import get_setting
+
+from libs.ScaledVideoClip import crop_scale_filter
+
+
+class FFmpegTimeline:
+    """
+    Compila uma Timeline em uma única chamada do ffmpeg (filter_complex):
+    fundo de cor, sequências de vídeo (trim/crop/scale/concat), imagens e
+    legendas (overlay), filtros finais e mixagem de áudio (amix). Nenhum frame
+    passa pelo Python.
+    """
+
+    def __init__(self, params=None):
+        defaults = {
+            "codec": "libx264",
+            "audio_codec": "aac",
+            "bitrate": "4000k",  # None: controle de taxa só pelos ffmpeg_params (ex.: -crf)
+            "audio_bitrate": None,
+            "preset": "superfast",
+            "threads": 5,
+            "audio_fps": 44100,
+            "ffmpeg_params": None,  # argumentos extras de saída (antes do arquivo)
+        }
+        if params:
+            defaults.update(params)
+        for k, v in defaults.items():
+            setattr(self, k, v)
+
+    @staticmethod
+    def _color(bg_color):
+        return "0x{:02x}{:02x}{:02x}".format(*bg_color)
+
+    def _audio_graph(self, timeline, first_input):
+        """Entradas e filtros que mixam as trilhas de áudio em [outa] (vazios sem áudio)."""
+        inputs, chains, labels = [], [], []
+        for i, track in enumerate(timeline.audio):
+            if track["loop"]:
+                inputs += ["-stream_loop", "-1"]
+            inputs += ["-i", track["path"]]
+            delay = int(round(track["start"] * 1000))
+            chain = (f"[{first_input + i}:a]aresample={self.audio_fps},"
+                     f"aformat=sample_fmts=fltp:channel_layouts=stereo,volume={track['volume']}")
+            if delay:
+                chain += f",adelay={delay}|{delay}"
+            chains.append(f"{chain},atrim=0:{timeline.duration:.3f}[a{i}]")
+            labels.append(f"[a{i}]")
+        if labels:
+            # soma sem normalizar, como o CompositeAudioClip do MoviePy
+            chains.append(f"{''.join(labels)}amix=inputs={len(labels)}:duration=longest:normalize=0[outa]")
+        return inputs, chains
+
+    def _audio_output(self):
+        output = ["-map", "[outa]", "-c:a", self.audio_codec, "-ar", str(self.audio_fps), "-ac", "2"]
+        if self.audio_bitrate:
+            output += ["-b:a", self.audio_bitrate]
+        return output
+
+    def render_audio(self, timeline, output_path):
+        """Só a mixagem de áudio da timeline (usada pela renderização em trechos)."""
+        inputs, chains = self._audio_graph(timeline, 0)
+        if not chains:
+            return None
+        cmd = [get_setting("FFMPEG_BINARY"), "-y", "-loglevel", "error"] + inputs + [
+            "-filter_complex", ";".join(chains),
+        ] + self._audio_output() + ["-t", f"{timeline.duration:.3f}", output_path]
+        self._run(cmd)
+        return output_path
+
+    @staticmethod
+    def _run(cmd):
+        proc = sp.run(cmd, stdout=sp.DEVNULL, stderr=sp.PIPE)
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.decode("utf-8", "ignore").strip()[-800:])
+
+    def build_command(self, timeline, output_path):
+        """Retorna a linha de comando completa do ffmpeg para a timeline."""
+        w, h = timeline.size
+        fps = timeline.fps
+        duration = timeline.duration
+        inputs = ["-f", "lavfi", "-i", f"color=c={self._color(timeline.bg_color)}:s={w}x{h}:r={fps}:d={duration:.3f}"]
+        chains = []
+        n_inputs = 1
+        current = "0:v"
+
+        for n, layer in enumerate(timeline.layers):
+            x, y = layer["position"]
+            if layer["type"] == "sequence":
+                labels = []
+                for clip in layer["clips"]:
+                    # -ss/-t na entrada: o ffmpeg só decodifica o trecho usado;
+                    # fps com round=up escolhe o mesmo frame de origem que o MoviePy (int(t*fps));
+                    # trim fixa o número de frames de cada trecho (o arredondamento pode sobrar um)
+                    inputs += ["-ss", f"{clip['source_start']:.3f}", "-t", f"{clip['duration']:.3f}",
+                               "-i", clip["path"]]
+                    chains.append(
+                        f"[{n_inputs}:v]{crop_scale_filter((w, h))},setsar=1,fps={fps}:round=up,"
+                        f"trim=end_frame={int(round(clip['duration'] * fps))},setpts=PTS-STARTPTS[s{n_inputs}]"
+                    )
+                    labels.append(f"[s{n_inputs}]")
+                    n_inputs += 1
+                chains.append(
+                    f"{''.join(labels)}concat=n={len(labels)}:v=1:a=0,"
+                    f"setpts=PTS+{layer['start']:.3f}/TB[l{n}]"
+                )
+                chains.append(f"[{current}][l{n}]overlay=x={x}:y={y}:eof_action=pass[v{n}]")
+            elif layer["type"] == "image":
+                # imagem repetida até o fim da camada; visível só no intervalo
+                inputs += ["-loop", "1", "-framerate", str(fps), "-t", f"{layer['end']:.3f}", "-i", layer["path"]]
+                chains.append(
+                    f"[{current}][{n_inputs}:v]overlay=x={x}:y={y}:eof_action=pass:"
+                    f"enable='between(t,{layer['start']:.3f},{layer['end']:.3f})'[v{n}]"
+                )
+                n_inputs += 1
+            elif layer["type"] == "captions":
+                # PNGs com duração variável (lista ffconcat): o overlay mantém cada um até o próximo
+                inputs += ["-f", "concat", "-safe", "0", "-i", layer["path"]]
+                source = f"{n_inputs}:v"
+                if layer.get("offset"):
+                    # um frame por quadro antes do trim, para não perder o PNG que atravessa o corte
+                    chains.append(f"[{source}]fps={fps},trim=start={layer['offset']:.6f},"
+                                  f"setpts=PTS-STARTPTS[c{n}]")
+                    source = f"c{n}"
+                chains.append(f"[{current}][{source}]overlay=x={x}:y={y}:eof_action=pass[v{n}]")
+                n_inputs += 1
+            else:
+                raise ValueError(f"Camada desconhecida na timeline: {layer['type']}")
+            current = f"v{n}"
+
+        video_filters = list(timeline.filters) + ["format=yuv420p"]
+        chains.append(f"[{current}]{','.join(video_filters)}[outv]")
+
+        audio_inputs, audio_chains = self._audio_graph(timeline, n_inputs)
+        inputs += audio_inputs
+        chains += audio_chains
+
+        cmd = [get_setting("FFMPEG_BINARY"), "-y", "-loglevel", "error"] + inputs + [
+            "-filter_complex", ";".join(chains),
+            "-map", "[outv]",
+        ]
+        if audio_chains:
+            cmd += self._audio_output()
+        cmd += [
+            "-c:v", self.codec,
+            "-preset", self.preset,
+        ]
+        if self.bitrate:
+            cmd += ["-b:v", self.bitrate]
+        cmd += [
+            "-r", str(fps),
+            "-pix_fmt", "yuv420p",
+            "-threads", str(self.threads),
+            "-t", f"{duration:.3f}",
+        ]
+        return cmd + list(self.ffmpeg_params or []) + [output_path]
+
+    def render(self, timeline, output_path):
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        self._run(self.build_command(timeline, output_path))
+        return output_path
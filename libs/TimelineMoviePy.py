@@ -0,0 +1,126 @@
+import os
+
+import numpy as np
+from PIL import Image
+from moviepy.editor import ImageClip, AudioFileClip, CompositeAudioClip, concatenate_videoclips, concatenate_audioclips
+
+from libs.BackgroundVideo import LazyVideoClip, ReaderPool
+from libs.ScaledVideoClip import ScaledVideoFileClip
+from libs.SubtitleTrack import SubtitleTrack
+from libs.LayerCompositor import LayerCompositor
+from libs.Timeline import read_caption_sequence
+
+
+class MoviePyTimeline:
+    """
+    Renderiza uma Timeline com o MoviePy (frames compostos em Python pelo
+    LayerCompositor). É o backend de fallback do FFmpegTimeline e a
+    referência nas comparações entre os dois.
+    """
+
+    def __init__(self, params=None):
+        defaults = {
+            "codec": "libx264",
+            "audio_codec": "aac",
+            "bitrate": "4000k",  # None: controle de taxa só pelos ffmpeg_params (ex.: -crf)
+            "audio_bitrate": None,
+            "preset": "superfast",
+            "threads": 5,
+            "audio_fps": 44100,
+            "ffmpeg_params": None,
+            "max_open_readers": 2,
+            "logger": "bar",  # None nos trechos renderizados em paralelo
+        }
+        if params:
+            defaults.update(params)
+        for k, v in defaults.items():
+            setattr(self, k, v)
+
+    def _sequence(self, layer, size, pool):
+        clips = []
+        for clip in layer["clips"]:
+            def loader(clip=clip):
+                video = ScaledVideoFileClip(clip["path"], size)
+                return video.subclip(clip["source_start"], min(video.duration, clip["source_start"] + clip["duration"]))
+
+            clips.append(LazyVideoClip(loader, clip["duration"], size, pool, name=clip["path"]))
+        return concatenate_videoclips(clips, method="compose")
+
+    @staticmethod
+    def _captions(layer):
+        bitmaps = {}
+        cues = []
+        offset = layer.get("offset", 0.0)
+        for start, end, path in read_caption_sequence(layer["path"]):
+            start, end = max(start - offset, 0.0), end - offset
+            if end <= 0:
+                continue
+            if path not in bitmaps:
+                bitmaps[path] = np.asarray(Image.open(path).convert("RGBA"))
+            if bitmaps[path][:, :, 3].any():
+                cues.append((start, end, bitmaps[path]))
+        if not cues:
+            return None
+        return SubtitleTrack(cues, size=layer["size"], position=("left", "top"))
+
+    def _audio(self, timeline):
+        tracks = []
+        for track in timeline.audio:
+            clip = AudioFileClip(track["path"])
+            if track["loop"] and clip.duration < timeline.duration:
+                loops = int(timeline.duration // clip.duration) + 1
+                clip = concatenate_audioclips([clip] * loops)
+            if clip.duration > timeline.duration - track["start"]:
+                clip = clip.subclip(0, timeline.duration - track["start"])
+            if track["volume"] != 1:
+                clip = clip.volumex(track["volume"])
+            tracks.append(clip.set_start(track["start"]))
+        return CompositeAudioClip(tracks).set_duration(timeline.duration) if tracks else None
+
+    def build(self, timeline):
+        """Monta o clipe final (vídeo + áudio) da timeline."""
+        pool = ReaderPool(self.max_open_readers)
+        layers = []
+        for layer in timeline.layers:
+            if layer["type"] == "sequence":
+                clip = self._sequence(layer, timeline.size, pool).set_start(layer["start"])
+            elif layer["type"] == "image":
+                clip = ImageClip(layer["path"]).set_start(layer["start"]).set_end(layer["end"])
+            elif layer["type"] == "captions":
+                clip = self._captions(layer)
+                if clip is None:
+                    continue
+            else:
+                raise ValueError(f"Camada desconhecida na timeline: {layer['type']}")
+            layers.append(clip.set_position(layer["position"]))
+
+        final = LayerCompositor(layers, size=timeline.size, bg_color=timeline.bg_color)
+        final = final.set_duration(timeline.duration)
+        audio = self._audio(timeline)
+        if audio is not None:
+            final = final.set_audio(audio)
+        return final
+
+    def render(self, timeline, output_path):
+        final = self.build(timeline)
+        ffmpeg_params = list(self.ffmpeg_params or [])
+        if timeline.filters:
+            # -r na saída: com setpts nos filtros (trechos, ver Timeline.segment) o ffmpeg perde a taxa da entrada
+            ffmpeg_params = ["-vf", ",".join(timeline.filters), "-r", str(timeline.fps)] + ffmpeg_params
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        final.write_videofile(
+            output_path,
+            codec=self.codec,
+            audio_codec=self.audio_codec,
+            audio_fps=self.audio_fps,
+            audio_bitrate=self.audio_bitrate,
+            fps=timeline.fps,
+            threads=self.threads,
+            temp_audiofile=os.path.join(output_dir, "temp-audio.m4a"),
+            remove_temp=True,
+            bitrate=self.bitrate,
+            preset=self.preset,
+            ffmpeg_params=ffmpeg_params or None,
+            logger=self.logger,
+        )
+        return output_path
@@ -0,0 +1,108 @@
+import os
+import shutil
+import subprocess as sp
+from concurrent.futures import ProcessPoolExecutor
+
+from moviepy.config import get_setting
+
+from libs.Timeline import Timeline
+from libs.TimelineFFmpeg import FFmpegTimeline
+from libs.TimelineMoviePy import MoviePyTimeline
+
+BACKENDS = {"ffmpeg": FFmpegTimeline, "moviepy": MoviePyTimeline}
+
+
+def _render_segment(backend, encoding, timeline_data, output_path):
+    """Roda no processo filho: recebe a timeline como dict (picklable) e renderiza só o vídeo."""
+    timeline = Timeline.from_dict(timeline_data)
+    if backend == "moviepy":
+        encoding = {**encoding, "logger": None}
+    return BACKENDS[backend](encoding).render(timeline, output_path)
+
+
+class ParallelTimeline:
+    """
+    Renderiza uma Timeline em trechos, um por processo: cada trecho é
+    composto e codificado por um backend (ffmpeg ou MoviePy) e os arquivos
+    são concatenados sem recodificar (concat + stream copy). O áudio é mixado
+    uma vez, para o vídeo inteiro, e entra só na concatenação.
+
+    Os cortes caem em múltiplos do intervalo entre keyframes (GOP fixo com
+    -g), então cada trecho começa em um keyframe e o vídeo final tem a mesma
+    cadência de keyframes de uma renderização única.
+    """
+
+    def __init__(self, params=None):
+        defaults = {
+            "backend": "moviepy",
+            "workers": int(os.getenv("RENDER_WORKERS", 0)) or os.cpu_count() or 1,
+            "encoding": None,  # parâmetros do backend (codec, bitrate, preset...)
+            "keyframe_interval": 2.0,  # segundos entre keyframes (GOP)
+            "min_segment_duration": 4.0,  # trechos menores não compensam abrir outro processo
+            "temp_dir": None,  # padrão: pasta "<saída>_segments" ao lado do vídeo
+        }
+        if params:
+            defaults.update(params)
+        for k, v in defaults.items():
+            setattr(self, k, v)
+
+    def segment_bounds(self, timeline):
+        """Cortes em segundos ([0, ..., duração]), alinhados ao GOP."""
+        gop = max(1, int(round(self.keyframe_interval * timeline.fps)))
+        total_frames = int(round(timeline.duration * timeline.fps))
+        gops = -(-total_frames // gop)
+        n = max(1, min(self.workers, int(timeline.duration // self.min_segment_duration), gops))
+        frames = sorted({min(total_frames, round(gops * i / n) * gop) for i in range(n)} | {total_frames})
+        return [f / timeline.fps for f in frames]
+
+    def _encoding(self, timeline, n_segments):
+        encoding = dict(self.encoding or {})
+        gop = max(1, int(round(self.keyframe_interval * timeline.fps)))
+        encoding["ffmpeg_params"] = list(encoding.get("ffmpeg_params") or []) + ["-g", str(gop)]
+        # as threads do encode (padrão: todos os núcleos) são divididas entre os processos
+        encoding["threads"] = max(1, (encoding.get("threads") or os.cpu_count() or 1) // n_segments)
+        return encoding
+
+    def render(self, timeline, output_path):
+        bounds = self.segment_bounds(timeline)
+        if len(bounds) <= 2:
+            return BACKENDS[self.backend](self.encoding).render(timeline, output_path)
+
+        output_path = os.path.abspath(output_path)
+        temp_dir = self.temp_dir or os.path.splitext(output_path)[0] + "_segments"
+        os.makedirs(temp_dir, exist_ok=True)
+        n_segments = len(bounds) - 1
+        encoding = self._encoding(timeline, n_segments)
+        print(f"ℹ️ Renderizando {n_segments} trechos em paralelo ({self.backend}, {min(self.workers, n_segments)} processos)")
+
+        segments = [os.path.join(temp_dir, f"segment_{i:03d}.mp4") for i in range(n_segments)]
+        try:
+            with ProcessPoolExecutor(max_workers=min(self.workers, n_segments)) as executor:
+                futures = [
+                    executor.submit(_render_segment, self.backend, encoding,
+                                    timeline.segment(start, end).to_dict(), path)
+                    for start, end, path in zip(bounds[:-1], bounds[1:], segments)
+                ]
+                # áudio da timeline inteira, enquanto os trechos renderizam
+                audio_path = FFmpegTimeline(self.encoding).render_audio(timeline, os.path.join(temp_dir, "audio.m4a"))
+                for future in futures:
+                    future.result()
+            self._concat(segments, audio_path, timeline.duration, output_path, temp_dir)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        return output_path
+
+    @staticmethod
+    def _concat(segments, audio_path, duration, output_path, temp_dir):
+        list_path = os.path.join(temp_dir, "segments.txt")
+        with open(list_path, "w", encoding="utf-8") as f:
+            for path in segments:
+                f.write("file '{}'\n".format(path.replace("'", "'\\''")))
+        cmd = [get_setting("FFMPEG_BINARY"), "-y", "-loglevel", "error",
+               "-f", "concat", "-safe", "0", "-i", list_path]
+        if audio_path:
+            cmd += ["-i", audio_path, "-map", "0:v", "-map", "1:a"]
+        cmd += ["-c", "copy", "-t", f"{duration:.3f}", "-movflags", "+faststart", output_path]
+        proc = sp.run(cmd, stdout=sp.DEVNULL, stderr=sp.PIPE)
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.decode("utf-8", "ignore").strip()[-800:])
@@ -0,0 +1,77 @@
+from bisect import bisect_right
+
+import numpy as np
+from moviepy.editor import VideoClip
+
+
+class CrossfadeTrack(VideoClip):
+    """
+    Trilha de vídeo com crossfade entre clipes consecutivos, em uma única camada.
+
+    Em vez de aninhar um CompositeVideoClip por clipe, calcula para cada instante
+    t no máximo os dois clipes ativos (busca binária nos inícios) e mistura os
+    dois frames uma única vez com NumPy. O custo por frame não depende do
+    número de clipes.
+
+    transitions: lista com a duração de cada transição (len(clips) - 1).
+    Se omitida, usa crossfade_duration em todas.
+    """
+
+    def __init__(self, clips, transitions=None, crossfade_duration=0.8, size=None):
+        VideoClip.__init__(self)
+        if not clips:
+            raise ValueError("CrossfadeTrack precisa de pelo menos um clipe.")
+
+        if transitions is None:
+            transitions = [crossfade_duration] * (len(clips) - 1)
+        if len(transitions) != len(clips) - 1:
+            raise ValueError("transitions deve ter len(clips) - 1 itens.")
+
+        self.clips = clips
+        self.transitions = [
+            max(0.0, min(tr, clips[i].duration, clips[i + 1].duration))
+            for i, tr in enumerate(transitions)
+        ]
+
+        self.starts = [0.0]
+        for i, clip in enumerate(clips[:-1]):
+            self.starts.append(self.starts[-1] + clip.duration - self.transitions[i])
+
+        self.size = tuple(size or clips[0].size)
+        self.duration = self.end = self.starts[-1] + clips[-1].duration
+        self.make_frame = self._make_frame
+
+    def active_clips(self, t):
+        """Retorna [(índice, alpha)] dos clipes visíveis em t (no máximo dois)."""
+        i = max(0, bisect_right(self.starts, t) - 1)
+        if i > 0:
+            fade = self.transitions[i - 1]
+            elapsed = t - self.starts[i]
+            if fade > 0 and elapsed < fade:
+                return [(i - 1, 1.0), (i, elapsed / fade)]
+        return [(i, 1.0)]
+
+    def _clip_frame(self, i, t):
+        clip = self.clips[i]
+        local_t = min(max(0.0, t - self.starts[i]), clip.duration)
+        return clip.get_frame(local_t)
+
+    def _make_frame(self, t):
+        active = self.active_clips(t)
+        if len(active) == 1:
+            return self._clip_frame(active[0][0], t)
+
+        (prev_idx, _), (cur_idx, alpha) = active
+        prev = self._clip_frame(prev_idx, t)
+        cur = self._clip_frame(cur_idx, t)
+
+        # mistura inteira em 8 bits: (prev * (256 - a) + cur * a) >> 8
+        a = np.uint16(round(alpha * 256))
+        out = prev.astype(np.uint16) * (256 - a)
+        out += cur.astype(np.uint16) * a
+        out >>= 8
+        return out.astype(np.uint8)
+
+    def close(self):
+        for clip in self.clips:
+            clip.close()
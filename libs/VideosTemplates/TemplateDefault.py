@@ -1,6 +1,8 @@
 import os
-from libs.TemplateMaster import TemplateMaster
-from moviepy.editor import CompositeVideoClip, CompositeAudioClip
+from PIL import Image
+
+from libs.TemplateMaster import TemplateMaster, HEADLINE_WIDTH
+from libs.Timeline import Timeline, write_caption_sequence
 
 
 class TemplateDefault:
@@ -13,6 +15,7 @@ class TemplateDefault:
         """
         self.video_config = video_config
         self.tm = None
+        self.output_file = None
         
     def validate_configs(self):
         """
@@ -68,11 +71,32 @@ class TemplateDefault:
                 "slug": slug,
                 "output_folder": output_folder,
                 "output_ratio": self.video_config["output_ratio"],
+                "random_seed": self.video_config.get("random_seed"),
             })
             
+            # Modo das legendas: "moviepy" (composição em Python) ou "ass" (gravadas pelo ffmpeg/libass)
+            subtitles_config = self.video_config.get("subtitles") or {}
+            subtitle_mode = subtitles_config.get("mode", "moviepy")
+            if subtitle_mode == "ass" and self.video_config.get("headline"):
+                # com headline as legendas são redimensionadas junto com o bloco
+                print("ℹ️ Legendas ASS não suportam headline - usando MoviePy")
+                subtitle_mode = "moviepy"
+            if subtitle_mode == "ass" and subtitles_config.get("karaoke"):
+                print("ℹ️ Legendas ASS não suportam karaokê - usando MoviePy")
+                subtitle_mode = "moviepy"
+            burn_in = subtitle_mode == "ass"
+            # largura final do bloco headline + legendas (80% do vídeo)
+            block_width = int(self.tm.width * 0.8)
+
             # 1. Gerar narração e legendas
             print("🎙️ Gerando narração e legendas...")
-            narration_result = self.tm.narration_subtitles(self.video_config["tts"])
+            narration_result = self.tm.narration_subtitles(
+                self.video_config["tts"],
+                burn_in=burn_in,
+                cue_grouping=subtitles_config.get("grouping"),
+                karaoke=subtitles_config.get("karaoke"),
+                block_width=block_width,
+            )
             audio_narration = narration_result["audio_narration"]
             subtitle_clips = narration_result["subtitle_clips"]
             
@@ -80,62 +104,86 @@ class TemplateDefault:
             self.tm.max_total_video_duration = audio_narration.duration
             print(f"⏱️ Duração do áudio: {audio_narration.duration:.2f}s")
             
+            # A partir daqui o template só descreve o vídeo (Timeline) e um
+            # backend renderiza: "moviepy" (padrão) ou "ffmpeg" (filter_complex único);
+            # "workers" > 1 renderiza trechos em paralelo (null = todos os núcleos)
+            render_config = self.video_config.get("render") or {}
+            encoder = self.tm.encoder_profile(self.video_config.get("encoding"), duration=audio_narration.duration,
+                                              workers=render_config.get("workers", 1))
+            width, height = self.tm.resolution_output
+            timeline = Timeline({
+                "size": self.tm.resolution_output,
+                "fps": encoder.fps,
+                "duration": audio_narration.duration,
+            })
+            
             # 2. Gerar vídeo de fundo
             print("🎥 Gerando vídeo de fundo...")
-            background_video = self.tm.background_videos({
-                "background_videos_dir": self.video_config["background"]["videos_dir"]
+            background_plan = self.tm.background_plan({
+                "background_videos_dir": self.video_config["background"]["videos_dir"],
+                "use_proxy_cache": self.video_config["background"].get("proxy_cache", False),
+                "engine": self.video_config["background"].get("engine", "moviepy"),
             })
+            if not background_plan:
+                raise RuntimeError("Nenhum clipe de fundo pôde ser carregado.")
+            timeline.add_sequence(background_plan)
             
             # 3. Processar música de fundo (opcional)
-            final_audio = audio_narration
+            timeline.add_audio(self.tm.narration_audio_file(narration_result))
             if self.video_config["background"].get("music_dir"):
                 print("🎵 Adicionando música de fundo...")
-                bg_music = self.tm.background_music({
+                music_path = self.tm.background_music_path({
                     "background_music_dir": self.video_config["background"]["music_dir"]
                 })
                 
-                if bg_music:
-                    # Reduzir volume da música para 25%
-                    bg_music = bg_music.volumex(0.25)
-                    final_audio = CompositeAudioClip([bg_music, audio_narration])
+                if music_path:
+                    # Reduzir volume da música para 25%, em loop até o fim da narração
+                    timeline.add_audio(music_path, volume=0.25, loop=True)
                     print("🔊 Áudio mixado com música de fundo")
             
-            # Adicionar áudio ao vídeo de fundo
-            background_video = background_video.set_audio(final_audio)
-            
             # 4. Gerar headline (opcional)
-            block = None
-            if self.video_config.get("headline") and self.video_config["headline"]:
+            # geometria final calculada uma vez: headline e legendas já chegam no
+            # tamanho da tela, e o caminho por frame é só colar os bitmaps
+            captions_top = None
+            if burn_in:
+                # legendas gravadas no encode final: nada a compor por frame
+                print("ℹ️ Sem headline - legendas ASS gravadas pelo ffmpeg")
+                timeline.add_filter(self.tm.ass_subtitles({
+                    "subtitle_file": narration_result["subtitle_file"],
+                    "block_width": block_width,
+                }))
+            elif self.video_config.get("headline") and self.video_config["headline"]:
                 print("📰 Gerando headline...")
-                headline_clip = self.tm.headline({
+                headline_path = self.tm.headline_image({
                     "title": self.video_config["content"]["title"],
-                    "subtitle": self.video_config["headline"].get("subtitle", "")
+                    "subtitle": self.video_config["headline"].get("subtitle", ""),
+                    "output_width": block_width,
                 })
+                with Image.open(headline_path) as img:
+                    headline_w, headline_h = img.size
                 
-                # Redimensionar legendas para a largura da headline
-                subtitle_clips_resized = subtitle_clips.resize(width=headline_clip.w)
-                
+                # espaço entre headline e legendas, na escala final do bloco
                 GAP = 200
+                gap = int(round(GAP * block_width / HEADLINE_WIDTH))
+                block_h = headline_h + gap + subtitle_clips.h
                 
-                # Criar bloco com headline + legendas
-                block = CompositeVideoClip([
-                    headline_clip,
-                    subtitle_clips_resized.set_position(("center", headline_clip.h + GAP))
-                ], size=(headline_clip.w, headline_clip.h + subtitle_clips_resized.h + GAP))
-                
-                # Redimensionar bloco para 80% da largura do vídeo
-                block = block.resize(width=int(self.tm.width * 0.8))
+                # Bloco com headline + legendas centralizado em 30% da altura
+                top = int(height * 0.3 - block_h / 2)
+                timeline.add_image(headline_path, ((width - headline_w) // 2, top))
+                captions_top = top + headline_h + gap
             else:
                 # Apenas legendas, sem headline
                 print("ℹ️ Sem headline - gerando apenas com legendas")
-                block = subtitle_clips.resize(width=int(self.tm.width * 0.8))
+                captions_top = int(height * 0.3 - subtitle_clips.h / 2)
             
             # 5. Composição final
             print("🎨 Montando composição final...")
-            final = CompositeVideoClip([
-                background_video,
-                block.set_position(("center", int(background_video.h * 0.3 - block.h / 2)))
-            ])
+            if captions_top is not None:
+                # bitmaps das legendas viram uma sequência de PNGs (um por intervalo)
+                captions_list = write_caption_sequence(
+                    subtitle_clips, os.path.join(output_folder, "captions"), slug, fps=timeline.fps)
+                timeline.add_captions(
+                    captions_list, subtitle_clips.size, ((width - subtitle_clips.w) // 2, captions_top))
             
             # 6. Renderização
             output_file = os.path.join(
@@ -143,20 +191,14 @@ class TemplateDefault:
                 f"{slug}.mp4"
             )
             
-            print(f"💾 Renderizando vídeo: {output_file}")
-            final.write_videofile(
-                output_file,
-                codec="libx264",
-                audio_codec="aac",
-                fps=24,
-                threads=5,
-                temp_audiofile=os.path.join(output_folder, "temp-audio.m4a"),
-                remove_temp=True,
-                bitrate="4000k",
-                preset="superfast",
-            )
+            self.output_file = output_file
+            backend = render_config.get("backend", "moviepy")
+            print(f"💾 Renderizando vídeo ({backend}): {output_file}")
+            self.tm.render_timeline(timeline, output_file, backend=backend, encoding=encoder.encoding(),
+                                    workers=render_config.get("workers", 1))
             
             print("✅ Vídeo salvo com sucesso!")
+            self.tm.log_output_size(output_file, timeline.duration)
             
             # 7. Upload para YouTube (opcional)
             if self.video_config.get("youtube"):
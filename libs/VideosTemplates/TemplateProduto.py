@@ -44,20 +44,19 @@ class TemplateProduto:
                 f"{slug}.mp4"
             )
             
+            # produto: imagens paradas sobre fundo de cor
+            encoder = self.tm.encoder_profile(self.video_config.get("encoding"), defaults={"tune": "stillimage"},
+                                              duration=final.duration)
             print(f"💾 Renderizando vídeo: {output_file}")
             final.write_videofile(
                 output_file,
-                codec="libx264",
-                audio_codec="aac",
-                fps=24,
-                threads=5,
+                **encoder.write_videofile_params(),
                 temp_audiofile=os.path.join(output_folder, "temp-audio.m4a"),
                 remove_temp=True,
-                bitrate="4000k",
-                preset="superfast",
             )
             
             print("✅ Vídeo salvo com sucesso!")
+            self.tm.log_output_size(output_file, final.duration)
             
             # 7. Upload para YouTube (opcional)
             if self.video_config.get("youtube"):
@@ -8,6 +8,10 @@ load_dotenv()
 
 # Importar templates disponíveis
 from libs.VideosTemplates.TemplateDefault import TemplateDefault
+from libs.RenderCache import RenderCache
+from libs.TemplateMaster import TemplateMaster
+from libs.TTSPrefetcher import TTSPrefetcher
+from libs.CaptionCache import caption_cache_summary
 
 # Dicionário de templates disponíveis
 AVAILABLE_TEMPLATES = {
@@ -31,7 +35,7 @@ def get_template_class(template_name):
     return AVAILABLE_TEMPLATES.get(template_name)
 
 
-def process_video(video_config, index, total):
+def process_video(video_config, index, total, render_cache=None):
     """
     Processa um único vídeo usando o template especificado.
     
@@ -39,6 +43,7 @@ def process_video(video_config, index, total):
         video_config: Dicionário com as configurações do vídeo
         index: Índice do vídeo atual
         total: Total de vídeos a processar
+        render_cache: RenderCache opcional para pular vídeos já renderizados
     
     Returns:
         True se sucesso, False se erro
@@ -62,8 +67,21 @@ def process_video(video_config, index, total):
         print(f"📋 Templates disponíveis: {', '.join(AVAILABLE_TEMPLATES.keys())}")
         return False
     
+    # Hash canônico do vídeo (config + arquivos de entrada)
+    slug = video_config.get("slug")
+    video_hash = None
+    if render_cache and slug:
+        video_hash = render_cache.video_hash(video_config)
+        if render_cache.is_complete(slug, video_hash):
+            print(f"♻️ Vídeo '{slug}' já renderizado com a mesma configuração (hash {video_hash[:12]}). Pulando.")
+            return True
+
     # Remover o campo 'template' do config para evitar conflitos
     video_config_clean = {k: v for k, v in video_config.items() if k != "template"}
+
+    # Semente determinística: mesmo hash => mesmos sorteios de clipes e música
+    if video_hash and "random_seed" not in video_config_clean:
+        video_config_clean["random_seed"] = render_cache.seed_from_hash(video_hash)
     
     # Criar instância do template
     template = template_class(video_config_clean)
@@ -84,7 +102,18 @@ def process_video(video_config, index, total):
     print("✅ Configurações validadas com sucesso!")
     
     # Processar vídeo
-    return template.process()
+    success = template.process()
+
+    if success and video_hash:
+        youtube_config = video_config.get("youtube") or {}
+        render_cache.record(
+            slug,
+            video_hash,
+            output_file=getattr(template, "output_file", None),
+            output_removed=bool(youtube_config.get("remove_project_folder")),
+        )
+
+    return success
 
 
 def main():
@@ -182,13 +211,29 @@ def main():
             )
         )
     
+    # Cache de renderização (pula vídeos já concluídos com a mesma configuração)
+    render_cache = RenderCache()
+
+    # Pré-carregar as narrações dos vídeos pendentes enquanto os anteriores renderizam
+    prefetcher = None
+    if os.getenv("TTS_PREFETCH", "1") != "0":
+        pending_tts = [
+            TemplateMaster.edge_tts_params(v["tts"]) for v in videos_config
+            if (v.get("tts") or {}).get("narration_text")
+            and not (v.get("slug") and render_cache.is_complete(v["slug"], render_cache.video_hash(v)))
+        ]
+        if pending_tts:
+            prefetcher = TTSPrefetcher()
+            TemplateMaster.tts_prefetcher = prefetcher
+            prefetcher.submit_batch(pending_tts)
+
     # Processar cada vídeo
     success_count = 0
     error_count = 0
     
     for index, video_config in enumerate(videos_config, 1):
         try:
-            if process_video(video_config, index, len(videos_config)):
+            if process_video(video_config, index, len(videos_config), render_cache):
                 success_count += 1
                 print(f"\n✅ Vídeo {index} processado com sucesso!")
             else:
@@ -204,6 +249,10 @@ def main():
             error_count += 1
             continue
     
+    if prefetcher:
+        prefetcher.close()
+        TemplateMaster.tts_prefetcher = None
+
     # Resumo final
     end_time = time.time()
     elapsed_time = end_time - start_time
@@ -214,6 +263,9 @@ def main():
     print(f"✅ Vídeos gerados com sucesso: {success_count}")
     print(f"❌ Vídeos com erro: {error_count}")
     print(f"⏱️ Tempo total: {elapsed_time:.2f}s ({elapsed_time/60:.1f} minutos)")
+    caption_summary = caption_cache_summary()
+    if caption_summary:
+        print(f"🔤 Cache de legendas: {caption_summary}")
     
     if success_count > 0:
         print(f"📁 Vídeos salvos em: ./output/")